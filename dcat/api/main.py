@@ -1,4 +1,5 @@
 from fastapi import FastAPI, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel, Field
@@ -71,8 +72,17 @@ class Dataset(BaseModel):
 
 
 @app.post("/sources/{source_id}/harvest")
-async def harvest_source(source: Source) -> List[Dataset]:
-    """Harvest datasets from a source."""
+async def harvest_source(
+    source: Source,
+    page_size: int = Query(1000, ge=1, le=10000),
+    max_datasets: Optional[int] = Query(None, ge=1),
+) -> List[Dataset]:
+    """Harvest datasets from a source.
+
+    SPARQL sources are harvested in pages of ``page_size`` rows, up to
+    ``max_datasets`` datasets or all of them. A harvest that fails part way
+    resumes from its last completed page when requested again.
+    """
     try:
         if source.type == "sparql":
             # Use default query if none provided
@@ -87,9 +97,15 @@ async def harvest_source(source: Source) -> List[Dataset]:
                             dct:modified ?modified ;
                             dct:publisher ?publisher .
                 }
-                LIMIT 100
             """
-            datasets = harvester.harvest_sparql(source.url, query)
+            datasets = await run_in_threadpool(
+                harvester.harvest_sparql_paged,
+                source.url,
+                query,
+                source.id,
+                page_size,
+                max_datasets,
+            )
         elif source.type == "rdf":
             datasets = harvester.harvest_rdf(source.url, source.format)
         elif source.type == "ckan":
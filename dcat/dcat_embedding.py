@@ -9,7 +9,7 @@ import os
 import json
 import faiss
 import pickle
-from typing import List, Dict, Any, Optional, Tuple, Union
+from typing import List, Dict, Any, Iterable, Optional, Tuple, Union
 import numpy as np
 from dotenv import load_dotenv
 from langchain_openai import OpenAIEmbeddings
@@ -29,18 +29,46 @@ from dcat.dcat_metadata import (
 # Load environment variables
 load_dotenv()
 
+# File storing the (type, id) -> docstore id index next to the vector store
+ID_INDEX_FILE = "id_index.json"
+
+# Directory of incremental changes saved on top of a full vector store
+DELTA_DIR = "deltas"
+
 
 class DCATEmbedder:
     """Class for embedding DCAT metadata."""
 
-    def __init__(self, embedding_model: Optional[Any] = None):
+    def __init__(
+        self, embedding_model: Optional[Any] = None, vector_backend: str = "faiss"
+    ):
         """Initialize the DCATEmbedder.
 
         Args:
             embedding_model: The embedding model to use. Defaults to OpenAIEmbeddings.
+            vector_backend: The vector store to use, "faiss" or "numpy" (exact
+                search with no FAISS dependency). Defaults to "faiss".
         """
+        if vector_backend not in ("faiss", "numpy"):
+            raise ValueError(f"Unsupported vector backend: {vector_backend}")
+
         self.embedding_model = embedding_model or OpenAIEmbeddings()
+        self.vector_backend = vector_backend
         self.vector_store = None
+        # Maps document type -> DCAT id -> docstore ids of its chunks
+        self.id_index: Dict[str, Dict[str, List[str]]] = {}
+        self._faiss_positions: Optional[Dict[str, int]] = None
+        # Changes not yet saved as a delta: docstore id -> (document, vector)
+        self._pending_upserts: Dict[str, Tuple[Document, List[float]]] = {}
+        self._pending_deletes: List[str] = []
+
+    def _vector_store_class(self):
+        """Get the vector store class for the configured backend."""
+        if self.vector_backend == "numpy":
+            from dcat.dcat_vector_store import NumpyVectorStore
+
+            return NumpyVectorStore
+        return FAISS
 
     def prepare_dataset_document(self, dataset: Dataset) -> Document:
         """Prepare a document for a dataset.
@@ -187,36 +215,122 @@ class DCATEmbedder:
 
         return documents
 
-    def create_vector_store(self, documents: List[Document]) -> FAISS:
+    def create_vector_store(self, documents: List[Document]) -> VectorStore:
         """Create a vector store from a list of documents.
 
         Args:
             documents: The documents to create a vector store from.
 
         Returns:
-            A FAISS vector store containing the documents.
+            A vector store (FAISS or NumPy) containing the documents.
         """
         text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=1000, chunk_overlap=100
         )
         split_docs = text_splitter.split_documents(documents)
-        vector_store = FAISS.from_documents(split_docs, self.embedding_model)
-        self.vector_store = vector_store
+        vector_store = self._vector_store_class().from_documents(
+            split_docs, self.embedding_model, ids=self._chunk_ids(split_docs)
+        )
+        self._set_vector_store(vector_store)
         return vector_store
 
-    def embed_catalog(self, catalog: Catalog) -> FAISS:
+    @staticmethod
+    def _chunk_ids(split_docs: List[Document]) -> List[str]:
+        """Create stable docstore ids of the form "type:id:chunk".
+
+        Args:
+            split_docs: The split documents, chunks of a document in order.
+
+        Returns:
+            A docstore id for each chunk.
+        """
+        counts: Dict[Tuple[str, str], int] = {}
+        ids = []
+        for doc in split_docs:
+            key = (doc.metadata.get("type", ""), doc.metadata.get("id", ""))
+            ids.append(f"{key[0]}:{key[1]}:{counts.get(key, 0)}")
+            counts[key] = counts.get(key, 0) + 1
+        return ids
+
+    def _set_vector_store(
+        self,
+        vector_store: VectorStore,
+        id_index: Optional[Dict[str, Dict[str, List[str]]]] = None,
+    ):
+        """Use a vector store and index its documents by DCAT id.
+
+        Args:
+            vector_store: The vector store to use.
+            id_index: A previously saved id index. Rebuilt from the docstore
+                if omitted.
+        """
+        self.vector_store = vector_store
+        self._faiss_positions = None
+        self._pending_upserts = {}
+        self._pending_deletes = []
+        self.id_index = (
+            id_index if id_index is not None else self._build_id_index()
+        )
+
+    def _stored_documents(self) -> Iterable[Tuple[str, Document]]:
+        """Iterate over (docstore id, document) pairs of the vector store."""
+        if isinstance(self.vector_store, FAISS):
+            for docstore_id in self.vector_store.index_to_docstore_id.values():
+                doc = self.vector_store.docstore.search(docstore_id)
+                if isinstance(doc, Document):
+                    yield docstore_id, doc
+        else:
+            yield from self.vector_store.docstore.items()
+
+    def _build_id_index(self) -> Dict[str, Dict[str, List[str]]]:
+        """Index the documents of the vector store by type and DCAT id.
+
+        Returns:
+            A mapping from document type to DCAT id to docstore ids.
+        """
+        id_index: Dict[str, Dict[str, List[str]]] = {}
+        for docstore_id, doc in self._stored_documents():
+            doc_type = doc.metadata.get("type", "")
+            doc_id = doc.metadata.get("id", "")
+            id_index.setdefault(doc_type, {}).setdefault(doc_id, []).append(
+                docstore_id
+            )
+        return id_index
+
+    def _get_document(self, docstore_id: str) -> Optional[Document]:
+        """Get a document from the docstore by its docstore id."""
+        if isinstance(self.vector_store, FAISS):
+            doc = self.vector_store.docstore.search(docstore_id)
+            return doc if isinstance(doc, Document) else None
+        return self.vector_store.docstore.get(docstore_id)
+
+    def _get_vector(self, docstore_id: str) -> List[float]:
+        """Get the stored embedding of a document without re-embedding it."""
+        if isinstance(self.vector_store, FAISS):
+            if self._faiss_positions is None:
+                self._faiss_positions = {
+                    docstore_id: position
+                    for position, docstore_id in (
+                        self.vector_store.index_to_docstore_id.items()
+                    )
+                }
+            position = self._faiss_positions[docstore_id]
+            return self.vector_store.index.reconstruct(int(position)).tolist()
+        return self.vector_store.get_vector(docstore_id)
+
+    def embed_catalog(self, catalog: Catalog) -> VectorStore:
         """Embed a catalog into a vector store.
 
         Args:
             catalog: The catalog to embed.
 
         Returns:
-            A FAISS vector store containing the embedded catalog.
+            A vector store containing the embedded catalog.
         """
         documents = self.prepare_catalog_documents(catalog)
         return self.create_vector_store(documents)
 
-    def save_vector_store(self, vector_store: FAISS, directory: str):
+    def save_vector_store(self, vector_store: VectorStore, directory: str):
         """Save a vector store to disk.
 
         Args:
@@ -227,21 +341,242 @@ class DCATEmbedder:
             os.makedirs(directory)
         vector_store.save_local(directory)
 
-    def load_vector_store(self, directory: str) -> FAISS:
+        if vector_store is self.vector_store:
+            with open(os.path.join(directory, ID_INDEX_FILE), "w") as f:
+                json.dump(self.id_index, f)
+
+            # A full save supersedes any saved deltas
+            for delta_path in self._delta_paths(directory):
+                os.remove(delta_path)
+            self._pending_upserts = {}
+            self._pending_deletes = []
+
+    def load_vector_store(self, directory: str) -> VectorStore:
         """Load a vector store from disk.
 
         Args:
             directory: The directory to load the vector store from.
 
         Returns:
-            A FAISS vector store loaded from disk.
+            A vector store loaded from disk.
         """
-        vector_store = FAISS.load_local(
+        vector_store = self._vector_store_class().load_local(
             directory, self.embedding_model, allow_dangerous_deserialization=True
         )
-        self.vector_store = vector_store
+
+        # Stores saved before the id index existed get it rebuilt on load
+        id_index = None
+        id_index_path = os.path.join(directory, ID_INDEX_FILE)
+        delta_paths = self._delta_paths(directory)
+        if os.path.exists(id_index_path) and not delta_paths:
+            with open(id_index_path, "r") as f:
+                id_index = json.load(f)
+
+        # Replay saved deltas in order; their vectors are stored, not re-embedded
+        for delta_path in delta_paths:
+            with open(delta_path, "rb") as f:
+                delta = pickle.load(f)
+            self._apply_changes(vector_store, delta["deletes"], delta["upserts"])
+
+        self._set_vector_store(vector_store, id_index)
         return vector_store
 
+    @staticmethod
+    def _delta_paths(directory: str) -> List[str]:
+        """List the saved delta files of a vector store in order."""
+        delta_dir = os.path.join(directory, DELTA_DIR)
+        if not os.path.isdir(delta_dir):
+            return []
+        return [
+            os.path.join(delta_dir, name)
+            for name in sorted(os.listdir(delta_dir))
+            if name.endswith(".pkl")
+        ]
+
+    @staticmethod
+    def _apply_changes(
+        vector_store: VectorStore,
+        deletes: List[str],
+        upserts: Dict[str, Tuple[Document, List[float]]],
+    ):
+        """Delete and add precomputed documents in a vector store.
+
+        Args:
+            vector_store: The vector store to change.
+            deletes: Docstore ids to delete.
+            upserts: Mapping from docstore id to (document, vector).
+        """
+        if isinstance(vector_store, FAISS):
+            deletes = [
+                docstore_id
+                for docstore_id in deletes
+                if isinstance(vector_store.docstore.search(docstore_id), Document)
+            ]
+        else:
+            deletes = [
+                docstore_id
+                for docstore_id in deletes
+                if docstore_id in vector_store.docstore
+            ]
+        if deletes:
+            vector_store.delete(deletes)
+
+        if upserts:
+            vector_store.add_embeddings(
+                [(doc.page_content, vector) for doc, vector in upserts.values()],
+                metadatas=[doc.metadata for doc, _ in upserts.values()],
+                ids=list(upserts),
+            )
+
+    def upsert_datasets(self, datasets: List[Dataset]) -> Dict[str, int]:
+        """Add new datasets and re-embed changed ones in the vector store.
+
+        A dataset whose ``modified`` timestamp matches the stored one is
+        skipped, so refreshing a catalog only embeds what changed.
+
+        Args:
+            datasets: The datasets to add or update.
+
+        Returns:
+            A dictionary with the number of added, updated and unchanged datasets.
+        """
+        if not self.vector_store:
+            raise ValueError(
+                "Vector store has not been created. Please create a vector store first."
+            )
+
+        stats = {"added": 0, "updated": 0, "unchanged": 0}
+        changed = []
+        for dataset in datasets:
+            docstore_ids = self.id_index.get("dataset", {}).get(dataset.id)
+            if docstore_ids:
+                stored = self._get_document(docstore_ids[0])
+                if (
+                    dataset.modified
+                    and stored is not None
+                    and stored.metadata.get("modified") == dataset.modified
+                ):
+                    stats["unchanged"] += 1
+                    continue
+                stats["updated"] += 1
+            else:
+                stats["added"] += 1
+            changed.append(dataset)
+
+        if not changed:
+            return stats
+
+        self.delete_datasets([dataset.id for dataset in changed])
+
+        text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=1000, chunk_overlap=100
+        )
+        split_docs = text_splitter.split_documents(
+            self.prepare_dataset_collection_documents(changed)
+        )
+        vectors = self.embedding_model.embed_documents(
+            [doc.page_content for doc in split_docs]
+        )
+        upserts = dict(zip(self._chunk_ids(split_docs), zip(split_docs, vectors)))
+
+        self._apply_changes(self.vector_store, [], upserts)
+        self._faiss_positions = None
+        for docstore_id, (doc, _) in upserts.items():
+            self.id_index.setdefault("dataset", {}).setdefault(
+                doc.metadata["id"], []
+            ).append(docstore_id)
+            self._pending_upserts[docstore_id] = upserts[docstore_id]
+
+        return stats
+
+    def delete_datasets(self, dataset_ids: List[str]) -> int:
+        """Delete datasets from the vector store.
+
+        Args:
+            dataset_ids: The IDs of the datasets to delete. Unknown IDs are ignored.
+
+        Returns:
+            The number of datasets deleted.
+        """
+        if not self.vector_store:
+            raise ValueError(
+                "Vector store has not been created. Please create a vector store first."
+            )
+
+        datasets = self.id_index.get("dataset", {})
+        docstore_ids = []
+        deleted = 0
+        for dataset_id in dataset_ids:
+            if dataset_id in datasets:
+                docstore_ids.extend(datasets.pop(dataset_id))
+                deleted += 1
+
+        if docstore_ids:
+            self._apply_changes(self.vector_store, docstore_ids, {})
+            self._faiss_positions = None
+            for docstore_id in docstore_ids:
+                # Chunks added since the last save only need to be forgotten
+                if self._pending_upserts.pop(docstore_id, None) is None:
+                    self._pending_deletes.append(docstore_id)
+
+        return deleted
+
+    def sync_catalog(self, catalog: Catalog) -> Dict[str, int]:
+        """Bring the vector store in line with a refreshed catalog.
+
+        Args:
+            catalog: The refreshed catalog.
+
+        Returns:
+            A dictionary with the number of added, updated, unchanged and
+            deleted datasets.
+        """
+        current = {dataset.id for dataset in catalog.datasets}
+        stale = [
+            dataset_id
+            for dataset_id in self.id_index.get("dataset", {})
+            if dataset_id not in current
+        ]
+        stats = self.upsert_datasets(catalog.datasets)
+        stats["deleted"] = self.delete_datasets(stale)
+        return stats
+
+    def save_delta(self, directory: str, max_deltas: int = 20) -> Optional[str]:
+        """Save the changes since the last save as a delta file.
+
+        Only the changed documents and their vectors are written, instead of
+        the whole index. Once ``max_deltas`` deltas have accumulated, the
+        vector store is compacted with a full save.
+
+        Args:
+            directory: The directory the vector store was saved to.
+            max_deltas: The number of deltas kept before compacting.
+
+        Returns:
+            The path of the delta file, or None if nothing changed or the
+            store was compacted.
+        """
+        if not self._pending_upserts and not self._pending_deletes:
+            return None
+
+        delta_paths = self._delta_paths(directory)
+        if len(delta_paths) >= max_deltas:
+            self.save_vector_store(self.vector_store, directory)
+            return None
+
+        delta_dir = os.path.join(directory, DELTA_DIR)
+        os.makedirs(delta_dir, exist_ok=True)
+        delta_path = os.path.join(delta_dir, f"{len(delta_paths):06d}.pkl")
+        with open(delta_path, "wb") as f:
+            pickle.dump(
+                {"deletes": self._pending_deletes, "upserts": self._pending_upserts},
+                f,
+            )
+
+        self._pending_upserts = {}
+        self._pending_deletes = []
+        return delta_path
+
     def semantic_search(self, query: str, k: int = 5) -> List[Tuple[Document, float]]:
         """Perform semantic search on the vector store.
 
@@ -273,18 +608,12 @@ class DCATEmbedder:
                 "Vector store has not been created. Please create a vector store first."
             )
 
-        # Search all documents to find the one with matching ID and type
-        all_docs = self.vector_store.similarity_search("", k=100)
-
-        # Filter manually
-        for doc in all_docs:
-            if (
-                doc.metadata.get("id") == dataset_id
-                and doc.metadata.get("type") == "dataset"
-            ):
-                return doc
+        docstore_ids = self.id_index.get("dataset", {}).get(dataset_id)
+        if not docstore_ids:
+            return None
 
-        return None
+        # The first chunk holds the title and description
+        return self._get_document(docstore_ids[0])
 
     def find_related_datasets(self, dataset_id: str, k: int = 5) -> List[Document]:
         """Find datasets related to a specific dataset.
@@ -296,13 +625,18 @@ class DCATEmbedder:
         Returns:
             A list of documents containing related datasets.
         """
-        dataset = self.get_dataset_by_id(dataset_id)
-        if not dataset:
+        if not self.vector_store:
+            raise ValueError(
+                "Vector store has not been created. Please create a vector store first."
+            )
+
+        docstore_ids = self.id_index.get("dataset", {}).get(dataset_id)
+        if not docstore_ids:
             raise ValueError(f"Dataset with ID {dataset_id} not found.")
 
-        # Use the dataset content as a query to find similar datasets
-        results = self.vector_store.similarity_search(
-            dataset.page_content,
+        # Use the stored vector of the dataset as the query
+        results = self.vector_store.similarity_search_by_vector(
+            self._get_vector(docstore_ids[0]),
             k=k + 20,  # Get more results than needed to allow for filtering
         )
 
@@ -0,0 +1,268 @@
+"""
+DCAT Vector Store - A NumPy-backed LangChain vector store for DCAT documents.
+
+This module provides an exact-search alternative to FAISS for small and
+medium catalogs. Embeddings are kept in the embedding engine's exact index
+(``src/dcat/embedding/exact.py``) and saved as a memory-mapped ``.npy``
+file, so loading a saved store does not need FAISS or a full read of the
+vectors.
+"""
+
+import os
+import pickle
+import sys
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+# Use the embedding engine's index from src/. This package shadows the name
+# ``dcat``, so its ``embedding`` package is imported from src/dcat directly.
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+engine_dir = os.path.join(parent_dir, "src", "dcat")
+if engine_dir not in sys.path:
+    sys.path.insert(0, engine_dir)
+
+from embedding.exact import NumpyIndex
+
+
+class NumpyVectorStore(VectorStore):
+    """LangChain vector store using exact NumPy search."""
+
+    def __init__(
+        self,
+        embedding: Embeddings,
+        index: Optional[NumpyIndex] = None,
+        docstore: Optional[Dict[str, Document]] = None,
+        dtype: str = "float32",
+    ):
+        """Initialize the NumpyVectorStore.
+
+        Args:
+            embedding: The embedding model used for documents and queries.
+            index: An existing index. Created on the first insert if omitted.
+            docstore: Mapping from document ID to document.
+            dtype: Storage precision for new indexes, "float32" or "float16".
+        """
+        self.embedding_function = embedding
+        self.index = index
+        self.docstore = docstore or {}
+        self.dtype = dtype
+
+    @property
+    def embeddings(self) -> Embeddings:
+        """The embedding model used by the store."""
+        return self.embedding_function
+
+    def add_embeddings(
+        self,
+        text_embeddings: Iterable[Tuple[str, List[float]]],
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        """Add precomputed embeddings to the store, as FAISS.add_embeddings.
+
+        Args:
+            text_embeddings: (text, embedding) pairs.
+            metadatas: Optional metadata for each text.
+            ids: Optional document IDs. Random IDs are generated if omitted.
+
+        Returns:
+            The IDs of the added documents.
+        """
+        text_embeddings = list(text_embeddings)
+        if not text_embeddings:
+            return []
+        texts, embeddings = zip(*text_embeddings)
+        ids = ids or [str(uuid.uuid4()) for _ in texts]
+        metadatas = metadatas or [{} for _ in texts]
+        vectors = np.asarray(embeddings, dtype=np.float32)
+
+        if self.index is None:
+            self.index = NumpyIndex(dim=vectors.shape[1], dtype=self.dtype)
+        self.index.add(ids, vectors)
+
+        for doc_id, text, metadata in zip(ids, texts, metadatas):
+            self.docstore[doc_id] = Document(page_content=text, metadata=metadata)
+        return ids
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        """Embed texts and add them to the store.
+
+        Args:
+            texts: The texts to add.
+            metadatas: Optional metadata for each text.
+            ids: Optional document IDs.
+
+        Returns:
+            The IDs of the added documents.
+        """
+        texts = list(texts)
+        if not texts:
+            return []
+        embeddings = self.embedding_function.embed_documents(texts)
+        return self.add_embeddings(zip(texts, embeddings), metadatas, ids)
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> bool:
+        """Delete documents by ID.
+
+        Args:
+            ids: The IDs of the documents to delete.
+
+        Returns:
+            True once the documents are removed.
+        """
+        if not ids:
+            return False
+        if self.index is not None:
+            self.index.remove(ids)
+        for doc_id in ids:
+            self.docstore.pop(doc_id, None)
+        return True
+
+    def get_vector(self, doc_id: str) -> List[float]:
+        """Get the stored embedding of a document.
+
+        Args:
+            doc_id: The document ID.
+
+        Returns:
+            The embedding stored for the document.
+        """
+        return self.index.reconstruct(doc_id).tolist()
+
+    def similarity_search_with_score_by_vector(
+        self, embedding: List[float], k: int = 4, **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        """Find the documents closest to an embedding.
+
+        Args:
+            embedding: The query embedding.
+            k: The number of results to return. Defaults to 4.
+
+        Returns:
+            A list of (document, squared L2 distance) tuples.
+        """
+        if self.index is None:
+            return []
+        hits = self.index.search(np.asarray(embedding, dtype=np.float32), k)
+        return [(self.docstore[doc_id], distance) for doc_id, distance, _ in hits]
+
+    def similarity_search_with_score(
+        self, query: str, k: int = 4, **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        """Find the documents closest to a query.
+
+        Args:
+            query: The query text.
+            k: The number of results to return. Defaults to 4.
+
+        Returns:
+            A list of (document, squared L2 distance) tuples.
+        """
+        embedding = self.embedding_function.embed_query(query)
+        return self.similarity_search_with_score_by_vector(embedding, k)
+
+    def similarity_search_by_vector(
+        self, embedding: List[float], k: int = 4, **kwargs: Any
+    ) -> List[Document]:
+        """Find the documents closest to an embedding."""
+        return [
+            doc
+            for doc, _ in self.similarity_search_with_score_by_vector(embedding, k)
+        ]
+
+    def similarity_search(
+        self, query: str, k: int = 4, **kwargs: Any
+    ) -> List[Document]:
+        """Find the documents closest to a query."""
+        return [doc for doc, _ in self.similarity_search_with_score(query, k)]
+
+    def _select_relevance_score_fn(self):
+        """Scores are L2 distances, as with FAISS."""
+        return self._euclidean_relevance_score_fn
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> "NumpyVectorStore":
+        """Create a store from texts.
+
+        Args:
+            texts: The texts to add.
+            embedding: The embedding model.
+            metadatas: Optional metadata for each text.
+            ids: Optional document IDs.
+
+        Returns:
+            A NumpyVectorStore containing the texts.
+        """
+        store = cls(embedding, **kwargs)
+        store.add_texts(texts, metadatas=metadatas, ids=ids)
+        return store
+
+    def save_local(self, folder_path: str):
+        """Save the store to disk.
+
+        Args:
+            folder_path: The directory to save the store to.
+        """
+        os.makedirs(folder_path, exist_ok=True)
+        if self.index is not None:
+            self.index.save(folder_path)
+        with open(os.path.join(folder_path, "docstore.pkl"), "wb") as f:
+            pickle.dump(self.docstore, f)
+
+    @classmethod
+    def load_local(
+        cls,
+        folder_path: str,
+        embeddings: Embeddings,
+        allow_dangerous_deserialization: bool = False,
+    ) -> "NumpyVectorStore":
+        """Load a store saved with save_local.
+
+        Args:
+            folder_path: The directory to load the store from.
+            embeddings: The embedding model.
+            allow_dangerous_deserialization: Must be True to unpickle the
+                docstore, as with FAISS.load_local.
+
+        Returns:
+            The loaded NumpyVectorStore.
+        """
+        if not allow_dangerous_deserialization:
+            raise ValueError(
+                "Loading the docstore uses pickle. Set "
+                "allow_dangerous_deserialization=True if you trust the source."
+            )
+
+        if not os.path.exists(os.path.join(folder_path, "docstore.pkl")):
+            if os.path.exists(os.path.join(folder_path, "index.faiss")):
+                raise ValueError(
+                    f"{folder_path} holds a FAISS vector store; load it with "
+                    "the faiss backend or rebuild it with the numpy backend."
+                )
+            raise ValueError(f"No NumpyVectorStore saved in {folder_path}")
+
+        index = None
+        if os.path.exists(os.path.join(folder_path, "index_meta.json")):
+            index = NumpyIndex.load(folder_path)
+        with open(os.path.join(folder_path, "docstore.pkl"), "rb") as f:
+            docstore = pickle.load(f)
+        return cls(embeddings, index=index, docstore=docstore)
@@ -2,8 +2,18 @@
 from typing import List, Dict, Any, Optional
 import logging
 from datetime import datetime, timedelta
-import requests
 import json
+import os
+import sys
+
+# Import sparql_client from src/ the way the scripts do, so the process
+# shares one module (and one client) with them
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+src_dir = os.path.join(parent_dir, "src")
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from sparql_client import get_sparql_client
 
 class EUDatasetFinder:
     """Interface for finding datasets in the EU Open Data Portal."""
@@ -216,19 +226,10 @@ class EUDatasetFinder:
         PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
         """ + query
         
-        headers = {
-            'Accept': 'application/sparql-results+json',
-            'Content-Type': 'application/x-www-form-urlencoded'
-        }
-        
         try:
-            response = requests.post(
-                self.endpoint,
-                headers=headers,
-                data={'query': prefixed_query}
+            return get_sparql_client().query(
+                prefixed_query, self.endpoint, method="POST"
             )
-            response.raise_for_status()
-            return response.json()
         except Exception as e:
             self.logger.error(f"Query execution failed: {str(e)}")
             return {"error": str(e)}
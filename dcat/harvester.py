@@ -1,13 +1,26 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Union
 import logging
 from rdflib import Graph, URIRef, Literal
 from rdflib.namespace import RDF, RDFS, DCTERMS
-from SPARQLWrapper import SPARQLWrapper, JSON
 import requests
 import json
+import os
+import sys
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
 
+# Import the SPARQL modules from src/ the way the scripts do, so the process
+# shares one sparql_client module (and one client) with them
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+src_dir = os.path.join(parent_dir, "src")
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from sparql_client import get_sparql_client
+from sparql_pagination import SparqlCursor
+from sparql_stream import iter_bindings
+
 
 class DCATHarvester:
     """Harvests DCAT metadata from various sources."""
@@ -42,28 +55,145 @@ class DCATHarvester:
             handler.setFormatter(formatter)
             self.logger.addHandler(handler)
 
-    def harvest_sparql(self, endpoint_url: str, query: str) -> List[Dict[str, Any]]:
+    def harvest_sparql(
+        self,
+        endpoint_url: str,
+        query: str,
+        page_size: Optional[int] = None,
+        max_datasets: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
         """Harvest DCAT metadata using SPARQL.
 
         Args:
             endpoint_url: SPARQL endpoint URL
             query: SPARQL query string
+            page_size: Fetch the results in pages of this many rows; None
+                runs the query once as written
+            max_datasets: Stop after this many datasets
 
         Returns:
             List of harvested dataset metadata
         """
-        sparql = SPARQLWrapper(endpoint_url)
-        sparql.setQuery(query)
-        sparql.setReturnFormat(JSON)
-
         try:
-            results = sparql.query().convert()
+            datasets = list(
+                self.iter_sparql(endpoint_url, query, page_size, max_datasets)
+            )
             self.logger.info(f"Successfully harvested from {endpoint_url}")
-            return self._process_sparql_results(results)
+            return datasets
         except Exception as e:
             self.logger.error(f"Error harvesting from {endpoint_url}: {str(e)}")
             return []
 
+    def iter_sparql(
+        self,
+        endpoint_url: str,
+        query: str,
+        page_size: Optional[int] = None,
+        max_datasets: Optional[int] = None,
+        checkpoint_path: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Harvest DCAT metadata using SPARQL, one dataset at a time.
+
+        Bindings are parsed while the response downloads, so each dataset can
+        be processed before the rest arrive and memory stays flat however
+        large the result set is. With ``page_size`` the SELECT query is
+        rewritten into stably ordered LIMIT/OFFSET pages, fetched one ahead
+        and retried independently.
+
+        Args:
+            endpoint_url: SPARQL endpoint URL
+            query: SPARQL query string
+            page_size: Fetch the results in pages of this many rows; None
+                runs the query once as written
+            max_datasets: Stop after this many datasets
+            checkpoint_path: With ``page_size``, file recording the pages
+                consumed so far; an interrupted harvest resumes after them
+
+        Yields:
+            Harvested dataset metadata
+
+        Raises:
+            requests.RequestException: If the endpoint cannot be queried
+            SparqlStreamError: If the response is not valid SPARQL JSON results
+        """
+        if page_size is None:
+            bindings = islice(
+                get_sparql_client().stream_query(query, endpoint_url), max_datasets
+            )
+        else:
+            bindings = SparqlCursor(
+                query,
+                endpoint_url,
+                page_size=page_size,
+                max_rows=max_datasets,
+                checkpoint_path=checkpoint_path,
+            )
+        yield from self._iter_sparql_results(bindings)
+
+    def harvest_sparql_paged(
+        self,
+        endpoint_url: str,
+        query: str,
+        source_id: str,
+        page_size: int = 1000,
+        max_datasets: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Harvest all results of a SPARQL query page by page, resumably.
+
+        Each page is appended to a spool file next to a cursor checkpoint in
+        ``cache_dir/checkpoints``. When a harvest fails part way, calling this
+        again for the same source and query continues with the first page
+        that was not completed. Without a cache directory nothing is
+        checkpointed.
+
+        Args:
+            endpoint_url: SPARQL endpoint URL
+            query: SPARQL SELECT query string
+            source_id: Identifier for the source
+            page_size: Number of rows per page
+            max_datasets: Stop after this many datasets
+
+        Returns:
+            List of harvested dataset metadata
+
+        Raises:
+            requests.RequestException: If a page still fails after its retries
+        """
+        if not self.cache_dir:
+            return list(self.iter_sparql(endpoint_url, query, page_size, max_datasets))
+
+        directory = self.cache_dir / "checkpoints"
+        directory.mkdir(parents=True, exist_ok=True)
+        spool_path = directory / f"{source_id}.jsonl"
+        cursor = SparqlCursor(
+            query,
+            endpoint_url,
+            page_size=page_size,
+            max_rows=max_datasets,
+            checkpoint_path=str(directory / f"{source_id}.json"),
+        )
+        if cursor.state["pages"]:
+            self.logger.info(
+                f"Resuming harvest of {source_id} after {cursor.state['rows']} datasets"
+            )
+
+        with open(spool_path, "a+b") as spool:
+            # Drop datasets of a page that was not checkpointed
+            spool.truncate(cursor.extra.get("spool_bytes", 0))
+            spool.seek(0, os.SEEK_END)
+            for page in cursor.pages():
+                for dataset in self._iter_sparql_results(page):
+                    line = json.dumps(dataset, ensure_ascii=False) + "\n"
+                    spool.write(line.encode("utf-8"))
+                spool.flush()
+                cursor.extra["spool_bytes"] = spool.tell()
+
+        with open(spool_path, "r", encoding="utf-8") as spool:
+            datasets = [json.loads(line) for line in spool]
+        spool_path.unlink()
+        self.logger.info(f"Successfully harvested from {endpoint_url}")
+        return datasets
+
     def harvest_rdf(self, url: str, format: str = None) -> List[Dict[str, Any]]:
         """Harvest DCAT metadata from an RDF document.
 
@@ -129,18 +259,24 @@ class DCATHarvester:
             self.logger.error(f"Error harvesting from {portal_url}: {str(e)}")
             return []
 
-    def _process_sparql_results(self, results: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Process SPARQL query results into DCAT metadata."""
-        datasets = []
-        for binding in results.get("results", {}).get("bindings", []):
+    def _process_sparql_results(
+        self, results: Union[Dict[str, Any], Iterable[Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        """Process SPARQL query results or a binding stream into DCAT metadata."""
+        return list(self._iter_sparql_results(iter_bindings(results)))
+
+    def _iter_sparql_results(
+        self, bindings: Iterable[Dict[str, Any]]
+    ) -> Iterator[Dict[str, Any]]:
+        """Convert SPARQL bindings into DCAT metadata as they arrive."""
+        for binding in bindings:
             dataset = {}
             for var, value in binding.items():
                 if value["type"] == "uri":
                     dataset[var] = {"@id": value["value"]}
                 else:
                     dataset[var] = value["value"]
-            datasets.append(dataset)
-        return datasets
+            yield dataset
 
     def _process_graph(self) -> List[Dict[str, Any]]:
         """Process RDF graph into DCAT metadata."""
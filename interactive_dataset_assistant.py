@@ -7,7 +7,7 @@ Allows users to input natural language queries to find and analyze datasets
 import sys
 import os
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, List, Union
 import time
 import requests
 import json
@@ -18,6 +18,10 @@ from pydantic import BaseModel, Field
 # Add src directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
 
+from async_sparql_client import HUB_SEARCH_API, get_async_sparql_client
+from sparql_client import DEFAULT_SPARQL_ENDPOINT, get_sparql_client
+from sparql_stream import iter_bindings
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -79,24 +83,11 @@ LIMIT 10
             else:
                 query += f"\nLIMIT {limit}"
 
-        # Try GET request first
-        params = {"query": query, "format": "application/sparql-results+json"}
-
+        # Try GET request first, served from the result cache when possible
         try:
-            response = requests.get(
-                endpoint,
-                params=params,
-                timeout=60,
-                headers={
-                    "Accept": "application/sparql-results+json",
-                    "User-Agent": "Mozilla/5.0 (compatible; SPARQL-Client/1.0)",
-                },
-            )
-
-            if response.status_code in [200, 206]:
-                result = response.json()
-                if result.get("results", {}).get("bindings") is not None:
-                    return result
+            result = get_sparql_client().query(query, endpoint, timeout=60)
+            if result.get("results", {}).get("bindings") is not None:
+                return result
 
         except Exception as e:
             logger.warning(f"GET request failed: {e}, trying POST...")
@@ -109,7 +100,9 @@ LIMIT 10
         }
 
         data = {"query": query}
-        response = requests.post(endpoint, headers=headers, data=data, timeout=60)
+        response = get_sparql_client().post(
+            endpoint, headers=headers, data=data, timeout=60
+        )
 
         if response.status_code in [200, 206]:
             result = response.json()
@@ -459,6 +452,67 @@ def generate_semantic_search_queries(
         return simple_queries if simple_queries else ["data"]
 
 
+_embedding_engine = None
+
+
+def get_local_search_engine():
+    """Open the local dataset vector store once, if one has been built"""
+    global _embedding_engine
+    if _embedding_engine is None:
+        persist_directory = os.getenv("VECTOR_STORE_DIR", "./vector_store")
+        if not os.path.isdir(persist_directory):
+            return None
+        from dcat.embedding.engine import EmbeddingEngine
+
+        _embedding_engine = EmbeddingEngine(persist_directory=persist_directory)
+    return _embedding_engine
+
+
+def search_local_datasets(
+    search_queries: List[str], max_results: int = 10
+) -> List[Dict]:
+    """Search the local vector store for all queries in one batched lookup"""
+    engine = get_local_search_engine()
+    if engine is None or not search_queries:
+        return []
+
+    per_query, fused = engine.semantic_search_many(
+        search_queries, n_results=max_results
+    )
+    # Credit each dataset to the query that ranked it highest
+    best_query = {}
+    for i, results in enumerate(per_query):
+        for rank, (doc_id, _, _) in enumerate(results):
+            if doc_id not in best_query or rank < best_query[doc_id][1]:
+                best_query[doc_id] = (i, rank)
+
+    datasets = []
+    for doc_id, score, metadata in fused[:max_results]:
+        query_index = best_query[doc_id][0]
+        datasets.append(
+            {
+                "dataset_uri": doc_id,
+                "title": metadata.get("title") or doc_id,
+                "dataset_description": "",
+                "publisher": metadata.get("publisher", ""),
+                "themes": [
+                    key[len("theme:") :] for key in metadata if key.startswith("theme:")
+                ],
+                "keywords": [],
+                "formats": [
+                    key[len("format:") :]
+                    for key in metadata
+                    if key.startswith("format:")
+                ],
+                "relevance_score": score,
+                "search_query": search_queries[query_index],
+                "query_index": query_index + 1,
+                "source": "local_index",
+            }
+        )
+    return datasets
+
+
 def find_relevant_datasets(
     user_input: str, analysis: QueryAnalysis, max_results: int = 10
 ) -> List[Dict]:
@@ -480,47 +534,99 @@ def find_relevant_datasets(
         all_datasets = []
         seen_titles = set()
 
-        for i, query in enumerate(search_queries, 1):
-            logger.info(f"Executing search {i}/{len(search_queries)}: '{query}'")
-
-            # Try API search
-            api_results = query_eu_api_robust(query, max_results)
-
+        # Local vector store: all queries in one encode and one index lookup
+        try:
+            local_results = search_local_datasets(search_queries, max_results)
+        except Exception as e:
+            logger.warning(f"Local vector search failed: {e}")
+            local_results = []
+        logger.info(f"Found {len(local_results)} results in the local vector store")
+        for dataset in local_results:
+            if dataset["title"] not in seen_titles:
+                seen_titles.add(dataset["title"])
+                all_datasets.append(dataset)
+
+        # Remote searches, bounded per endpoint by the async client: every
+        # Hub-Search query at once, then the SPARQL searches that can still
+        # be needed (for the first 3 queries, while results are insufficient)
+        client = get_async_sparql_client()
+
+        def settled(outcomes: List[Any]) -> List[List[Dict]]:
+            for outcome in outcomes:
+                if isinstance(outcome, Exception):
+                    logger.warning(f"Search failed: {outcome}")
+            return [[] if isinstance(o, Exception) else o for o in outcomes]
+
+        logger.info(f"Running {len(search_queries)} API searches concurrently")
+        api_outcomes = settled(
+            client.run_all(
+                [
+                    client.call(HUB_SEARCH_API, query_eu_api_robust, query, max_results)
+                    for query in search_queries
+                ]
+            )
+        )
+        for query, api_results in zip(search_queries, api_outcomes):
             if api_results:
                 logger.info(f"Found {len(api_results)} results for query: '{query}'")
 
-                # Add unique results
-                for dataset in api_results:
+        def merge(sparql_outcomes: Dict[int, List[Dict]]):
+            """Merge results in query order, as the sequential searches did
+
+            Returns the merged datasets and the numbers of the queries whose
+            SPARQL results were wanted.
+            """
+            datasets, titles, wanted = list(all_datasets), set(seen_titles), []
+            for i, query in enumerate(search_queries, 1):
+                for dataset in api_outcomes[i - 1]:
                     title = dataset.get("title", "")
-                    if title and title not in seen_titles:
-                        seen_titles.add(title)
+                    if title and title not in titles:
+                        titles.add(title)
                         # Add query information for ranking
                         dataset["search_query"] = query
                         dataset["query_index"] = i
-                        all_datasets.append(dataset)
+                        datasets.append(dataset)
 
                         # Stop if we have enough results
-                        if len(all_datasets) >= max_results * 2:
+                        if len(datasets) >= max_results * 2:
                             break
 
-            # Also try SPARQL for more specific searches
-            if len(all_datasets) < max_results and i <= 3:  # Only for first 3 queries
-                logger.info(f"Trying SPARQL search for: '{query}'")
-                sparql_results = query_eu_open_data_portal_with_semantic_filter(
-                    query, concepts
-                )
-
-                for dataset in sparql_results[:3]:  # Limit SPARQL results
-                    title = dataset.get("title", "")
-                    if title and title not in seen_titles:
-                        seen_titles.add(title)
-                        dataset["search_query"] = query
-                        dataset["query_index"] = i
-                        all_datasets.append(dataset)
-
-            # Stop if we have enough results
-            if len(all_datasets) >= max_results * 2:
-                break
+                # Also use SPARQL for more specific searches
+                if len(datasets) < max_results and i <= 3:  # Only first 3 queries
+                    wanted.append(i)
+                    # Limit SPARQL results
+                    for dataset in sparql_outcomes.get(i, [])[:3]:
+                        title = dataset.get("title", "")
+                        if title and title not in titles:
+                            titles.add(title)
+                            dataset["search_query"] = query
+                            dataset["query_index"] = i
+                            datasets.append(dataset)
+
+                # Stop if we have enough results
+                if len(datasets) >= max_results * 2:
+                    break
+            return datasets, wanted
+
+        # SPARQL results only add datasets, so the searches wanted without
+        # them cover every search the merge below can use
+        _, wanted = merge({})
+        sparql_outcomes: Dict[int, List[Dict]] = {}
+        if wanted:
+            logger.info(f"Running {len(wanted)} SPARQL searches concurrently")
+            sparql_results = client.run_all(
+                [
+                    client.call(
+                        DEFAULT_SPARQL_ENDPOINT,
+                        query_eu_open_data_portal_with_semantic_filter,
+                        search_queries[i - 1],
+                        concepts,
+                    )
+                    for i in wanted
+                ]
+            )
+            sparql_outcomes = dict(zip(wanted, settled(sparql_results)))
+        all_datasets, _ = merge(sparql_outcomes)
 
         # Step 4: Rank results by relevance to original query
         logger.info(f"Ranking {len(all_datasets)} total results by relevance...")
@@ -709,14 +815,12 @@ def rank_datasets_by_relevance(
 
 
 def convert_sparql_results_to_datasets(
-    results: Dict[str, Any], user_input: str, sparql_query: str
+    results: Union[Dict[str, Any], Iterable[Dict]], user_input: str, sparql_query: str
 ) -> List[Dict]:
-    """Convert SPARQL results to dataset format"""
+    """Convert SPARQL results, or bindings streamed as they download, to datasets"""
     datasets = []
 
-    bindings = results.get("results", {}).get("bindings", [])
-
-    for binding in bindings:
+    for binding in iter_bindings(results):
         dataset = {
             "question": f"Dataset found for: {user_input}",
             "sparql_query": sparql_query,
@@ -1319,7 +1423,7 @@ def query_eu_api_robust(search_query: str, max_results: int = 10) -> List[Dict]:
     """Robust EU Open Data Portal API query with FIXED parameters that actually work"""
     try:
         # EU Open Data Portal API endpoint
-        api_url = "https://data.europa.eu/api/hub/search/search"
+        api_url = HUB_SEARCH_API
 
         # FIXED: Use the working parameters discovered through testing
         params = {
@@ -1339,75 +1443,68 @@ def query_eu_api_robust(search_query: str, max_results: int = 10) -> List[Dict]:
         logger.info(f"Querying EU API with FIXED parameters: {api_url}")
         logger.info(f"Parameters: {params}")
 
-        response = requests.get(api_url, params=params, headers=headers, timeout=30)
-
-        logger.info(f"API Response Status: {response.status_code}")
-
-        if response.status_code == 200:
-            try:
-                data = response.json()
-                logger.info(f"API Response received, processing data...")
+        # Served from the SPARQL client's result cache when possible
+        try:
+            data = get_sparql_client().get_json(
+                api_url, params=params, headers=headers, timeout=30
+            )
+        except requests.exceptions.HTTPError as e:
+            logger.error(f"API request failed with status {e.response.status_code}")
+            logger.error(f"Response content: {e.response.text[:500]}")
+            return []
+        except ValueError as e:
+            logger.error(f"Failed to parse JSON response: {e}")
+            return []
 
-                # Debug: Log the structure of the response
-                if isinstance(data, dict):
-                    logger.info(f"Response keys: {list(data.keys())}")
-
-                    # Try different response structures
-                    results_list = []
-                    if "result" in data and isinstance(data["result"], dict):
-                        if "results" in data["result"]:
-                            results_list = data["result"]["results"]
-                            logger.info(
-                                f"Found results in data.result.results: {len(results_list)}"
-                            )
-                        elif "docs" in data["result"]:
-                            results_list = data["result"]["docs"]
-                            logger.info(
-                                f"Found results in data.result.docs: {len(results_list)}"
-                            )
-                    elif "response" in data and isinstance(data["response"], dict):
-                        if "docs" in data["response"]:
-                            results_list = data["response"]["docs"]
-                            logger.info(
-                                f"Found results in data.response.docs: {len(results_list)}"
-                            )
-                    elif "results" in data:
-                        results_list = data["results"]
-                        logger.info(
-                            f"Found results in data.results: {len(results_list)}"
-                        )
-                    elif isinstance(data, list):
-                        results_list = data
-                        logger.info(f"Data is a list: {len(results_list)}")
+        logger.info(f"API Response received, processing data...")
 
-                    if results_list:
-                        # Log first few results to verify they're different
-                        for i, result in enumerate(results_list[:3]):
-                            title = extract_multilingual_field(
-                                result.get("title", {}), "No title"
-                            )
-                            logger.info(f"Result {i+1}: {title[:60]}...")
+        # Debug: Log the structure of the response
+        if isinstance(data, dict):
+            logger.info(f"Response keys: {list(data.keys())}")
 
-                datasets = convert_api_results_to_datasets_robust(data, search_query)
+            # Try different response structures
+            results_list = []
+            if "result" in data and isinstance(data["result"], dict):
+                if "results" in data["result"]:
+                    results_list = data["result"]["results"]
+                    logger.info(
+                        f"Found results in data.result.results: {len(results_list)}"
+                    )
+                elif "docs" in data["result"]:
+                    results_list = data["result"]["docs"]
+                    logger.info(
+                        f"Found results in data.result.docs: {len(results_list)}"
+                    )
+            elif "response" in data and isinstance(data["response"], dict):
+                if "docs" in data["response"]:
+                    results_list = data["response"]["docs"]
+                    logger.info(
+                        f"Found results in data.response.docs: {len(results_list)}"
+                    )
+            elif "results" in data:
+                results_list = data["results"]
+                logger.info(f"Found results in data.results: {len(results_list)}")
+            elif isinstance(data, list):
+                results_list = data
+                logger.info(f"Data is a list: {len(results_list)}")
+
+            if results_list:
+                # Log first few results to verify they're different
+                for i, result in enumerate(results_list[:3]):
+                    title = extract_multilingual_field(
+                        result.get("title", {}), "No title"
+                    )
+                    logger.info(f"Result {i+1}: {title[:60]}...")
 
-                # Filter datasets for relevance to the search query
-                filtered_datasets = filter_relevant_datasets(datasets, search_query)
+        datasets = convert_api_results_to_datasets_robust(data, search_query)
 
-                logger.info(
-                    f"Converted to {len(datasets)} dataset objects, filtered to {len(filtered_datasets)} relevant ones"
-                )
-                return filtered_datasets[:max_results]
+        # Filter datasets for relevance to the search query
+        filtered_datasets = filter_relevant_datasets(datasets, search_query)
 
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse JSON response: {e}")
-                logger.error(
-                    f"Response content (first 500 chars): {response.text[:500]}"
-                )
-                return []
-        else:
-            logger.error(f"API request failed with status {response.status_code}")
-            logger.error(f"Response content: {response.text[:500]}")
-            return []
+        logger.info(
+            f"Converted to {len(datasets)} dataset objects, filtered to {len(filtered_datasets)} relevant ones"
+        )
+        return filtered_datasets[:max_results]
 
     except requests.exceptions.Timeout:
         logger.error("API request timed out")
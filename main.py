@@ -9,23 +9,25 @@ provides various tools for working with open data, including:
 """
 
 import os
+import sys
 import argparse
 from dotenv import load_dotenv
 
-# Import DCAT package
-from dcat import (
-    Catalog,
-    Dataset,
-    Distribution,
-    DataService,
-    load_catalog_from_json,
-    DCATEmbedder,
-    DCATAssistant,
-)
-
 # Load environment variables
 load_dotenv()
 
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src")
+
+
+def import_src_dcat():
+    """Put src/ first on sys.path so ``dcat`` resolves to the embedding engine.
+
+    The top-level dcat package has the same name, so a command imports
+    only one of the two.
+    """
+    if SRC_DIR not in sys.path:
+        sys.path.insert(0, SRC_DIR)
+
 
 def main():
     """Main entry point for the Open Data Assistant application."""
@@ -44,6 +46,60 @@ def main():
         help="Path to the DCAT catalog JSON file",
     )
     dcat_parser.add_argument("--query", help="Query to process")
+    dcat_parser.add_argument(
+        "--vector-backend",
+        choices=["faiss", "numpy"],
+        default="faiss",
+        help="Vector store backend (numpy is exact search without FAISS)",
+    )
+
+    # Re-index subcommand
+    reindex_parser = subparsers.add_parser(
+        "reindex",
+        help="Re-embed ChromaDB collections with a pool of worker processes",
+    )
+    reindex_parser.add_argument(
+        "--persist-dir", default="./vector_store", help="ChromaDB directory"
+    )
+    reindex_parser.add_argument(
+        "--collection",
+        action="append",
+        help="Collection to re-embed (repeatable, defaults to dcat_embeddings)",
+    )
+    reindex_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of encoder processes (defaults to the CPU count)",
+    )
+    reindex_parser.add_argument(
+        "--batch-size", type=int, default=256, help="Records per encode batch"
+    )
+
+    # Dimension report subcommand
+    report_parser = subparsers.add_parser(
+        "dimension-report",
+        help="Report search recall and memory for reduced embedding sizes",
+    )
+    report_parser.add_argument(
+        "--persist-dir", default="./vector_store", help="ChromaDB directory"
+    )
+    report_parser.add_argument(
+        "--collection", default="dcat_embeddings", help="Collection to sample"
+    )
+    report_parser.add_argument(
+        "--dims",
+        type=int,
+        nargs="+",
+        default=[32, 64, 128, 192, 256],
+        help="Target dimensions to evaluate",
+    )
+    report_parser.add_argument(
+        "--method", choices=["pca", "truncate"], default="pca", help="Reduction"
+    )
+    report_parser.add_argument(
+        "--k", type=int, default=10, help="Neighbours compared per query"
+    )
 
     # Parse arguments
     args = parser.parse_args()
@@ -51,29 +107,54 @@ def main():
     # Handle commands
     if args.command == "dcat":
         # Run DCAT assistant
-        run_dcat_assistant(args.catalog, args.query)
+        run_dcat_assistant(args.catalog, args.query, args.vector_backend)
+    elif args.command == "reindex":
+        run_reindex(
+            args.persist_dir,
+            args.collection or ["dcat_embeddings"],
+            args.workers,
+            args.batch_size,
+        )
+    elif args.command == "dimension-report":
+        run_dimension_report(
+            args.persist_dir, args.collection, args.dims, args.method, args.k
+        )
     else:
         parser.print_help()
 
 
-def run_dcat_assistant(catalog_path: str, query: str = None):
+def run_dcat_assistant(
+    catalog_path: str, query: str = None, vector_backend: str = "faiss"
+):
     """Run the DCAT assistant with the given catalog and query.
 
     Args:
         catalog_path: Path to the DCAT catalog JSON file.
         query: Optional query to process.
+        vector_backend: Vector store backend, "faiss" or "numpy".
     """
+    # Imported here so the other commands do not need FAISS or LangChain
+    from dcat import load_catalog_from_json, DCATEmbedder, DCATAssistant
+
     print(f"Loading catalog from {catalog_path}...")
 
     # Initialize the DCAT assistant
     catalog = load_catalog_from_json(catalog_path)
-    embedder = DCATEmbedder()
+    embedder = DCATEmbedder(vector_backend=vector_backend)
 
     # Check if vector store already exists
     vector_store_dir = "vector_store"
     if os.path.exists(vector_store_dir):
         print("Loading existing vector store...")
         embedder.load_vector_store(vector_store_dir)
+
+        # Only embed datasets that were added or modified since the last run
+        stats = embedder.sync_catalog(catalog)
+        print(
+            f"Synced catalog: {stats['added']} added, {stats['updated']} updated, "
+            f"{stats['deleted']} deleted, {stats['unchanged']} unchanged"
+        )
+        embedder.save_delta(vector_store_dir)
     else:
         print("Creating new vector store...")
         embedder.embed_catalog(catalog)
@@ -100,5 +181,77 @@ def run_dcat_assistant(catalog_path: str, query: str = None):
             print(result["answer"])
 
 
+def run_reindex(
+    persist_directory: str,
+    collection_names: list,
+    n_workers: int = None,
+    batch_size: int = 256,
+):
+    """Re-embed ChromaDB collections using a pool of encoder processes.
+
+    Each collection is re-embedded through its embedding engine, with the
+    configured model or the one it was migrated to, so the embedding cache
+    is refreshed and the collection version is bumped for saved indexes and
+    cached results. Switching models is done with a migration instead.
+
+    Args:
+        persist_directory: The ChromaDB directory.
+        collection_names: The names of the collections to re-embed.
+        n_workers: The number of encoder processes. Defaults to the CPU count.
+        batch_size: The number of records per encode batch.
+    """
+    import_src_dcat()
+    from dcat.embedding.engine import EmbeddingEngine
+
+    for name in collection_names:
+        engine = EmbeddingEngine(
+            collection_name=name, persist_directory=persist_directory
+        )
+        print(
+            f"Re-embedding {engine.collection.count()} records of {name} "
+            f"with {engine.model_name}..."
+        )
+        stats = engine.reindex(n_workers=n_workers, batch_size=batch_size)
+        print(
+            f"Re-embedded {stats['processed']} records ({stats['failed']} failed) "
+            f"with {stats['workers']} workers in {stats['elapsed_seconds']:.1f}s "
+            f"({stats['records_per_second']:.1f} records/sec)"
+        )
+
+
+def run_dimension_report(
+    persist_directory: str,
+    collection_name: str,
+    dims: list,
+    method: str = "pca",
+    k: int = 10,
+):
+    """Print recall@k and vector memory for reduced embedding sizes.
+
+    Args:
+        persist_directory: The ChromaDB directory.
+        collection_name: The collection whose stored vectors are sampled.
+        dims: The target dimensions to evaluate.
+        method: The reduction method, "pca" or "truncate".
+        k: The number of neighbours compared per query.
+    """
+    # Imported here so the dcat command does not need ChromaDB
+    import chromadb
+
+    import_src_dcat()
+    from dcat.embedding.reduction import collection_dimension_report
+
+    client = chromadb.PersistentClient(path=persist_directory)
+    report = collection_dimension_report(
+        client.get_collection(collection_name), dims=dims, k=k, method=method
+    )
+    print(f"{'dim':>5} {'recall@' + str(k):>10} {'MB':>9} {'ms/query':>9}")
+    for row in report:
+        print(
+            f"{row['dim']:>5} {row['recall']:>10.3f} {row['index_mb']:>9.1f} "
+            f"{row['ms_per_query']:>9.2f}"
+        )
+
+
 if __name__ == "__main__":
     main()
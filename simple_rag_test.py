@@ -20,6 +20,8 @@ from pydantic import BaseModel, Field
 # Add src directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
 
+from sparql_client import get_sparql_client
+
 # Configure logging to show more details
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -250,32 +252,18 @@ LIMIT 10
         # Use GET request with proper URL encoding
         import urllib.parse
 
-        params = {"query": query, "format": "application/sparql-results+json"}
-
-        # Try GET request first (often more reliable)
+        # Try GET request first (often more reliable), served from the cache
+        # when possible
         try:
-            response = requests.get(
-                endpoint,
-                params=params,
-                timeout=60,  # Increased timeout
-                headers={
-                    "Accept": "application/sparql-results+json",
-                    "User-Agent": "Mozilla/5.0 (compatible; SPARQL-Client/1.0)",
-                },
+            result = get_sparql_client().query(
+                query, endpoint, timeout=60  # Increased timeout
             )
 
-            # Handle both 200 and 206 as success (206 means partial content but still valid)
-            if response.status_code in [200, 206]:
-                result = response.json()
-                # Check if we got valid results
-                if result.get("results", {}).get("bindings") is not None:
-                    return result
-                else:
-                    logger.warning("GET request returned empty results")
+            # Check if we got valid results
+            if result.get("results", {}).get("bindings") is not None:
+                return result
             else:
-                logger.warning(
-                    f"GET request failed with status {response.status_code}, trying POST..."
-                )
+                logger.warning("GET request returned empty results")
 
         except Exception as e:
             logger.warning(f"GET request failed: {e}, trying POST...")
@@ -289,7 +277,9 @@ LIMIT 10
 
         data = {"query": query}
 
-        response = requests.post(endpoint, headers=headers, data=data, timeout=60)
+        response = get_sparql_client().post(
+            endpoint, headers=headers, data=data, timeout=60
+        )
 
         # Handle both 200 and 206 as success
         if response.status_code in [200, 206]:
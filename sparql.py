@@ -17,6 +17,11 @@ from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain.tools import tool
 from langchain_core.messages import HumanMessage, AIMessage
 
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
+
+from sparql_client import get_sparql_client
+
 # --- Logging Setup ---
 log_directory = "logs"
 if not os.path.exists(log_directory):
@@ -241,14 +246,9 @@ def execute_sparql_tool(sparql_query: str) -> Dict[str, Any] | str:
     The agent should analyze the results (or error) to decide the next step.
     """
     logging.info(f"\n--- Executing SPARQL ---\n{sparql_query}\n-----------------------")
-    headers = {"Accept": "application/sparql-results+json"}
-    params = {"query": sparql_query}
     try:
-        response = requests.get(
-            SPARQL_ENDPOINT, headers=headers, params=params, timeout=30
-        )
-        response.raise_for_status()  # Raise HTTPError for bad responses (4xx or 5xx)
-        results = response.json()
+        # Raises HTTPError for bad responses (4xx or 5xx)
+        results = get_sparql_client().query(sparql_query, SPARQL_ENDPOINT, timeout=30)
         result_count = len(results.get("results", {}).get("bindings", []))
         logging.info(f"--- SPARQL Execution Success: Got {result_count} results ---")
         # Limit the size of the result passed back to the agent prompt if necessary
@@ -265,12 +265,13 @@ def execute_sparql_tool(sparql_query: str) -> Dict[str, Any] | str:
         )
         logging.error(f"--- {error_msg} --- Query:\n{sparql_query}")
         return error_msg
-    except requests.exceptions.RequestException as e:
-        error_msg = f"Error: SPARQL query execution failed. Request Error: {e}"
+    # Before RequestException: requests' JSON errors derive from both
+    except json.JSONDecodeError as e:
+        error_msg = f"Error: SPARQL query execution failed. Response was not valid JSON. Error: {e}. Response Text (first 500 chars): {e.doc[:500]}"
         logging.error(f"--- {error_msg} --- Query:\n{sparql_query}", exc_info=True)
         return error_msg
-    except json.JSONDecodeError as e:
-        error_msg = f"Error: SPARQL query execution failed. Response was not valid JSON. Error: {e}. Response Text (first 500 chars): {response.text[:500]}"
+    except requests.exceptions.RequestException as e:
+        error_msg = f"Error: SPARQL query execution failed. Request Error: {e}"
         logging.error(f"--- {error_msg} --- Query:\n{sparql_query}", exc_info=True)
         return error_msg
     except Exception as e:  # Catch any other unexpected errors
@@ -1,7 +1,7 @@
 # Open Data Assistant - Advanced RAG System for EU Open Data Portal
 # Combines SPARQL queries, API calls, and vector similarity search
 
-from .rag_system import RAGSystem, QueryExample, SchemaInfo
+from .rag_system import RAGSystem, QueryExample, SchemaInfo, RetrievalContext
 from .schema_extractor import SchemaExtractor, auto_populate_rag_with_schema
 from .unified_data_assistant import UnifiedDataAssistant, ask_unified_assistant
 
@@ -12,6 +12,7 @@ __all__ = [
     "RAGSystem",
     "QueryExample",
     "SchemaInfo",
+    "RetrievalContext",
     "SchemaExtractor",
     "auto_populate_rag_with_schema",
     "UnifiedDataAssistant",
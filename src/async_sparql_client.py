@@ -0,0 +1,289 @@
+"""
+Asyncio client for the SPARQL endpoint and the Hub-Search API, with a sync facade
+"""
+
+import asyncio
+import functools
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+import requests
+
+try:
+    from .sparql_client import (
+        DEFAULT_SPARQL_ENDPOINT,
+        SparqlClient,
+        get_sparql_client,
+    )
+except ImportError:
+    from sparql_client import (
+        DEFAULT_SPARQL_ENDPOINT,
+        SparqlClient,
+        get_sparql_client,
+    )
+
+HUB_SEARCH_API = "https://data.europa.eu/api/hub/search/search"
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+class AsyncSparqlClient:
+    """Concurrent requests on top of the pooled ``SparqlClient``
+
+    Requests run on a thread pool through the keep-alive sessions of the
+    pooled client, so no async HTTP library is needed. Every endpoint has a
+    semaphore bounding its in-flight requests, and every call has a deadline
+    covering both the wait for the semaphore and the request itself. A call
+    past its deadline raises ``DeadlineExceeded``; its worker thread is left
+    to finish in the background, bounded by the request timeout, and holds
+    its semaphore slot until then, so abandoned requests still count
+    against the endpoint limit.
+    """
+
+    def __init__(
+        self,
+        client: Optional[SparqlClient] = None,
+        max_concurrency: int = 4,
+        limits: Optional[Dict[str, int]] = None,
+        deadline: float = 60,
+        max_workers: int = 32,
+    ):
+        """Create a client allowing ``max_concurrency`` requests per endpoint
+
+        ``limits`` overrides the concurrency of single endpoints and
+        ``deadline`` is the default deadline of a call in seconds.
+        """
+        self.client = client or get_sparql_client()
+        self.max_concurrency = max_concurrency
+        self.limits = dict(limits or {})
+        self.deadline = deadline
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="sparql-async"
+        )
+        # Semaphores belong to the event loop they are used on
+        self._semaphores = weakref.WeakKeyDictionary()
+        self._deadlines_exceeded: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+
+    def semaphore(self, endpoint: str) -> asyncio.Semaphore:
+        """Semaphore bounding the in-flight requests to ``endpoint``"""
+        semaphores = self._semaphores.setdefault(asyncio.get_running_loop(), {})
+        if endpoint not in semaphores:
+            semaphores[endpoint] = asyncio.Semaphore(
+                self.limits.get(endpoint, self.max_concurrency)
+            )
+        return semaphores[endpoint]
+
+    async def call(
+        self,
+        endpoint: str,
+        func: Callable[..., Any],
+        *args,
+        deadline: Optional[float] = None,
+        **kwargs,
+    ) -> Any:
+        """Run a blocking function talking to ``endpoint`` under its limits
+
+        Raises ``DeadlineExceeded`` when the call does not finish within
+        ``deadline`` seconds (default: the client deadline).
+        """
+        deadline = self.deadline if deadline is None else deadline
+        loop = asyncio.get_running_loop()
+
+        async def limited():
+            semaphore = self.semaphore(endpoint)
+            await semaphore.acquire()
+            try:
+                future = self._executor.submit(functools.partial(func, *args, **kwargs))
+            except BaseException:
+                semaphore.release()
+                raise
+            # Released when the worker finishes, not when the deadline cancels
+            # the wait below
+            future.add_done_callback(lambda _: self._release(loop, semaphore))
+            return await asyncio.wrap_future(future)
+
+        try:
+            return await asyncio.wait_for(limited(), timeout=deadline)
+        except (asyncio.TimeoutError, DeadlineExceeded):
+            with self._lock:
+                self._deadlines_exceeded[endpoint] = (
+                    self._deadlines_exceeded.get(endpoint, 0) + 1
+                )
+            raise DeadlineExceeded(
+                f"{endpoint} did not answer within {deadline:g} s"
+            ) from None
+
+    @staticmethod
+    def _release(loop: asyncio.AbstractEventLoop, semaphore: asyncio.Semaphore):
+        """Release a semaphore from a worker thread"""
+        try:
+            loop.call_soon_threadsafe(semaphore.release)
+        except RuntimeError:
+            pass  # The loop was closed, and the semaphore with it
+
+    async def request(
+        self, method: str, url: str, deadline: Optional[float] = None, **kwargs
+    ) -> requests.Response:
+        """Send a request through the pooled client, like ``SparqlClient.request``
+
+        The request timeout is capped by the deadline so worker threads do not
+        outlive it by much.
+        """
+        deadline = self.deadline if deadline is None else deadline
+        endpoint = url.split("?", 1)[0]
+        started = time.monotonic()
+
+        def send():
+            remaining = max(deadline - (time.monotonic() - started), 0.001)
+            timeout = kwargs.get("timeout", self.client.timeout)
+            kwargs["timeout"] = min(timeout, remaining)
+            try:
+                return self.client.request(method, url, **kwargs)
+            except requests.exceptions.Timeout:
+                if timeout <= remaining:
+                    raise
+                # The request timeout was cut short by the deadline
+                raise DeadlineExceeded(url) from None
+
+        return await self.call(endpoint, send, deadline=deadline)
+
+    async def get(self, url: str, **kwargs) -> requests.Response:
+        """GET through the pooled client"""
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> requests.Response:
+        """POST through the pooled client"""
+        return await self.request("POST", url, **kwargs)
+
+    async def query(
+        self,
+        query: str,
+        endpoint: str = DEFAULT_SPARQL_ENDPOINT,
+        method: str = "GET",
+        deadline: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Run a SPARQL query and return the decoded JSON results
+
+        Goes through ``SparqlClient.query``, so results are served from its
+        cache when it has one. Raises ``requests.HTTPError`` for error statuses.
+        """
+        deadline = self.deadline if deadline is None else deadline
+        return await self.call(
+            endpoint,
+            self.client.query,
+            query,
+            endpoint,
+            method,
+            timeout=min(self.client.timeout, deadline),
+            deadline=deadline,
+        )
+
+    async def search_hub(
+        self,
+        q: str,
+        rows: int = 20,
+        url: str = HUB_SEARCH_API,
+        deadline: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Query the Hub-Search API and return the decoded JSON response
+
+        Goes through ``SparqlClient.get_json``, so responses are served from
+        its cache when it has one. Raises ``requests.HTTPError`` for error
+        statuses.
+        """
+        deadline = self.deadline if deadline is None else deadline
+        return await self.call(
+            url,
+            self.client.get_json,
+            url,
+            params={"q": q, "rows": rows, "wt": "json"},
+            headers={"Accept": "application/json"},
+            timeout=min(self.client.timeout, deadline),
+            deadline=deadline,
+        )
+
+    async def gather(
+        self, awaitables: Iterable[Awaitable], return_exceptions: bool = True
+    ) -> List[Any]:
+        """Await all calls concurrently, results in the order given"""
+        return await asyncio.gather(*awaitables, return_exceptions=return_exceptions)
+
+    def run(self, awaitable: Awaitable) -> Any:
+        """Sync facade: run a call on the client's event loop and wait for it"""
+        loop = self._ensure_loop()
+        if threading.current_thread() is self._loop_thread:
+            raise RuntimeError("run() cannot be called from the client's own loop")
+        return asyncio.run_coroutine_threadsafe(self._await(awaitable), loop).result()
+
+    def run_all(
+        self, awaitables: Iterable[Awaitable], return_exceptions: bool = True
+    ) -> List[Any]:
+        """Sync facade: run calls concurrently, results in the order given
+
+        With ``return_exceptions`` a failed call yields its exception instead
+        of a result, so one slow or failing endpoint does not lose the others.
+        """
+        return self.run(self.gather(list(awaitables), return_exceptions))
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-endpoint metrics of the pooled client plus exceeded deadlines"""
+        snapshot = self.client.metrics()
+        with self._lock:
+            exceeded = dict(self._deadlines_exceeded)
+        for endpoint, count in exceeded.items():
+            snapshot.setdefault(endpoint, {})["deadline_exceeded"] = count
+        return snapshot
+
+    def close(self) -> None:
+        """Stop the event loop of the sync facade and the worker threads"""
+        with self._lock:
+            loop, thread = self._loop, self._loop_thread
+            self._loop = self._loop_thread = None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+        self._executor.shutdown(wait=False)
+
+    @staticmethod
+    async def _await(awaitable: Awaitable) -> Any:
+        return await awaitable
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the background event loop of the sync facade once"""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="sparql-async-loop", daemon=True
+                )
+                thread.start()
+                self._loop, self._loop_thread = loop, thread
+            return self._loop
+
+
+_default_client: Optional[AsyncSparqlClient] = None
+_default_client_lock = threading.Lock()
+
+
+def get_async_sparql_client() -> AsyncSparqlClient:
+    """Process-wide async client, sized by SPARQL_CONCURRENCY and SPARQL_DEADLINE"""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = AsyncSparqlClient(
+                max_concurrency=int(os.getenv("SPARQL_CONCURRENCY", "4")),
+                deadline=float(os.getenv("SPARQL_DEADLINE", "60")),
+            )
+        return _default_client
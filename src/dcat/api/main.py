@@ -7,14 +7,17 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+import os
 from typing import Dict, List, Optional
 from fastapi import FastAPI, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, HttpUrl
 
 from ..metadata.base import DCATDataset, DCATCatalog
 from ..semantic.analyzer import SemanticAnalyzer
 from ..embedding.engine import EmbeddingEngine
+from ..embedding.models import warmup_models
 from ..assistant.llm_assistant import (
     LLMAssistant,
     AssistantResponse,
@@ -42,6 +45,17 @@ app.add_middleware(
 embedding_engine = EmbeddingEngine()
 semantic_analyzer = SemanticAnalyzer(embedding_engine)
 llm_assistant = LLMAssistant(semantic_analyzer)
+# Concurrent searches share model calls instead of encoding one query each
+query_batcher = embedding_engine.enable_query_batching(
+    max_batch_size=int(os.getenv("ENCODE_MAX_BATCH_SIZE", "32")),
+    max_wait_ms=float(os.getenv("ENCODE_MAX_WAIT_MS", "5")),
+)
+
+
+@app.on_event("startup")
+async def warmup_embedding_model():
+    """Load the embedding model in the background so the first request is fast."""
+    warmup_models([embedding_engine.model_name])
 
 
 # API Models
@@ -76,6 +90,13 @@ class CkanImportRequest(BaseModel):
     ckan_url: HttpUrl
 
 
+class MigrationRequest(BaseModel):
+    """Request model for migrating embeddings to another model."""
+
+    target_model: str
+    batch_size: int = 256
+
+
 class ImportResponse(BaseModel):
     """Response model for import operations."""
 
@@ -95,8 +116,9 @@ async def root():
 async def query_datasets(request: QueryRequest):
     """Query datasets using natural language."""
     try:
-        response = llm_assistant.analyze_query(
-            query=request.query, context=request.context
+        # Off the event loop, so concurrent requests can batch their encodes
+        response = await run_in_threadpool(
+            llm_assistant.analyze_query, query=request.query, context=request.context
         )
         return response
     except Exception as e:
@@ -107,14 +129,79 @@ async def query_datasets(request: QueryRequest):
 async def suggest_datasets(request: QueryRequest):
     """Get dataset suggestions based on a query."""
     try:
-        suggestions = llm_assistant.suggest_datasets(
-            query=request.query, filters=request.filters
+        suggestions = await run_in_threadpool(
+            llm_assistant.suggest_datasets, query=request.query, filters=request.filters
         )
         return suggestions
+    except ValueError as e:
+        # Unsupported filters
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/search", response_model=List[DatasetSuggestion])
+async def search_datasets(
+    query: str = Query(..., description="Search query"),
+    max_results: int = Query(5, description="Maximum number of results"),
+    hybrid: bool = Query(
+        True, description="Fuse BM25 and dense results (False: dense only)"
+    ),
+):
+    """Search datasets by keywords and semantic similarity."""
+    try:
+        if hybrid:
+            search = embedding_engine.hybrid_search
+        else:
+            search = embedding_engine.semantic_search
+        results = await run_in_threadpool(search, query, n_results=max_results)
+
+        return [
+            DatasetSuggestion(
+                dataset_id=dataset_id,
+                relevance_score=score,
+                explanation=f"Matched '{metadata.get('title', dataset_id)}'",
+            )
+            for dataset_id, score, metadata in results
+        ]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/metrics/retrieval")
+async def retrieval_metrics():
+    """Latency of the dense, lexical and hybrid retrievers."""
+    return embedding_engine.retrieval_metrics.summary()
+
+
+@app.get("/metrics/encoding")
+async def encoding_metrics():
+    """Queue depth, batch sizes and latency of batched query encoding."""
+    return query_batcher.stats()
+
+
+@app.post("/admin/migrations")
+async def start_migration(request: MigrationRequest):
+    """Start (or resume) re-embedding the catalog with another model."""
+    try:
+        migration = embedding_engine.start_migration(
+            request.target_model, batch_size=request.batch_size
+        )
+        return migration.progress()
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/admin/migrations")
+async def migration_progress():
+    """Progress and throughput of the current embedding migration."""
+    if embedding_engine.migration is None:
+        raise HTTPException(status_code=404, detail="No migration started")
+    return embedding_engine.migration.progress()
+
+
 @app.post("/analyze", response_model=List[MetadataInsight])
 async def analyze_dataset(request: DatasetAnalysisRequest):
     """Analyze a dataset's metadata."""
@@ -2,7 +2,7 @@
 LLM-powered assistant for metadata analysis and dataset discovery.
 """
 
-from typing import Dict, List, Optional, Tuple, Any, Set
+from typing import Dict, List, Optional, Any, Set
 from dataclasses import dataclass
 import json
 from datetime import datetime
@@ -127,18 +127,12 @@ class LLMAssistant:
         Returns:
             List of dataset suggestions
         """
-        # Get initial candidates through semantic search
+        # Filters are pushed down into the vector query, so only matching
+        # datasets are scored and no over-fetching is needed
         candidates = self.semantic_analyzer.embedding_engine.semantic_search(
-            query, n_results=self.max_suggestions * 2  # Get more for filtering
+            query, n_results=self.max_suggestions, filters=filters
         )
 
-        # Apply filters if provided
-        if filters:
-            filtered_candidates = self._apply_filters(candidates, filters)
-            candidates = filtered_candidates[: self.max_suggestions]
-        else:
-            candidates = candidates[: self.max_suggestions]
-
         # Generate suggestions with explanations
         suggestions = []
         for dataset_id, score, metadata in candidates:
@@ -282,39 +276,6 @@ class LLMAssistant:
         response = self.llm.predict_messages(prompt)
         return response.content
 
-    def _apply_filters(
-        self, candidates: List[Tuple[str, float, Dict]], filters: Dict[str, Any]
-    ) -> List[Tuple[str, float, Dict]]:
-        """Apply filters to dataset candidates.
-
-        Args:
-            candidates: List of (dataset_id, score, metadata) tuples
-            filters: Filters to apply
-
-        Returns:
-            Filtered list of candidates
-        """
-        filtered = []
-
-        for dataset_id, score, metadata in candidates:
-            matches_filters = True
-
-            # Apply each filter
-            for key, value in filters.items():
-                if key in metadata:
-                    if isinstance(value, list):
-                        if not any(v in metadata[key] for v in value):
-                            matches_filters = False
-                            break
-                    elif metadata[key] != value:
-                        matches_filters = False
-                        break
-
-            if matches_filters:
-                filtered.append((dataset_id, score, metadata))
-
-        return filtered
-
     def _analyze_metadata_quality(
         self, dataset: DCATDataset
     ) -> Optional[MetadataInsight]:
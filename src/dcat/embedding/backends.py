@@ -0,0 +1,227 @@
+"""
+Registry of vector index backends selectable by name.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Type
+
+from .binary import BinaryIndex
+from .exact import NumpyIndex
+from .hnsw import HNSWIndex
+from .index import VectorIndex, VectorIndexError, index_collection
+from .pq import IVFPQIndex
+from .reduction import REDUCER_FILE, DimensionReducer, ReducedIndex, create_reducer
+
+VECTOR_BACKENDS: Dict[str, Type[VectorIndex]] = {
+    NumpyIndex.backend: NumpyIndex,
+    HNSWIndex.backend: HNSWIndex,
+    IVFPQIndex.backend: IVFPQIndex,
+    BinaryIndex.backend: BinaryIndex,
+}
+
+# Write counters of the collections of a ChromaDB directory
+COLLECTION_VERSIONS_FILE = "collection_versions.json"
+# Collection version a saved index mirrors, inside the index directory
+INDEX_VERSION_FILE = "collection_version.json"
+
+_versions_lock = threading.Lock()
+
+
+def load_collection_version(persist_directory: str, collection_name: str) -> int:
+    """Read the stored write counter of a collection.
+
+    Args:
+        persist_directory: ChromaDB directory holding the collection
+        collection_name: Name of the collection
+
+    Returns:
+        Version recorded with ``store_collection_version``, 0 if none
+    """
+    path = Path(persist_directory) / COLLECTION_VERSIONS_FILE
+    with _versions_lock:
+        return int(_read_json(path).get(collection_name, 0))
+
+
+def store_collection_version(
+    persist_directory: str, collection_name: str, version: int
+) -> None:
+    """Record the write counter of a collection after it changed.
+
+    Args:
+        persist_directory: ChromaDB directory holding the collection
+        collection_name: Name of the collection
+        version: New version
+    """
+    path = Path(persist_directory) / COLLECTION_VERSIONS_FILE
+    with _versions_lock:
+        versions = _read_json(path)
+        versions[collection_name] = version
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix(".json.tmp")
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(versions, f)
+        os.replace(temporary, path)
+
+
+def _read_json(path: Path) -> Dict:
+    """Contents of a small JSON file, empty if missing or unreadable."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def create_vector_index(
+    backend: str = "numpy",
+    dim: int = 384,
+    directory: Optional[str] = None,
+    **params,
+) -> VectorIndex:
+    """Create an empty vector index by backend name.
+
+    Args:
+        backend: One of the keys of ``VECTOR_BACKENDS``; the default exact
+            ``numpy`` backend needs no extra dependencies
+        dim: Dimensionality of the stored vectors
+        directory: Directory the index will be saved to. Files the backend
+            keeps on its own (the ``ivfpq`` re-ranking vectors) go there
+            unless ``params`` place them elsewhere
+        **params: Backend-specific constructor parameters
+
+    Returns:
+        New vector index
+    """
+    if backend not in VECTOR_BACKENDS:
+        raise VectorIndexError(
+            f"Unknown vector backend '{backend}', "
+            f"expected one of {sorted(VECTOR_BACKENDS)}"
+        )
+    index_class = VECTOR_BACKENDS[backend]
+    if directory is not None:
+        params = {**index_class.directory_params(directory), **params}
+    return index_class(dim=dim, **params)
+
+
+def load_vector_index(directory: str) -> VectorIndex:
+    """Load a saved vector index, whatever its backend.
+
+    Args:
+        directory: Directory written by ``VectorIndex.save``
+
+    Returns:
+        Loaded vector index, wrapped in a ``ReducedIndex`` when it was saved
+        with a reducer
+    """
+    path = Path(directory)
+    with open(path / "index_meta.json", "r", encoding="utf-8") as f:
+        backend = json.load(f)["backend"]
+
+    if backend not in VECTOR_BACKENDS:
+        raise VectorIndexError(f"Unknown vector backend '{backend}' in {directory}")
+    index = VECTOR_BACKENDS[backend].load(directory)
+
+    if (path / REDUCER_FILE).exists():
+        reducer = DimensionReducer.load(str(path / REDUCER_FILE))
+        # A reducer left behind by an earlier, reduced index is ignored
+        if reducer.output_dim == index.dim:
+            index = ReducedIndex(index, reducer)
+    return index
+
+
+def _reduction_of(index: VectorIndex):
+    """(method, output dimension) of an index's reducer, or None."""
+    if isinstance(index, ReducedIndex):
+        return index.reducer.method, index.reducer.output_dim
+    return None
+
+
+def open_collection_index(
+    collection,
+    directory: str,
+    backend: str,
+    dim: int,
+    version: Optional[int] = None,
+    include_documents: bool = False,
+    reduce_dim: Optional[int] = None,
+    reduction: str = "pca",
+    **params,
+) -> VectorIndex:
+    """Open the saved index of a ChromaDB collection, rebuilding it if stale.
+
+    The saved index is reused when it was saved at collection ``version``,
+    uses the requested backend and reduction and holds as many vectors as
+    the collection. Otherwise a new index is built from the collection and
+    saved, so the next start can reuse it.
+
+    Args:
+        collection: ChromaDB collection the index mirrors
+        directory: Directory where the index is saved
+        backend: Backend name
+        dim: Dimensionality of the stored vectors
+        version: Current version of the collection, see
+            ``load_collection_version``; None never reuses a saved index
+        include_documents: Store document texts in the index metadata
+        reduce_dim: Store vectors projected to this many dimensions; the
+            reducer is fitted on a sample of the collection and queries are
+            projected the same way. None keeps the full model dimension
+        reduction: Reduction method, ``pca`` or ``truncate``
+        **params: Backend-specific constructor parameters
+
+    Returns:
+        Vector index in sync with the collection
+    """
+    expected_reduction = (reduction, reduce_dim) if reduce_dim else None
+    if version is not None and saved_collection_version(directory) == version:
+        index = load_vector_index(directory)
+        if (
+            index.backend == backend
+            and _reduction_of(index) == expected_reduction
+            and len(index) == collection.count()
+        ):
+            return index
+
+    if reduce_dim:
+        index = ReducedIndex(
+            create_vector_index(backend, reduce_dim, directory, **params),
+            create_reducer(reduction, dim, reduce_dim),
+        )
+    else:
+        index = create_vector_index(backend, dim, directory, **params)
+    index_collection(collection, index, include_documents=include_documents)
+    if version is not None and getattr(index, "is_trained", True):
+        save_collection_index(index, directory, version)
+    return index
+
+
+def saved_collection_version(directory: str) -> Optional[int]:
+    """Collection version an index was saved at, None if unknown.
+
+    Args:
+        directory: Directory written by ``save_collection_index``
+    """
+    return _read_json(Path(directory) / INDEX_VERSION_FILE).get("collection_version")
+
+
+def save_collection_index(index: VectorIndex, directory: str, version: int) -> None:
+    """Save the index of a collection with the collection version it mirrors.
+
+    Nothing is written when the saved copy is already at ``version``.
+
+    Args:
+        index: Index to save
+        directory: Target directory
+        version: Current version of the collection
+    """
+    if saved_collection_version(directory) == version:
+        return
+    version_path = Path(directory) / INDEX_VERSION_FILE
+    # A save interrupted halfway must not look current
+    if version_path.exists():
+        version_path.unlink()
+    index.save(directory)
+    with open(version_path, "w", encoding="utf-8") as f:
+        json.dump({"collection_version": version}, f)
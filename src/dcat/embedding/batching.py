@@ -0,0 +1,157 @@
+"""
+Dynamic micro-batching of embedding requests from concurrent callers.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from .metrics import Histogram, LatencyMetrics
+
+_POWERS_OF_TWO = [1, 2, 4, 8, 16, 32, 64, 128, 256]
+
+
+class _Request(NamedTuple):
+    texts: List[str]
+    future: Future
+    enqueued_at: float
+
+
+class EncodeBatcher:
+    """Coalesce encode calls from many threads into batched model calls.
+
+    Callers submit texts and block on a future. A single worker thread takes
+    the first waiting request, keeps collecting requests until
+    ``max_batch_size`` texts are gathered or ``max_wait_ms`` has passed,
+    encodes them in one call and resolves every caller's future with its
+    own rows. Under low load a request waits at most ``max_wait_ms``.
+    """
+
+    def __init__(
+        self,
+        encode: Callable[[List[str]], np.ndarray],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+    ):
+        """Initialize the batcher and start its worker thread.
+
+        Args:
+            encode: Function encoding a list of texts into an array of shape
+                (len(texts), dim)
+            max_batch_size: Maximum number of texts per model call
+            max_wait_ms: Longest time the first request of a batch waits for
+                others to join it
+        """
+        self.encode_batch = encode
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+
+        self.batch_sizes = Histogram(_POWERS_OF_TWO)
+        self.queue_depths = Histogram([0] + _POWERS_OF_TWO)
+        self.latency = LatencyMetrics()
+
+        self._queue: "queue.Queue[Optional[_Request]]" = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._run, name="encode-batcher", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, texts: List[str]) -> Future:
+        """Queue texts for encoding.
+
+        Args:
+            texts: Texts to encode
+
+        Returns:
+            Future resolving to an array of shape (len(texts), dim)
+        """
+        future: Future = Future()
+        self.queue_depths.observe(self._queue.qsize())
+        self._queue.put(_Request(list(texts), future, time.perf_counter()))
+        return future
+
+    def encode(self, text: str) -> np.ndarray:
+        """Encode one text, batched with concurrent callers.
+
+        Args:
+            text: Text to encode
+
+        Returns:
+            Embedding of shape (dim,)
+        """
+        return self.submit([text]).result()[0]
+
+    def close(self) -> None:
+        """Stop the worker after the requests already queued."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def stats(self) -> Dict[str, object]:
+        """Batching metrics.
+
+        Returns:
+            Current queue depth, histograms of the queue depth seen by new
+            requests and of texts per model call, and latency summaries of
+            queue wait (``wait``) and model calls (``encode``)
+        """
+        return {
+            "queue_depth": self._queue.qsize(),
+            "queue_depth_histogram": self.queue_depths.summary(),
+            "batch_size_histogram": self.batch_sizes.summary(),
+            "latency": self.latency.summary(),
+        }
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+
+            batch = [first]
+            size = len(first.texts)
+            deadline = time.perf_counter() + self.max_wait_ms / 1000
+            stopping = False
+            while size < self.max_batch_size:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if request is None:
+                    stopping = True
+                    break
+                batch.append(request)
+                size += len(request.texts)
+
+            self._process(batch)
+            if stopping:
+                return
+
+    def _process(self, batch: List[_Request]) -> None:
+        """Encode a batch and hand each request its rows."""
+        started = time.perf_counter()
+        for request in batch:
+            self.latency.record("wait", (started - request.enqueued_at) * 1000)
+
+        texts = [text for request in batch for text in request.texts]
+        self.batch_sizes.observe(len(texts))
+        try:
+            with self.latency.timer("encode"):
+                embeddings = np.asarray(self.encode_batch(texts))
+        except Exception as e:
+            for request in batch:
+                request.future.set_exception(e)
+            return
+
+        offset = 0
+        for request in batch:
+            request.future.set_result(
+                embeddings[offset : offset + len(request.texts)]
+            )
+            offset += len(request.texts)
@@ -0,0 +1,122 @@
+"""
+Two-stage index: binary-code Hamming prefilter with full-precision re-ranking.
+"""
+
+from pathlib import Path
+from typing import Dict, Tuple
+
+import numpy as np
+
+from .exact import NumpyIndex
+
+# Number of set bits of every byte value, for NumPy without bitwise_count
+_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+def binary_codes(vectors: np.ndarray) -> np.ndarray:
+    """Pack the sign bit of every component into bytes.
+
+    Args:
+        vectors: Array of shape (n, dim)
+
+    Returns:
+        uint8 array of shape (n, ceil(dim / 8))
+    """
+    return np.packbits(np.asarray(vectors) > 0, axis=1)
+
+
+def hamming_distances(codes: np.ndarray, query_code: np.ndarray) -> np.ndarray:
+    """Hamming distances between packed codes and one packed query code.
+
+    Args:
+        codes: uint8 array of shape (n, n_bytes)
+        query_code: uint8 array of shape (n_bytes,)
+
+    Returns:
+        uint16 array of shape (n,)
+    """
+    xor = np.bitwise_xor(codes, query_code)
+    if hasattr(np, "bitwise_count"):
+        if xor.shape[1] % 8 == 0:
+            # Eight bytes per popcount instruction
+            xor = np.ascontiguousarray(xor).view(np.uint64)
+        return np.bitwise_count(xor).sum(axis=1, dtype=np.uint16)
+    return _POPCOUNT[xor].sum(axis=1, dtype=np.uint16)
+
+
+class BinaryIndex(NumpyIndex):
+    """Exact-rescored search over a sign-bit prefilter.
+
+    Every vector is also kept as a binary code of its component signs
+    (48 bytes for 384 dimensions, 32x smaller than float32). A query first
+    scans all codes by Hamming distance, then re-scores the ``rerank``
+    closest candidates with the full-precision vectors. Only the codes need
+    to stay in RAM: the full vectors are memory-mapped on load like in
+    ``NumpyIndex``, and only the shortlisted rows are read.
+    """
+
+    backend = "binary"
+
+    def __init__(self, dim: int, rerank: int = 200, dtype: str = "float32"):
+        """Initialize the binary index.
+
+        Args:
+            dim: Dimensionality of the stored vectors
+            rerank: Number of Hamming candidates re-scored exactly per query;
+                higher values trade latency for recall
+            dtype: Storage precision of the full vectors, ``float32`` or
+                ``float16``
+        """
+        super().__init__(dim, dtype=dtype)
+        self.rerank = rerank
+        self._codes = np.empty((0, (dim + 7) // 8), dtype=np.uint8)
+
+    def _params(self) -> Dict:
+        return {"dtype": self.dtype, "rerank": self.rerank}
+
+    def memory_bytes(self) -> int:
+        """RAM used by the binary codes."""
+        return int(self._codes[: self._size].nbytes)
+
+    def _add_vectors(self, labels: np.ndarray, vectors: np.ndarray) -> None:
+        super()._add_vectors(labels, vectors)
+        if len(self._codes) < len(self._vectors):
+            codes = np.zeros((len(self._vectors), self._codes.shape[1]), np.uint8)
+            codes[: len(self._codes)] = self._codes
+            self._codes = codes
+        self._codes[labels] = binary_codes(vectors)
+
+    def _search_vectors(
+        self, queries: np.ndarray, k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        labels = np.full((len(queries), k), -1, dtype=np.int64)
+        distances = np.full((len(queries), k), np.inf, dtype=np.float32)
+        codes = self._codes[: self._size]
+        # Deleted rows are pushed behind every live row
+        deleted = ~np.isfinite(self._norms[: self._size])
+
+        for row, (query, query_code) in enumerate(
+            zip(queries, binary_codes(queries))
+        ):
+            hamming = hamming_distances(codes, query_code)
+            hamming[deleted] = np.iinfo(np.uint16).max
+
+            shortlist = min(max(self.rerank, k), self._size)
+            candidates = np.argpartition(hamming, shortlist - 1)[:shortlist]
+            candidates = candidates[~deleted[candidates]]
+
+            exact = np.asarray(self._vectors[candidates], dtype=np.float32) - query
+            candidate_distances = np.einsum("ij,ij->i", exact, exact)
+            order = np.argsort(candidate_distances)[:k]
+            labels[row, : len(order)] = candidates[order]
+            distances[row, : len(order)] = candidate_distances[order]
+
+        return labels, distances
+
+    def _save_vectors(self, path: Path) -> None:
+        super()._save_vectors(path)
+        np.save(path / "codes.npy", self._codes[: self._size])
+
+    def _load_vectors(self, path: Path) -> None:
+        super()._load_vectors(path)
+        self._codes = np.load(path / "codes.npy")
@@ -0,0 +1,234 @@
+"""
+Persistent content-hash cache for text embeddings.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Number of recorded cache hits written to the database at once
+TOUCH_BATCH_SIZE = 1000
+
+
+class EmbeddingCache:
+    """Disk-backed LRU cache of embeddings keyed by model name and text hash."""
+
+    def __init__(self, path: str, max_entries: int = 500_000):
+        """Initialize the embedding cache.
+
+        Args:
+            path: Path of the SQLite file holding the cache
+            max_entries: Maximum number of cached vectors before the least
+                recently used ones are evicted
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Last-use times of hits not yet written, see _flush_touches
+        self._touched: Dict[str, float] = {}
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                model_name TEXT NOT NULL,
+                dim INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embeddings_last_used "
+            "ON embeddings (last_used)"
+        )
+        self._conn.commit()
+        self._size = self._conn.execute(
+            "SELECT COUNT(*) FROM embeddings"
+        ).fetchone()[0]
+
+    @staticmethod
+    def make_key(model_name: str, text: str) -> str:
+        """Build the cache key for a text embedded with a given model.
+
+        Args:
+            model_name: Name of the embedding model
+            text: Text that is embedded
+
+        Returns:
+            Cache key
+        """
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{model_name}:{digest}"
+
+    def get_many(
+        self, model_name: str, texts: Sequence[str]
+    ) -> List[Optional[np.ndarray]]:
+        """Look up cached embeddings for several texts.
+
+        Args:
+            model_name: Name of the embedding model
+            texts: Texts to look up
+
+        Returns:
+            List aligned with ``texts`` holding a vector or None for misses
+        """
+        keys = [self.make_key(model_name, text) for text in texts]
+        found: Dict[str, np.ndarray] = {}
+
+        with self._lock:
+            for key, blob in self._select("key, vector", keys):
+                found[key] = np.frombuffer(blob, dtype=np.float32).copy()
+
+            # Hits only record their use; the times are written in batches
+            now = time.time()
+            for key in found:
+                self._touched[key] = now
+            if len(self._touched) >= TOUCH_BATCH_SIZE:
+                self._flush_touches()
+                self._conn.commit()
+
+            results = [found.get(key) for key in keys]
+            hits = sum(1 for vector in results if vector is not None)
+            self.hits += hits
+            self.misses += len(keys) - hits
+
+        return results
+
+    def put_many(
+        self, model_name: str, texts: Sequence[str], vectors: Sequence[np.ndarray]
+    ) -> None:
+        """Store embeddings for several texts, evicting old entries if needed.
+
+        Args:
+            model_name: Name of the embedding model
+            texts: Texts that were embedded
+            vectors: Embeddings aligned with ``texts``
+        """
+        now = time.time()
+        rows = {}
+        for text, vector in zip(texts, vectors):
+            vector = np.asarray(vector, dtype=np.float32)
+            key = self.make_key(model_name, text)
+            rows[key] = (key, model_name, vector.shape[0], vector.tobytes(), now)
+
+        with self._lock:
+            # Eviction below needs the last-use times of recent hits
+            self._flush_touches()
+            existing = len(self._select("key", list(rows)))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings "
+                "(key, model_name, dim, vector, last_used) VALUES (?, ?, ?, ?, ?)",
+                list(rows.values()),
+            )
+            self._size += len(rows) - existing
+            if self._size > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE key IN ("
+                    "SELECT key FROM embeddings ORDER BY last_used ASC LIMIT ?)",
+                    (self._size - self.max_entries,),
+                )
+                self._size = self.max_entries
+            self._conn.commit()
+
+    def _select(self, columns: str, keys: Sequence[str]) -> List[Tuple]:
+        """Fetch columns of the stored entries among ``keys``.
+
+        Args:
+            columns: Comma-separated column names
+            keys: Cache keys to look up
+
+        Returns:
+            One row per stored key
+        """
+        rows = []
+        # Stay well below SQLite's bound-parameter limit
+        for offset in range(0, len(keys), 500):
+            chunk = keys[offset : offset + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows.extend(
+                self._conn.execute(
+                    f"SELECT {columns} FROM embeddings WHERE key IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+            )
+        return rows
+
+    def _flush_touches(self) -> None:
+        """Write the recorded last-use times of hits, under the caller's lock."""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                [(used, key) for key, used in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def get_or_encode(
+        self,
+        model_name: str,
+        texts: Sequence[str],
+        encode: Callable[[List[str]], np.ndarray],
+    ) -> np.ndarray:
+        """Return embeddings for texts, encoding only the cache misses.
+
+        Args:
+            model_name: Name of the embedding model
+            texts: Texts to embed
+            encode: Function encoding a list of texts into a 2-D array
+
+        Returns:
+            Array of shape (len(texts), dim)
+        """
+        vectors = self.get_many(model_name, texts)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+
+        if missing:
+            # Encode each distinct missing text once
+            unique_texts = list(dict.fromkeys(texts[i] for i in missing))
+            encoded = np.asarray(encode(unique_texts), dtype=np.float32)
+            by_text = dict(zip(unique_texts, encoded))
+            self.put_many(model_name, unique_texts, encoded)
+            for i in missing:
+                vectors[i] = by_text[texts[i]]
+
+        return np.vstack(vectors) if vectors else np.empty((0, 0), dtype=np.float32)
+
+    def stats(self) -> Dict[str, float]:
+        """Get cache effectiveness counters.
+
+        Returns:
+            Dictionary with hits, misses, hit rate and number of entries
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": self._size,
+        }
+
+    def clear(self) -> None:
+        """Remove all cached embeddings and reset the counters."""
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+            self._touched.clear()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+
+    def close(self) -> None:
+        """Write pending last-use times and close the database connection."""
+        with self._lock:
+            self._flush_touches()
+            self._conn.commit()
+            self._conn.close()
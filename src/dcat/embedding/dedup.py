@@ -0,0 +1,122 @@
+"""
+MinHash-LSH near-duplicate detection for catalog ingestion.
+"""
+
+import hashlib
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from .lexical import tokenize
+
+# Mersenne prime 2^31 - 1 keeps (a * h + b) within uint64
+_PRIME = np.uint64((1 << 31) - 1)
+
+
+def shingles(text: str, size: int = 3) -> List[str]:
+    """Split text into overlapping word n-grams.
+
+    Args:
+        text: Text to shingle
+        size: Number of words per shingle
+
+    Returns:
+        Shingles (the whole text when it has fewer than ``size`` words)
+    """
+    tokens = tokenize(text)
+    if len(tokens) <= size:
+        return [" ".join(tokens)]
+    return [" ".join(tokens[i : i + size]) for i in range(len(tokens) - size + 1)]
+
+
+class MinHasher:
+    """Computes MinHash signatures that estimate Jaccard similarity."""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        """Initialize the hash permutations.
+
+        Args:
+            num_perm: Number of hash permutations (signature length)
+            seed: Random seed for the permutation coefficients
+        """
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self._a = rng.integers(1, int(_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        """Compute the MinHash signature of a text.
+
+        Args:
+            text: Text to hash
+
+        Returns:
+            Array of ``num_perm`` minimum hash values
+        """
+        hashes = np.array(
+            [
+                int.from_bytes(
+                    hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(),
+                    "little",
+                )
+                for shingle in set(shingles(text))
+            ],
+            dtype=np.uint64,
+        ) % _PRIME
+        permuted = (hashes[:, None] * self._a + self._b) % _PRIME
+        return permuted.min(axis=0)
+
+
+def find_near_duplicates(
+    texts: Sequence[str],
+    threshold: float = 0.9,
+    num_perm: int = 128,
+    bands: int = 16,
+) -> List[List[int]]:
+    """Cluster near-duplicate texts with MinHash locality-sensitive hashing.
+
+    Signatures are split into ``bands`` bands; texts sharing any band land in
+    the same bucket. Each bucket member is compared with the bucket's first
+    text only, so the work stays linear in the number of texts even when
+    thousands of copies share a bucket. Matches are merged transitively.
+
+    Args:
+        texts: Texts to cluster
+        threshold: Minimum estimated Jaccard similarity of word shingles
+        num_perm: MinHash signature length; must be divisible by ``bands``
+        bands: Number of LSH bands
+
+    Returns:
+        Clusters as lists of text indices, in input order; texts without
+        duplicates form singleton clusters
+    """
+    if num_perm % bands:
+        raise ValueError(f"bands ({bands}) must divide num_perm ({num_perm})")
+
+    hasher = MinHasher(num_perm)
+    signatures = np.stack([hasher.signature(text) for text in texts]) if texts else []
+    rows = num_perm // bands
+
+    parent = list(range(len(texts)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for band in range(bands):
+        buckets: Dict[bytes, int] = {}
+        for i in range(len(texts)):
+            key = signatures[i, band * rows : (band + 1) * rows].tobytes()
+            first = buckets.setdefault(key, i)
+            if first == i or find(first) == find(i):
+                continue
+            similarity = float(np.mean(signatures[first] == signatures[i]))
+            if similarity >= threshold:
+                parent[find(i)] = find(first)
+
+    clusters: Dict[int, List[int]] = {}
+    for i in range(len(texts)):
+        clusters.setdefault(find(i), []).append(i)
+    return list(clusters.values())
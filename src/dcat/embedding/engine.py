@@ -2,14 +2,55 @@
 Embedding engine for semantic analysis of DCAT metadata.
 """
 
-from typing import Dict, List, Optional, Tuple
+import contextlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional, Tuple
 import numpy as np
-from sentence_transformers import SentenceTransformer
 import chromadb
 from chromadb.config import Settings
 
 from ..metadata.base import DCATDataset, DCATCatalog
 from ..metadata.validators import DCATValidator
+from .cache import EmbeddingCache
+from .dedup import find_near_duplicates
+from .backends import (
+    create_vector_index,
+    load_collection_version,
+    open_collection_index,
+    save_collection_index,
+    store_collection_version,
+)
+from .batching import EncodeBatcher
+from .filters import build_where, filter_metadata
+from .index import VectorIndex, index_collection, index_written
+from .lexical import BM25Index, reciprocal_rank_fusion
+from .metrics import LatencyMetrics
+from .migration import EmbeddingMigration, resolve_collection
+from .result_cache import SearchResultCache
+from .models import get_model
+from .pool import iter_collection_records, reindex_collection
+from .reduction import ReducedIndex, collection_dimension_report, create_reducer
+from .similarity import top_k_neighbours
+
+
+@dataclass(frozen=True)
+class ServingState:
+    """Collection, model and in-process index that serve queries together.
+
+    A migration swaps the whole state at once, so a query that reads it
+    once never encodes with one model and searches another's vectors.
+    """
+
+    collection: Any
+    model_name: str
+    model: Any
+    vector_index: Optional[VectorIndex]
+    vector_index_directory: str
 
 
 class EmbeddingEngine:
@@ -20,6 +61,12 @@ class EmbeddingEngine:
         model_name: str = "all-MiniLM-L6-v2",
         collection_name: str = "dcat_embeddings",
         persist_directory: str = "./vector_store",
+        embedding_cache: Optional[EmbeddingCache] = None,
+        vector_index: Optional[VectorIndex] = None,
+        vector_backend: Optional[str] = None,
+        result_cache: Optional[SearchResultCache] = None,
+        reduce_dim: Optional[int] = None,
+        reduction: str = "pca",
     ):
         """Initialize the embedding engine.
 
@@ -27,14 +74,112 @@ class EmbeddingEngine:
             model_name: Name of the sentence transformer model to use
             collection_name: Name of the ChromaDB collection
             persist_directory: Directory to persist embeddings
+            embedding_cache: Cache of previously computed embeddings. Defaults
+                to a cache file inside ``persist_directory``
+            vector_index: Optional in-process index (e.g. ``HNSWIndex``) that
+                serves nearest-neighbour queries instead of ChromaDB. ChromaDB
+                remains the persistent store of documents and metadata
+            vector_backend: Name of an index backend (``numpy``, ``hnsw``,
+                ``ivfpq``, ``binary``) to open from, or build next to, the
+                ChromaDB store when no ``vector_index`` is given. ``numpy`` is
+                exact and needs no extra dependencies; ``binary`` keeps only
+                sign-bit codes in RAM and re-ranks a Hamming shortlist
+            result_cache: Cache of search results. Entries are keyed by the
+                collection version, which every write bumps
+            reduce_dim: Store vectors in the ``vector_backend`` index
+                projected to this many dimensions, fitted on the stored
+                catalog; queries are projected the same way. ChromaDB keeps
+                the full vectors. See ``dimension_report`` to pick a size
+            reduction: Reduction method, ``pca`` or ``truncate``
         """
-        self.model = SentenceTransformer(model_name)
+        # A migrated collection must be queried with the model it was built with
+        physical_name, migrated_model = resolve_collection(
+            persist_directory, collection_name
+        )
+        if migrated_model and migrated_model != model_name:
+            print(
+                f"Collection {collection_name} was migrated to {migrated_model}; "
+                f"using it instead of {model_name}"
+            )
+            model_name = migrated_model
+
+        self.collection_name = collection_name
+        self.persist_directory = persist_directory
+        # Shared with every other component using the same model
+        model = get_model(model_name)
+        self.embedding_cache = embedding_cache or EmbeddingCache(
+            os.path.join(persist_directory, "embedding_cache.sqlite3")
+        )
         self.chroma_client = chromadb.PersistentClient(
             path=persist_directory, settings=Settings(anonymized_telemetry=False)
         )
-        self.collection = self.chroma_client.get_or_create_collection(
-            name=collection_name
+        collection = self.chroma_client.get_or_create_collection(name=physical_name)
+        # Write counter of the collection, persisted so saved indexes can be
+        # checked for staleness; also keys the search result cache
+        self.collection_version = load_collection_version(
+            persist_directory, physical_name
         )
+        self._vector_index_suffix = vector_backend or "index"
+        vector_index_directory = os.path.join(
+            persist_directory, f"{physical_name}.{self._vector_index_suffix}"
+        )
+        if vector_index is None and vector_backend:
+            vector_index = open_collection_index(
+                collection,
+                vector_index_directory,
+                vector_backend,
+                model.get_sentence_embedding_dimension(),
+                version=self.collection_version,
+                reduce_dim=reduce_dim,
+                reduction=reduction,
+            )
+        self._serving = ServingState(
+            collection, model_name, model, vector_index, vector_index_directory
+        )
+
+        # BM25 index over the stored documents, loaded or built on first use
+        self.lexical_index_path = os.path.join(
+            persist_directory, f"{collection_name}.bm25.json"
+        )
+        self._lexical_index: Optional[BM25Index] = None
+        self._lexical_lock = threading.Lock()
+        self.retrieval_metrics = LatencyMetrics()
+        self._retrieval_executor = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="hybrid-retrieval"
+        )
+
+        self.result_cache = result_cache or SearchResultCache()
+
+        # Model migration in progress, if any (see start_migration)
+        self.migration: Optional[EmbeddingMigration] = None
+
+        # Micro-batching of query encodes (see enable_query_batching)
+        self.query_batcher: Optional[EncodeBatcher] = None
+
+    @property
+    def collection(self):
+        """ChromaDB collection serving queries."""
+        return self._serving.collection
+
+    @property
+    def model_name(self) -> str:
+        """Name of the model the serving collection is embedded with."""
+        return self._serving.model_name
+
+    @property
+    def model(self):
+        """Sentence transformer of the serving collection."""
+        return self._serving.model
+
+    @property
+    def vector_index(self) -> Optional[VectorIndex]:
+        """In-process index of the serving collection, if one is used."""
+        return self._serving.vector_index
+
+    @property
+    def vector_index_directory(self) -> str:
+        """Directory the in-process index is saved to."""
+        return self._serving.vector_index_directory
 
     def _prepare_metadata_text(self, dataset: DCATDataset) -> str:
         """Prepare metadata text for embedding.
@@ -87,7 +232,114 @@ class EmbeddingEngine:
             Embedding vector
         """
         text = self._prepare_metadata_text(dataset)
-        return self.model.encode(text)
+        return self.encode_texts([text])[0]
+
+    def _encode_with(
+        self, state: ServingState, texts: List[str], batch_size: int = 64
+    ) -> np.ndarray:
+        """Encode texts with the model of ``state``, see ``encode_texts``."""
+        return self.embedding_cache.get_or_encode(
+            state.model_name,
+            texts,
+            lambda missing: state.model.encode(
+                missing, batch_size=batch_size, show_progress_bar=False
+            ),
+        )
+
+    def _encoded_for_serving(
+        self,
+        state: ServingState,
+        texts: List[str],
+        embeddings: np.ndarray,
+        batch_size: int = 64,
+    ) -> np.ndarray:
+        """Re-encode texts if a migration swapped models since they were encoded.
+
+        Call while holding the write lock, which a swap also takes.
+
+        Args:
+            state: Serving state the embeddings were computed with
+            texts: Encoded texts
+            embeddings: Embeddings aligned with ``texts``
+            batch_size: Number of texts passed to the model per encode batch
+
+        Returns:
+            Embeddings from the model of the current serving state
+        """
+        if self._serving is state:
+            return embeddings
+        return self._encode_with(self._serving, texts, batch_size)
+
+    def enable_query_batching(
+        self, max_batch_size: int = 32, max_wait_ms: float = 5.0
+    ) -> EncodeBatcher:
+        """Batch query encodes of concurrent searches into shared model calls.
+
+        Useful when many threads (e.g. API requests) search at once; each
+        search then waits up to ``max_wait_ms`` for others to join its batch.
+
+        Args:
+            max_batch_size: Maximum number of queries per model call
+            max_wait_ms: Longest wait for a batch to fill
+
+        Returns:
+            The batcher, whose ``stats`` expose queue depth and batch sizes
+        """
+        if self.query_batcher is None:
+            # Looks the model up per batch so a migration swap is picked up
+            self.query_batcher = EncodeBatcher(
+                lambda texts: self.model.encode(
+                    texts, batch_size=len(texts), show_progress_bar=False
+                ),
+                max_batch_size=max_batch_size,
+                max_wait_ms=max_wait_ms,
+            )
+        return self.query_batcher
+
+    def _encode_query(self, query: str) -> Tuple[ServingState, np.ndarray]:
+        """Encode a search query, through the query batcher when enabled.
+
+        Returns:
+            The serving state to search and the query embedding, encoded
+            with the model of that state
+        """
+        state = self._serving
+        if self.query_batcher is not None:
+            embedding = self.query_batcher.encode(query)
+            if self._serving is state:
+                return state, embedding
+            # A migration swapped models while the batch was encoded
+            state = self._serving
+        return state, state.model.encode(query)
+
+    def encode_texts(self, texts: List[str], batch_size: int = 64) -> np.ndarray:
+        """Encode texts, reusing cached embeddings for unchanged texts.
+
+        Args:
+            texts: Texts to encode
+            batch_size: Number of texts passed to the model per encode batch
+
+        Returns:
+            Array of embeddings, one row per text
+        """
+        return self._encode_with(self._serving, texts, batch_size)
+
+    def _prepare_metadata(self, dataset: DCATDataset) -> Dict:
+        """Prepare the metadata stored alongside a dataset embedding.
+
+        Args:
+            dataset: DCAT dataset
+
+        Returns:
+            Metadata dictionary for the vector store
+        """
+        return {
+            "title": (
+                dataset.title.get("en", "").value if dataset.title.get("en") else ""
+            ),
+            "source_id": dataset.identifier.source_id or "",
+            **filter_metadata(dataset),
+        }
 
     def add_dataset(self, dataset: DCATDataset) -> None:
         """Add a dataset to the vector store.
@@ -96,23 +348,23 @@ class EmbeddingEngine:
             dataset: DCAT dataset
         """
         text = self._prepare_metadata_text(dataset)
-        embedding = self.embed_dataset(dataset)
-
-        self.collection.add(
-            documents=[text],
-            embeddings=[embedding.tolist()],
-            ids=[str(dataset.identifier.id)],
-            metadatas=[
-                {
-                    "title": (
-                        dataset.title.get("en", "").value
-                        if dataset.title.get("en")
-                        else ""
-                    ),
-                    "source_id": dataset.identifier.source_id or "",
-                }
-            ],
-        )
+        state = self._serving
+        embedding = self._encode_with(state, [text])[0]
+
+        with self._write_lock():
+            embedding = self._encoded_for_serving(state, [text], [embedding])[0]
+            self.collection.add(
+                documents=[text],
+                embeddings=[embedding.tolist()],
+                ids=[str(dataset.identifier.id)],
+                metadatas=[self._prepare_metadata(dataset)],
+            )
+            self._after_write(
+                [str(dataset.identifier.id)],
+                [text],
+                [embedding],
+                [self._prepare_metadata(dataset)],
+            )
 
     def update_dataset(self, dataset: DCATDataset) -> None:
         """Update a dataset in the vector store.
@@ -121,22 +373,477 @@ class EmbeddingEngine:
             dataset: DCAT dataset
         """
         text = self._prepare_metadata_text(dataset)
-        embedding = self.embed_dataset(dataset)
-
-        self.collection.update(
-            documents=[text],
-            embeddings=[embedding.tolist()],
-            ids=[str(dataset.identifier.id)],
-            metadatas=[
-                {
-                    "title": (
-                        dataset.title.get("en", "").value
-                        if dataset.title.get("en")
-                        else ""
-                    ),
-                    "source_id": dataset.identifier.source_id or "",
-                }
-            ],
+        state = self._serving
+        embedding = self._encode_with(state, [text])[0]
+
+        with self._write_lock():
+            embedding = self._encoded_for_serving(state, [text], [embedding])[0]
+            self.collection.update(
+                documents=[text],
+                embeddings=[embedding.tolist()],
+                ids=[str(dataset.identifier.id)],
+                metadatas=[self._prepare_metadata(dataset)],
+            )
+            self._after_write(
+                [str(dataset.identifier.id)],
+                [text],
+                [embedding],
+                [self._prepare_metadata(dataset)],
+            )
+
+    def ingest_datasets(
+        self,
+        datasets: List[DCATDataset],
+        batch_size: int = 64,
+        upsert_batch_size: int = 1000,
+        duplicates: Optional[Dict[str, List[str]]] = None,
+    ) -> Dict[str, float]:
+        """Add or update many datasets using batched encoding and bulk upserts.
+
+        Args:
+            datasets: DCAT datasets to ingest
+            batch_size: Number of texts passed to the model per encode batch
+            upsert_batch_size: Number of datasets written to the vector store
+                per upsert call
+            duplicates: Ids of the near-duplicates each dataset stands for,
+                stored in its metadata as ``duplicate_ids`` (a JSON list)
+
+        Returns:
+            Ingestion statistics (processed, added, updated, failed counts,
+            elapsed seconds and datasets per second)
+        """
+        start = time.perf_counter()
+        stats = {"processed": 0, "added": 0, "updated": 0, "failed": 0}
+
+        for offset in range(0, len(datasets), upsert_batch_size):
+            chunk = datasets[offset : offset + upsert_batch_size]
+            ids = [str(dataset.identifier.id) for dataset in chunk]
+
+            try:
+                # One existence lookup for the whole chunk
+                existing = set(self.collection.get(ids=ids, include=[])["ids"])
+                texts = [self._prepare_metadata_text(dataset) for dataset in chunk]
+                state = self._serving
+                embeddings = self._encode_with(state, texts, batch_size)
+
+                metadatas = [self._prepare_metadata(dataset) for dataset in chunk]
+                if duplicates:
+                    for doc_id, metadata in zip(ids, metadatas):
+                        members = duplicates.get(doc_id)
+                        if members:
+                            metadata["duplicate_ids"] = json.dumps(members)
+                            metadata["duplicate_count"] = len(members)
+                with self._write_lock():
+                    embeddings = self._encoded_for_serving(
+                        state, texts, embeddings, batch_size
+                    )
+                    self.collection.upsert(
+                        documents=texts,
+                        embeddings=[embedding.tolist() for embedding in embeddings],
+                        ids=ids,
+                        metadatas=metadatas,
+                    )
+                    self._after_write(ids, texts, embeddings, metadatas)
+            except Exception as e:
+                end = offset + len(chunk)
+                print(f"Error processing datasets {offset}-{end}: {str(e)}")
+                stats["failed"] += len(chunk)
+                continue
+
+            stats["processed"] += len(chunk)
+            stats["updated"] += len(existing)
+            stats["added"] += len(chunk) - len(existing)
+
+        elapsed = time.perf_counter() - start
+        stats["elapsed_seconds"] = elapsed
+        stats["datasets_per_second"] = (
+            stats["processed"] / elapsed if elapsed else 0.0
+        )
+        return stats
+
+    def reindex(
+        self, n_workers: Optional[int] = None, batch_size: int = 256
+    ) -> Dict[str, float]:
+        """Re-embed every stored dataset using a pool of worker processes.
+
+        Encoding is spread over ``n_workers`` processes while this engine
+        remains the only writer of the collection, the embedding cache and
+        the in-process index.
+
+        Args:
+            n_workers: Number of encoder processes; defaults to the CPU count
+            batch_size: Number of datasets per encode batch
+
+        Returns:
+            Re-indexing statistics, see ``parallel_encode``
+        """
+
+        def _write(ids, texts, embeddings, metadatas):
+            self.embedding_cache.put_many(self.model_name, texts, embeddings)
+            self._index_vectors(ids, embeddings, metadatas)
+            self._bump_version()
+
+        return reindex_collection(
+            self.collection,
+            self.model_name,
+            n_workers=n_workers,
+            batch_size=batch_size,
+            write=_write,
+        )
+
+    def _after_write(
+        self,
+        ids: List[str],
+        texts: List[str],
+        embeddings: np.ndarray,
+        metadatas: List[Dict],
+    ) -> None:
+        """Propagate a write to the indexes, a running migration and caches.
+
+        Args:
+            ids: Dataset ids
+            texts: Document texts aligned with ``ids``
+            embeddings: Embeddings aligned with ``ids``
+            metadatas: Metadata dictionaries aligned with ``ids``
+        """
+        self._index_vectors(ids, embeddings, metadatas)
+        self._index_texts(ids, texts)
+        if self.migration is not None:
+            self.migration.mirror(ids, texts, metadatas)
+        self._bump_version()
+
+    def _write_lock(self):
+        """Lock to hold from a collection write until it is propagated.
+
+        While a migration exists this is its ``write_lock``, so the write
+        is mirrored before the migration copies or swaps again.
+        """
+        if self.migration is None:
+            return contextlib.nullcontext()
+        return self.migration.write_lock
+
+    def delete_datasets(self, ids: List[str]) -> None:
+        """Remove datasets from the vector store and its indexes.
+
+        Args:
+            ids: Dataset ids; ids that are not stored are ignored
+        """
+        if not ids:
+            return
+        with self._write_lock():
+            ids = self.collection.get(ids=list(ids), include=[])["ids"]
+            if not ids:
+                return
+            self.collection.delete(ids=ids)
+            if self.migration is not None:
+                self.migration.mirror_delete(ids)
+        if self.vector_index is not None:
+            self.vector_index.remove(ids)
+        with self._lexical_lock:
+            if self._lexical_index is not None:
+                self._lexical_index.remove(ids)
+        self._bump_version()
+
+    def start_migration(
+        self, target_model: str, batch_size: int = 256
+    ) -> EmbeddingMigration:
+        """Re-embed the collection with another model in the background.
+
+        Queries keep using the current collection until the migration swaps
+        to the shadow collection; writes made meanwhile are mirrored into it.
+        A migration interrupted earlier resumes from its checkpoint.
+
+        Args:
+            target_model: Name of the sentence transformer model to migrate to
+            batch_size: Number of documents per checkpointed batch
+
+        Returns:
+            The running migration; see ``EmbeddingMigration.progress``
+        """
+        if self.migration is not None and self.migration.progress()["running"]:
+            raise ValueError("A migration is already running")
+
+        self.migration = EmbeddingMigration(
+            self.chroma_client,
+            self.persist_directory,
+            self.collection_name,
+            target_model,
+            batch_size=batch_size,
+            on_swap=self._switch_collection,
+        )
+        self.migration.start()
+        return self.migration
+
+    def _switch_collection(self, collection_name: str, model_name: str) -> None:
+        """Serve queries from a migrated collection and its model.
+
+        The new serving state is built first and swapped in with a single
+        assignment under the write lock, so writes never see it half done.
+
+        Args:
+            collection_name: Name of the ChromaDB collection to switch to
+            model_name: Model the collection was embedded with
+        """
+        collection = self.chroma_client.get_collection(collection_name)
+        vector_index_directory = os.path.join(
+            self.persist_directory, f"{collection_name}.{self._vector_index_suffix}"
+        )
+        vector_index = self.vector_index
+        if vector_index is not None:
+            vector_index = self._empty_vector_index(
+                get_model(model_name).get_sentence_embedding_dimension(),
+                vector_index_directory,
+            )
+            index_collection(collection, vector_index)
+
+        state = ServingState(
+            collection,
+            model_name,
+            get_model(model_name),
+            vector_index,
+            vector_index_directory,
+        )
+        with self._write_lock():
+            self._serving = state
+            # Keep versions increasing, as they key cached search results
+            self.collection_version = max(
+                self.collection_version,
+                load_collection_version(self.persist_directory, collection_name),
+            )
+            self._bump_version()
+
+    def _empty_vector_index(self, dim: int, directory: str) -> VectorIndex:
+        """Create an empty index configured like the current one.
+
+        A reduced index gets a new, unfitted reducer with the same method and
+        output dimension, so it is refitted on the vectors it is loaded with.
+
+        Args:
+            dim: Dimensionality of the model embeddings
+            directory: Directory the new index will be saved to
+        """
+        index = self.vector_index
+        if isinstance(index, ReducedIndex):
+            return ReducedIndex(
+                create_vector_index(
+                    index.index.backend,
+                    index.index.dim,
+                    directory,
+                    **index.index._params(),
+                ),
+                create_reducer(
+                    index.reducer.method, dim, index.reducer.output_dim
+                ),
+            )
+        return create_vector_index(index.backend, dim, directory, **index._params())
+
+    def _index_vectors(
+        self, ids: List[str], embeddings: np.ndarray, metadatas: List[Dict]
+    ) -> None:
+        """Mirror written vectors into the in-process index, if one is used.
+
+        An index that needs training is trained from the collection once
+        it is large enough, see ``index_written``.
+
+        Args:
+            ids: Dataset ids
+            embeddings: Embeddings aligned with ``ids``
+            metadatas: Metadata dictionaries aligned with ``ids``
+        """
+        if self.vector_index is not None:
+            index_written(
+                self.collection,
+                self.vector_index,
+                ids,
+                np.asarray(embeddings),
+                metadatas,
+            )
+
+    def _bump_version(self) -> None:
+        """Mark the collection as changed for result caches and saved indexes."""
+        self.collection_version += 1
+        store_collection_version(
+            self.persist_directory, self.collection.name, self.collection_version
+        )
+
+    def _index_texts(self, ids: List[str], texts: List[str]) -> None:
+        """Mirror written documents into the BM25 index.
+
+        If the index has not been loaded in this process, nothing is done:
+        the write bumps the collection version, which makes the saved copy
+        stale, so the next hybrid search rebuilds it from ChromaDB.
+
+        Args:
+            ids: Dataset ids
+            texts: Document texts aligned with ``ids``
+        """
+        with self._lexical_lock:
+            if self._lexical_index is not None:
+                self._lexical_index.add(ids, texts)
+
+    @property
+    def lexical_index(self) -> BM25Index:
+        """BM25 index of the stored documents, loaded or built on first use.
+
+        The saved copy is used only if it was saved at the current collection
+        version.
+        """
+        with self._lexical_lock:
+            if self._lexical_index is None:
+                if os.path.exists(self.lexical_index_path):
+                    index = BM25Index.load(self.lexical_index_path)
+                    if index.version == self.collection_version:
+                        self._lexical_index = index
+                if self._lexical_index is None:
+                    self._lexical_index = self._build_lexical_index()
+            return self._lexical_index
+
+    def _build_lexical_index(self) -> BM25Index:
+        """Build the BM25 index from the documents stored in ChromaDB."""
+        index = BM25Index()
+        # Read before the documents, so a concurrent write leaves it stale
+        index.version = self.collection_version
+        ids, texts = [], []
+        for doc_id, text, _ in iter_collection_records(self.collection):
+            ids.append(doc_id)
+            texts.append(text)
+        index.add(ids, texts)
+        index.save(self.lexical_index_path)
+        return index
+
+    def save_lexical_index(self) -> None:
+        """Persist the BM25 index next to the vector store."""
+        index = self.lexical_index
+        index.version = self.collection_version
+        index.save(self.lexical_index_path)
+
+    def _query_nearest(
+        self,
+        query_embedding: np.ndarray,
+        n_results: int,
+        where: Optional[Dict] = None,
+        state: Optional[ServingState] = None,
+    ) -> List[Tuple[str, float, Dict]]:
+        """Find the nearest stored vectors to a query embedding.
+
+        Args:
+            query_embedding: Query vector
+            n_results: Number of results to return
+            where: Optional ChromaDB metadata predicate. Filtered queries go
+                to ChromaDB, which restricts scoring to matching vectors
+            state: Serving state the query was encoded for; defaults to
+                the current one
+
+        Returns:
+            List of (dataset_id, distance, metadata) tuples
+        """
+        return self._query_nearest_many(
+            np.atleast_2d(query_embedding), n_results, where, state
+        )[0]
+
+    def _query_nearest_many(
+        self,
+        query_embeddings: np.ndarray,
+        n_results: int,
+        where: Optional[Dict] = None,
+        state: Optional[ServingState] = None,
+    ) -> List[List[Tuple[str, float, Dict]]]:
+        """Find the nearest stored vectors to several query embeddings at once.
+
+        Args:
+            query_embeddings: Array of shape (q, dim)
+            n_results: Number of results per query
+            where: Optional ChromaDB metadata predicate, see ``_query_nearest``
+            state: Serving state the queries were encoded for, see
+                ``_query_nearest``
+
+        Returns:
+            One list of (dataset_id, distance, metadata) tuples per query
+        """
+        state = state or self._serving
+        # An index still waiting for enough vectors to train is empty
+        if (
+            state.vector_index is not None
+            and getattr(state.vector_index, "is_trained", True)
+            and where is None
+        ):
+            return state.vector_index.search_many(query_embeddings, n_results)
+
+        results = state.collection.query(
+            query_embeddings=np.asarray(query_embeddings).tolist(),
+            n_results=n_results,
+            where=where,
+            include=["metadatas", "distances"],
+        )
+        return [
+            list(zip(ids, distances, metadatas))
+            for ids, distances, metadatas in zip(
+                results["ids"], results["distances"], results["metadatas"]
+            )
+        ]
+
+    def rebuild_vector_index(self, batch_size: int = 10_000) -> int:
+        """Load every vector stored in ChromaDB into the in-process index.
+
+        Indexes that need training (e.g. ``IVFPQIndex``) are trained on a
+        sample of the stored vectors first. A reduced index is rebuilt from
+        scratch so its projection is refitted on the current catalog.
+
+        Args:
+            batch_size: Number of records read from ChromaDB per page
+
+        Returns:
+            Number of vectors indexed
+        """
+        if self.vector_index is None:
+            raise ValueError("No vector index configured for this engine")
+
+        if isinstance(self.vector_index, ReducedIndex):
+            self._serving = replace(
+                self._serving,
+                vector_index=self._empty_vector_index(
+                    self.vector_index.dim, self.vector_index_directory
+                ),
+            )
+            self._bump_version()
+        return index_collection(self.collection, self.vector_index, batch_size)
+
+    def dimension_report(
+        self,
+        dims: Tuple[int, ...] = (32, 64, 128, 192, 256),
+        k: int = 10,
+        sample_size: int = 10_000,
+        method: str = "pca",
+    ) -> List[Dict[str, float]]:
+        """Report search recall against memory for reduced vector sizes.
+
+        Args:
+            dims: Target dimensions; the full model dimension is included
+            k: Number of neighbours compared per query
+            sample_size: Number of stored vectors sampled
+            method: Reduction method, ``pca`` or ``truncate``
+
+        Returns:
+            One row per dimension, see ``reduction.dimension_report``
+        """
+        return collection_dimension_report(
+            self.collection, dims=dims, k=k, sample_size=sample_size, method=method
+        )
+
+    def save_vector_index(self, directory: Optional[str] = None) -> None:
+        """Persist the in-process index so the next start does not rebuild it.
+
+        Args:
+            directory: Target directory; defaults to a directory named after
+                the collection and backend inside ``persist_directory``
+        """
+        if self.vector_index is None:
+            raise ValueError("No vector index configured for this engine")
+
+        save_collection_index(
+            self.vector_index,
+            directory or self.vector_index_directory,
+            self.collection_version,
         )
 
     def find_similar_datasets(
@@ -152,17 +859,19 @@ class EmbeddingEngine:
         Returns:
             List of (dataset_id, similarity_score) tuples
         """
-        query_embedding = self.embed_dataset(dataset)
+        state = self._serving
+        query_embedding = self._encode_with(
+            state, [self._prepare_metadata_text(dataset)]
+        )[0]
 
-        results = self.collection.query(
-            query_embeddings=[query_embedding.tolist()],
-            n_results=n_results + 1,  # Add 1 to account for self-match
+        results = self._query_nearest(
+            query_embedding,
+            n_results + 1,  # Add 1 to account for self-match
+            state=state,
         )
 
         similar_datasets = []
-        for i, (doc_id, distance) in enumerate(
-            zip(results["ids"][0], results["distances"][0])
-        ):
+        for doc_id, distance, _ in results:
             # Skip self-match
             if doc_id == str(dataset.identifier.id):
                 continue
@@ -176,7 +885,11 @@ class EmbeddingEngine:
         return similar_datasets[:n_results]
 
     def semantic_search(
-        self, query: str, n_results: int = 5, min_similarity: float = 0.3
+        self,
+        query: str,
+        n_results: int = 5,
+        min_similarity: float = 0.3,
+        filters: Optional[Dict] = None,
     ) -> List[Tuple[str, float, Dict]]:
         """Search for datasets using semantic similarity.
 
@@ -184,33 +897,193 @@ class EmbeddingEngine:
             query: Search query
             n_results: Number of results to return
             min_similarity: Minimum similarity threshold
+            filters: Optional theme, format, publisher and date filters,
+                applied inside the vector query (see ``build_where``)
 
         Returns:
             List of (dataset_id, similarity_score, metadata) tuples
         """
-        query_embedding = self.model.encode(query)
-
-        results = self.collection.query(
-            query_embeddings=[query_embedding.tolist()],
+        key = self.result_cache.make_key(
+            "semantic_search",
+            query,
+            self.collection_version,
             n_results=n_results,
-            include=["metadatas"],
+            min_similarity=min_similarity,
+            filters=filters,
         )
+        cached = self.result_cache.get(key)
+        if cached is not None:
+            return list(cached)
+
+        state, query_embedding = self._encode_query(query)
 
         search_results = []
-        for doc_id, distance, metadata in zip(
-            results["ids"][0], results["distances"][0], results["metadatas"][0]
+        for doc_id, distance, metadata in self._query_nearest(
+            query_embedding, n_results, build_where(filters), state
         ):
             similarity = 1 - distance
             if similarity >= min_similarity:
                 search_results.append((doc_id, similarity, metadata))
 
-        return search_results
+        self.result_cache.put(key, search_results)
+        return list(search_results)
+
+    def semantic_search_many(
+        self,
+        queries: List[str],
+        n_results: int = 5,
+        min_similarity: float = 0.3,
+        filters: Optional[Dict] = None,
+        rrf_k: int = 60,
+    ) -> Tuple[List[List[Tuple[str, float, Dict]]], List[Tuple[str, float, Dict]]]:
+        """Run several semantic searches with one encode and one index lookup.
+
+        Queries already in the result cache are served from it; the others
+        are encoded in a single model call and looked up in one batched
+        query, then cached individually like ``semantic_search`` results.
+
+        Args:
+            queries: Search queries
+            n_results: Number of results per query
+            min_similarity: Minimum similarity threshold
+            filters: Optional filters applied to every query, see
+                ``semantic_search``
+            rrf_k: Reciprocal rank fusion damping constant
+
+        Returns:
+            Tuple of (per-query lists of (dataset_id, similarity_score,
+            metadata) tuples aligned with ``queries``, and the fused ranking
+            of all results as (dataset_id, fused_score, metadata) tuples,
+            best first)
+        """
+        keys = [
+            self.result_cache.make_key(
+                "semantic_search",
+                query,
+                self.collection_version,
+                n_results=n_results,
+                min_similarity=min_similarity,
+                filters=filters,
+            )
+            for query in queries
+        ]
+        results: List[Optional[List[Tuple[str, float, Dict]]]] = [
+            self.result_cache.get(key) for key in keys
+        ]
+
+        missing = [i for i, cached in enumerate(results) if cached is None]
+        if missing:
+            with self.retrieval_metrics.timer("dense_batch"):
+                state = self._serving
+                embeddings = state.model.encode(
+                    [queries[i] for i in missing],
+                    batch_size=len(missing),
+                    show_progress_bar=False,
+                )
+                hits = self._query_nearest_many(
+                    embeddings, n_results, build_where(filters), state
+                )
+            for i, row in zip(missing, hits):
+                results[i] = [
+                    (doc_id, 1 - distance, metadata)
+                    for doc_id, distance, metadata in row
+                    if 1 - distance >= min_similarity
+                ]
+                self.result_cache.put(keys[i], results[i])
+
+        results = [list(row) for row in results]
+        metadatas = {
+            doc_id: metadata for row in results for doc_id, _, metadata in row
+        }
+        fused = reciprocal_rank_fusion(
+            [[doc_id for doc_id, _, _ in row] for row in results], k=rrf_k
+        )
+        return results, [(doc_id, score, metadatas[doc_id]) for doc_id, score in fused]
+
+    def _timed(self, name: str, func, *args):
+        """Call ``func`` and record its latency under ``name``."""
+        with self.retrieval_metrics.timer(name):
+            return func(*args)
+
+    def hybrid_search(
+        self,
+        query: str,
+        n_results: int = 5,
+        candidates: int = 50,
+        rrf_k: int = 60,
+    ) -> List[Tuple[str, float, Dict]]:
+        """Search with BM25 and dense similarity, fused by reciprocal rank.
+
+        Lexical matching catches exact identifiers, codes and rare names that
+        dense embeddings rank poorly. Both retrievers run concurrently and
+        their latencies are recorded in ``retrieval_metrics`` as ``dense``,
+        ``lexical`` and ``hybrid``.
+
+        Args:
+            query: Search query
+            n_results: Number of results to return
+            candidates: Number of hits taken from each retriever
+            rrf_k: Reciprocal rank fusion damping constant
+
+        Returns:
+            List of (dataset_id, fused_score, metadata) tuples
+        """
+
+        def _dense():
+            state, query_embedding = self._encode_query(query)
+            return self._query_nearest(query_embedding, candidates, state=state)
+
+        with self.retrieval_metrics.timer("hybrid"):
+            dense_future = self._retrieval_executor.submit(self._timed, "dense", _dense)
+            lexical_future = self._retrieval_executor.submit(
+                self._timed,
+                "lexical",
+                lambda: self.lexical_index.search(query, candidates),
+            )
+            dense = dense_future.result()
+            lexical = lexical_future.result()
+
+            fused = reciprocal_rank_fusion(
+                [[doc_id for doc_id, _, _ in dense], [doc_id for doc_id, _ in lexical]],
+                k=rrf_k,
+            )[:n_results]
 
-    def process_catalog(self, catalog: DCATCatalog) -> None:
+            metadatas = {doc_id: metadata for doc_id, _, metadata in dense}
+            missing = [doc_id for doc_id, _ in fused if doc_id not in metadatas]
+            if missing:
+                stored = self.collection.get(ids=missing, include=["metadatas"])
+                metadatas.update(zip(stored["ids"], stored["metadatas"]))
+
+        return [(doc_id, score, metadatas.get(doc_id) or {}) for doc_id, score in fused]
+
+    def process_catalog(
+        self,
+        catalog: DCATCatalog,
+        batch_size: int = 64,
+        upsert_batch_size: int = 1000,
+        deduplicate: bool = False,
+        dedup_threshold: float = 0.9,
+    ) -> Dict[str, float]:
         """Process all datasets in a catalog.
 
+        With ``deduplicate``, near-identical datasets (e.g. the same table
+        published per year or per region) are clustered first and only one
+        representative per cluster is embedded and stored, listing the other
+        members in its ``duplicate_ids`` metadata. Members are then not in
+        the vector store (copies stored by earlier runs are removed), so
+        lookups by a member id must go through its representative.
+
         Args:
             catalog: DCAT catalog
+            batch_size: Number of texts passed to the model per encode batch
+            upsert_batch_size: Number of datasets written per upsert call
+            deduplicate: Whether to collapse near-duplicate datasets
+            dedup_threshold: Minimum estimated Jaccard similarity of two
+                dataset descriptions for them to count as duplicates
+
+        Returns:
+            Ingestion statistics, see ``ingest_datasets``, plus the number of
+            ``duplicates`` collapsed into representatives
         """
         # Validate catalog first
         validator = DCATValidator()
@@ -219,32 +1092,103 @@ class EmbeddingEngine:
         if quality_score < 0.5:
             raise ValueError(f"Catalog quality score too low: {quality_score}")
 
-        # Process each dataset
-        for dataset in catalog.datasets:
-            try:
-                if self.collection.get(ids=[str(dataset.identifier.id)]):
-                    self.update_dataset(dataset)
-                else:
-                    self.add_dataset(dataset)
-            except Exception as e:
-                print(f"Error processing dataset {dataset.identifier.id}: {str(e)}")
-                continue
+        datasets, duplicates = catalog.datasets, {}
+        if deduplicate:
+            datasets, duplicates = self._deduplicate(catalog.datasets, dedup_threshold)
+            # Members may have been stored on their own by an earlier run
+            self.delete_datasets(
+                [doc_id for members in duplicates.values() for doc_id in members]
+            )
+
+        stats = self.ingest_datasets(
+            datasets,
+            batch_size=batch_size,
+            upsert_batch_size=upsert_batch_size,
+            duplicates=duplicates,
+        )
+        stats["duplicates"] = len(catalog.datasets) - len(datasets)
+        print(
+            f"Ingested {stats['processed']} datasets "
+            f"({stats['added']} added, {stats['updated']} updated, "
+            f"{stats['failed']} failed, {stats['duplicates']} near-duplicates "
+            f"collapsed) in {stats['elapsed_seconds']:.1f}s "
+            f"({stats['datasets_per_second']:.1f} datasets/sec)"
+        )
 
         # Update similarity scores
-        self._update_similarity_scores(catalog)
+        self._update_similarity_scores(datasets)
+        # A loaded BM25 index was updated with the ingested documents; an
+        # unloaded one is rebuilt by the next hybrid search, as the saved
+        # copy is now stale
+        if self.vector_index is not None and getattr(
+            self.vector_index, "is_trained", True
+        ):
+            self.save_vector_index()
+        return stats
 
-    def _update_similarity_scores(self, catalog: DCATCatalog) -> None:
-        """Update similarity scores between datasets in a catalog.
+    def _deduplicate(
+        self, datasets: List[DCATDataset], threshold: float
+    ) -> Tuple[List[DCATDataset], Dict[str, List[str]]]:
+        """Pick one representative per cluster of near-duplicate datasets.
+
+        The most recently modified member represents its cluster.
 
         Args:
-            catalog: DCAT catalog
+            datasets: DCAT datasets
+            threshold: Minimum estimated Jaccard similarity for duplicates
+
+        Returns:
+            Tuple of (representatives in input order, representative id ->
+            ids of the other cluster members)
         """
-        for dataset in catalog.datasets:
-            similar_datasets = self.find_similar_datasets(
-                dataset, n_results=10, min_similarity=0.5
+        texts = [self._prepare_metadata_text(dataset) for dataset in datasets]
+        clusters = find_near_duplicates(texts, threshold=threshold)
+
+        representatives: List[int] = []
+        duplicates: Dict[str, List[str]] = {}
+        for cluster in clusters:
+            best = max(
+                cluster,
+                key=lambda i: datasets[i].modified.timestamp()
+                if datasets[i].modified
+                else float("-inf"),
             )
+            representatives.append(best)
+            if len(cluster) > 1:
+                duplicates[str(datasets[best].identifier.id)] = [
+                    str(datasets[i].identifier.id) for i in cluster if i != best
+                ]
+
+        return [datasets[i] for i in sorted(representatives)], duplicates
+
+    def _update_similarity_scores(
+        self,
+        datasets: List[DCATDataset],
+        n_results: int = 10,
+        min_similarity: float = 0.5,
+        block_size: int = 256,
+    ) -> None:
+        """Update similarity scores between the datasets stored from a catalog.
+
+        Args:
+            datasets: Ingested datasets, i.e. the cluster representatives when
+                the catalog was deduplicated
+            n_results: Number of similar datasets to keep per dataset
+            min_similarity: Minimum similarity threshold
+            block_size: Number of datasets compared against the catalog at once
+        """
+        if not datasets:
+            return
+
+        # Served from the embedding cache, filled when they were ingested
+        texts = [self._prepare_metadata_text(dataset) for dataset in datasets]
+        embeddings = self.encode_texts(texts)
+        indices, scores = top_k_neighbours(embeddings, n_results, block_size)
 
+        for dataset, neighbours, neighbour_scores in zip(datasets, indices, scores):
             # Update similarity scores in the dataset
             dataset.similarity_scores = {
-                dataset_id: score for dataset_id, score in similar_datasets
+                str(datasets[j].identifier.id): float(score)
+                for j, score in zip(neighbours, neighbour_scores)
+                if score >= min_similarity
             }
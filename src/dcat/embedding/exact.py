@@ -0,0 +1,104 @@
+"""
+Exact brute-force vector index kept in a contiguous NumPy array.
+"""
+
+from pathlib import Path
+from typing import Dict, Tuple
+
+import numpy as np
+
+from .index import VectorIndex, VectorIndexError
+from .similarity import exact_search
+
+
+class NumpyIndex(VectorIndex):
+    """Exact nearest-neighbour index with no dependencies beyond NumPy.
+
+    Vectors live in one contiguous array (row = label) with a parallel array
+    of squared norms; deleted rows get an infinite norm so they never rank.
+    Search scores ``block_size`` rows per matrix-vector product. The array is
+    saved as ``vectors.npy`` and memory-mapped on load, so opening a large
+    index is instant and pages are read on demand.
+    """
+
+    backend = "numpy"
+
+    def __init__(self, dim: int, dtype: str = "float32", block_size: int = 65_536):
+        """Initialize the exact index.
+
+        Args:
+            dim: Dimensionality of the stored vectors
+            dtype: Storage precision, ``float32`` or ``float16``
+            block_size: Number of rows scored per matrix-vector block
+        """
+        if dtype not in ("float32", "float16"):
+            raise VectorIndexError(f"Unsupported dtype: {dtype}")
+
+        super().__init__(dim)
+        self.dtype = dtype
+        self.block_size = block_size
+        self._vectors = np.empty((0, dim), dtype=dtype)
+        self._norms = np.empty(0, dtype=np.float32)
+        self._size = 0
+
+    def _params(self) -> Dict:
+        return {"dtype": self.dtype, "block_size": self.block_size}
+
+    def reconstruct(self, doc_id: str) -> np.ndarray:
+        """Get the stored vector of a document.
+
+        Args:
+            doc_id: Document id
+
+        Returns:
+            Stored vector as float32
+        """
+        if doc_id not in self._labels:
+            raise VectorIndexError(f"Unknown document id: {doc_id}")
+        return np.asarray(self._vectors[self._labels[doc_id]], dtype=np.float32)
+
+    def _ensure_capacity(self, size: int) -> None:
+        """Grow (or materialize a memory-mapped) array to hold ``size`` rows."""
+        writable = not isinstance(self._vectors, np.memmap)
+        if size <= len(self._vectors) and writable:
+            return
+        capacity = max(size, 2 * len(self._vectors), 1024)
+        vectors = np.zeros((capacity, self.dim), dtype=self.dtype)
+        vectors[: self._size] = self._vectors[: self._size]
+        norms = np.full(capacity, np.inf, dtype=np.float32)
+        norms[: self._size] = self._norms[: self._size]
+        self._vectors, self._norms = vectors, norms
+
+    def _add_vectors(self, labels: np.ndarray, vectors: np.ndarray) -> None:
+        self._ensure_capacity(int(labels.max()) + 1)
+        self._vectors[labels] = vectors
+        stored = self._vectors[labels].astype(np.float32)
+        self._norms[labels] = np.einsum("ij,ij->i", stored, stored)
+        self._size = max(self._size, int(labels.max()) + 1)
+
+    def _remove_vectors(self, labels: np.ndarray) -> None:
+        self._ensure_capacity(self._size)
+        self._norms[labels] = np.inf
+
+    def _search_vectors(
+        self, queries: np.ndarray, k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        labels, distances = exact_search(
+            self._vectors[: self._size],
+            queries,
+            k,
+            block_size=self.block_size,
+            norms=self._norms[: self._size],
+        )
+        # Deleted rows have infinite distance
+        labels[~np.isfinite(distances)] = -1
+        return labels, distances
+
+    def _save_vectors(self, path: Path) -> None:
+        np.save(path / "vectors.npy", np.asarray(self._vectors[: self._size]))
+        np.save(path / "norms.npy", np.asarray(self._norms[: self._size]))
+
+    def _load_vectors(self, path: Path) -> None:
+        self._vectors = np.load(path / "vectors.npy", mmap_mode="r")
+        self._norms = np.load(path / "norms.npy")
+        self._size = len(self._vectors)
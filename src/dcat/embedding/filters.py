@@ -0,0 +1,127 @@
+"""
+Translation of dataset search filters into ChromaDB ``where`` predicates.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union
+
+from ..metadata.base import DCATDataset
+
+# Filter keys accepted in singular and plural form
+_FACETS = {"theme": "theme", "themes": "theme", "format": "format", "formats": "format"}
+
+# Plain metadata fields matched for equality, or membership given a list
+_FIELDS = ("publisher", "source_id")
+
+# Date filter key -> (metadata field, comparison operator)
+_DATE_FILTERS = {
+    "issued_after": ("issued_ts", "$gte"),
+    "issued_before": ("issued_ts", "$lte"),
+    "modified_after": ("modified_ts", "$gte"),
+    "modified_before": ("modified_ts", "$lte"),
+}
+
+
+def facet_key(facet: str, value: str) -> str:
+    """Metadata key flagging that a dataset has a facet value.
+
+    ChromaDB metadata values must be scalars, so multi-valued facets such as
+    themes and formats are stored as one boolean flag per value.
+
+    Args:
+        facet: Facet name (``theme`` or ``format``)
+        value: Facet value
+
+    Returns:
+        Metadata key, e.g. ``theme:environment``
+    """
+    return f"{facet}:{value.strip().lower()}"
+
+
+def _timestamp(value: Union[str, datetime]) -> float:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.timestamp()
+
+
+def filter_metadata(dataset: DCATDataset) -> Dict[str, Union[str, float, bool]]:
+    """Build the filterable metadata stored with a dataset.
+
+    Args:
+        dataset: DCAT dataset
+
+    Returns:
+        Metadata with facet flags, publisher name and issued/modified
+        timestamps
+    """
+    metadata: Dict[str, Union[str, float, bool]] = {}
+
+    for theme in dataset.themes:
+        metadata[facet_key("theme", theme.value)] = True
+    for distribution in dataset.distributions:
+        if distribution.format:
+            metadata[facet_key("format", distribution.format)] = True
+
+    if dataset.publisher and dataset.publisher.name:
+        name = dataset.publisher.name.get("en") or next(
+            iter(dataset.publisher.name.values())
+        )
+        metadata["publisher"] = name.value
+
+    if dataset.issued:
+        metadata["issued_ts"] = dataset.issued.timestamp()
+    if dataset.modified:
+        metadata["modified_ts"] = dataset.modified.timestamp()
+
+    return metadata
+
+
+def build_where(filters: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Translate search filters into a ChromaDB ``where`` predicate.
+
+    Supported filters are ``theme``/``themes`` and ``format``/``formats``
+    (a value or a list of alternatives), ``publisher`` and ``source_id`` (a
+    value or a list of values) and ``issued_after``, ``issued_before``,
+    ``modified_after`` and ``modified_before`` (ISO dates or datetimes).
+
+    Args:
+        filters: Search filters
+
+    Returns:
+        ``where`` predicate, or None when there is nothing to filter on
+
+    Raises:
+        ValueError: If a filter key is not supported, as a predicate on a
+            field no dataset has would silently match nothing
+    """
+    if not filters:
+        return None
+
+    conditions: List[Dict[str, Any]] = []
+    for key, value in filters.items():
+        if value is None:
+            continue
+
+        if key in _FACETS:
+            values = value if isinstance(value, list) else [value]
+            if not values:
+                continue
+            flags = [{facet_key(_FACETS[key], v): True} for v in values]
+            conditions.append(flags[0] if len(flags) == 1 else {"$or": flags})
+        elif key in _DATE_FILTERS:
+            field_name, operator = _DATE_FILTERS[key]
+            conditions.append({field_name: {operator: _timestamp(value)}})
+        elif key in _FIELDS:
+            if isinstance(value, list):
+                conditions.append({key: {"$in": value}})
+            else:
+                conditions.append({key: value})
+        else:
+            supported = sorted([*_FACETS, *_FIELDS, *_DATE_FILTERS])
+            raise ValueError(
+                f"Unsupported filter '{key}'; use one of {', '.join(supported)}"
+            )
+
+    if not conditions:
+        return None
+    return conditions[0] if len(conditions) == 1 else {"$and": conditions}
@@ -0,0 +1,106 @@
+"""
+HNSW approximate nearest-neighbour index backed by hnswlib.
+"""
+
+import threading
+from pathlib import Path
+from typing import Dict, Tuple
+
+import numpy as np
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+from .index import VectorIndex
+
+
+class HNSWIndex(VectorIndex):
+    """In-process HNSW graph index with incremental inserts."""
+
+    backend = "hnsw"
+
+    def __init__(
+        self,
+        dim: int,
+        M: int = 16,
+        ef_construction: int = 200,
+        ef: int = 64,
+        max_elements: int = 10_000,
+    ):
+        """Initialize the HNSW index.
+
+        Args:
+            dim: Dimensionality of the stored vectors
+            M: Number of graph links per node (memory vs. recall)
+            ef_construction: Candidate list size while inserting (build time
+                vs. graph quality)
+            ef: Candidate list size while searching (latency vs. recall)
+            max_elements: Initial capacity; the index grows automatically
+        """
+        if hnswlib is None:
+            raise ImportError(
+                "HNSWIndex requires the hnswlib package: pip install hnswlib"
+            )
+
+        super().__init__(dim)
+        self.M = M
+        self.ef_construction = ef_construction
+        self.ef = ef
+        # Guards temporary ef changes, which are shared by concurrent queries
+        self._ef_lock = threading.Lock()
+        self._index = hnswlib.Index(space="l2", dim=dim)
+        self._index.init_index(
+            max_elements=max(max_elements, 1), ef_construction=ef_construction, M=M
+        )
+        self._index.set_ef(ef)
+
+    def set_ef(self, ef: int) -> None:
+        """Change the search-time candidate list size.
+
+        Args:
+            ef: New candidate list size
+        """
+        with self._ef_lock:
+            self.ef = ef
+            self._index.set_ef(ef)
+
+    def _params(self) -> Dict:
+        return {"M": self.M, "ef_construction": self.ef_construction, "ef": self.ef}
+
+    def _add_vectors(self, labels: np.ndarray, vectors: np.ndarray) -> None:
+        needed = int(labels.max()) + 1
+        capacity = self._index.get_max_elements()
+        if needed > capacity:
+            self._index.resize_index(max(needed, capacity * 2))
+        self._index.add_items(vectors, labels)
+
+    def _remove_vectors(self, labels: np.ndarray) -> None:
+        for label in labels:
+            self._index.mark_deleted(int(label))
+
+    def _search_vectors(
+        self, queries: np.ndarray, k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        if k <= self.ef:
+            return self._index.knn_query(queries, k=k)
+        # ef must be at least k for hnswlib to return k results. Raising it
+        # only ever helps concurrent queries, and the lock keeps another
+        # large-k query from restoring it while this one runs.
+        with self._ef_lock:
+            self._index.set_ef(k)
+            try:
+                return self._index.knn_query(queries, k=k)
+            finally:
+                self._index.set_ef(self.ef)
+
+    def _save_vectors(self, path: Path) -> None:
+        self._index.save_index(str(path / "hnsw.bin"))
+
+    def _load_vectors(self, path: Path) -> None:
+        self._index = hnswlib.Index(space="l2", dim=self.dim)
+        self._index.load_index(
+            str(path / "hnsw.bin"), max_elements=max(len(self._ids), 1)
+        )
+        self._index.set_ef(self.ef)
@@ -0,0 +1,371 @@
+"""
+In-process vector index backends for the embedding engine.
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .similarity import exact_search
+
+
+class VectorIndexError(Exception):
+    """Raised when a vector index is used inconsistently."""
+
+    pass
+
+
+class VectorIndex:
+    """Base class for in-process vector indexes.
+
+    The base class keeps the mapping between string document ids and the
+    integer labels used by the backends, stores per-document metadata and
+    handles persistence of that bookkeeping. Backends implement the
+    ``_add_vectors``, ``_remove_vectors``, ``_search_vectors``,
+    ``_save_vectors`` and ``_load_vectors`` hooks. Distances are squared L2,
+    matching the default ChromaDB space.
+    """
+
+    backend = "base"
+
+    def __init__(self, dim: int):
+        """Initialize the index.
+
+        Args:
+            dim: Dimensionality of the stored vectors
+        """
+        self.dim = dim
+        self._ids: List[Optional[str]] = []
+        self._labels: Dict[str, int] = {}
+        self._metadatas: Dict[str, Dict] = {}
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._labels
+
+    def add(
+        self,
+        ids: Sequence[str],
+        vectors: np.ndarray,
+        metadatas: Optional[Sequence[Dict]] = None,
+    ) -> None:
+        """Insert vectors, replacing those of ids already in the index.
+
+        Args:
+            ids: Document ids
+            vectors: Array of shape (len(ids), dim)
+            metadatas: Optional metadata dictionaries aligned with ``ids``
+        """
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        if vectors.shape != (len(ids), self.dim):
+            raise VectorIndexError(
+                f"Expected vectors of shape ({len(ids)}, {self.dim}), "
+                f"got {vectors.shape}"
+            )
+
+        labels = []
+        for doc_id in ids:
+            label = self._labels.get(doc_id)
+            if label is None:
+                label = len(self._ids)
+                self._ids.append(doc_id)
+                self._labels[doc_id] = label
+            labels.append(label)
+
+        self._add_vectors(np.asarray(labels, dtype=np.int64), vectors)
+
+        if metadatas is not None:
+            for doc_id, metadata in zip(ids, metadatas):
+                self._metadatas[doc_id] = metadata
+
+    def remove(self, ids: Sequence[str]) -> None:
+        """Remove documents from the index.
+
+        Args:
+            ids: Document ids to remove; unknown ids are ignored
+        """
+        labels = []
+        for doc_id in ids:
+            label = self._labels.pop(doc_id, None)
+            if label is not None:
+                self._ids[label] = None
+                self._metadatas.pop(doc_id, None)
+                labels.append(label)
+
+        if labels:
+            self._remove_vectors(np.asarray(labels, dtype=np.int64))
+
+    def get_metadata(self, doc_id: str) -> Dict:
+        """Get the metadata stored for a document.
+
+        Args:
+            doc_id: Document id
+
+        Returns:
+            Metadata dictionary (empty if none was stored)
+        """
+        return self._metadatas.get(doc_id, {})
+
+    def search(self, query: np.ndarray, k: int) -> List[Tuple[str, float, Dict]]:
+        """Find the nearest documents to a query vector.
+
+        Args:
+            query: Query vector of shape (dim,)
+            k: Number of results to return
+
+        Returns:
+            List of (doc_id, squared L2 distance, metadata) tuples
+        """
+        return self.search_many(np.atleast_2d(query), k)[0]
+
+    def search_many(
+        self, queries: np.ndarray, k: int
+    ) -> List[List[Tuple[str, float, Dict]]]:
+        """Find the nearest documents for several query vectors at once.
+
+        Args:
+            queries: Array of shape (q, dim)
+            k: Number of results per query
+
+        Returns:
+            One list of (doc_id, squared L2 distance, metadata) tuples per query
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        k = min(k, len(self))
+        if k <= 0:
+            return [[] for _ in range(queries.shape[0])]
+
+        labels, distances = self._search_vectors(queries, k)
+
+        results = []
+        for row_labels, row_distances in zip(labels, distances):
+            row = []
+            for label, distance in zip(row_labels, row_distances):
+                doc_id = self._ids[label] if 0 <= label < len(self._ids) else None
+                if doc_id is None:
+                    continue
+                row.append((doc_id, float(distance), self._metadatas.get(doc_id, {})))
+            results.append(row)
+
+        return results
+
+    def save(self, directory: str) -> None:
+        """Persist the index to a directory.
+
+        Args:
+            directory: Target directory, created if missing
+        """
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+
+        with open(path / "index_meta.json", "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "backend": self.backend,
+                    "dim": self.dim,
+                    "params": self._params(),
+                    "ids": self._ids,
+                    "metadatas": self._metadatas,
+                },
+                f,
+                ensure_ascii=False,
+            )
+
+        self._save_vectors(path)
+
+    @classmethod
+    def load(cls, directory: str) -> "VectorIndex":
+        """Load an index previously written with ``save``.
+
+        Args:
+            directory: Directory holding the index files
+
+        Returns:
+            Loaded index
+        """
+        path = Path(directory)
+        with open(path / "index_meta.json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+
+        if meta["backend"] != cls.backend:
+            raise VectorIndexError(
+                f"Index in {directory} uses backend '{meta['backend']}', "
+                f"not '{cls.backend}'"
+            )
+
+        index = cls(dim=meta["dim"], **meta["params"])
+        index._ids = meta["ids"]
+        index._labels = {
+            doc_id: label for label, doc_id in enumerate(index._ids) if doc_id
+        }
+        index._metadatas = meta["metadatas"]
+        index._load_vectors(path)
+        return index
+
+    def _params(self) -> Dict:
+        """Constructor parameters needed to recreate the index."""
+        return {}
+
+    @classmethod
+    def directory_params(cls, directory: str) -> Dict:
+        """Constructor parameters placing the index's own files in a directory.
+
+        Args:
+            directory: Directory the index is saved to
+
+        Returns:
+            Parameters for backends keeping files besides ``save`` output
+        """
+        return {}
+
+    def _add_vectors(self, labels: np.ndarray, vectors: np.ndarray) -> None:
+        raise NotImplementedError
+
+    def _remove_vectors(self, labels: np.ndarray) -> None:
+        raise NotImplementedError
+
+    def _search_vectors(
+        self, queries: np.ndarray, k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        raise NotImplementedError
+
+    def _save_vectors(self, path: Path) -> None:
+        raise NotImplementedError
+
+    def _load_vectors(self, path: Path) -> None:
+        raise NotImplementedError
+
+
+def recall_report(
+    index: VectorIndex,
+    ids: Sequence[str],
+    vectors: np.ndarray,
+    queries: np.ndarray,
+    k: int = 10,
+) -> Dict[str, float]:
+    """Compare an index against exact search over the same vectors.
+
+    Args:
+        index: Index under test, holding ``ids``/``vectors``
+        ids: Document ids aligned with ``vectors``
+        vectors: Ground-truth vectors of shape (n, dim)
+        queries: Query vectors of shape (q, dim)
+        k: Number of neighbours compared per query
+
+    Returns:
+        Dictionary with recall@k and per-query latency percentiles (ms) for
+        the index and for exact search
+    """
+    queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+
+    start = time.perf_counter()
+    exact_indices, _ = exact_search(vectors, queries, k)
+    exact_ms = (time.perf_counter() - start) * 1000 / max(len(queries), 1)
+
+    latencies = []
+    found = 0
+    for query, expected in zip(queries, exact_indices):
+        start = time.perf_counter()
+        results = index.search(query, k)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        expected_ids = {ids[i] for i in expected}
+        found += len(expected_ids & {doc_id for doc_id, _, _ in results})
+
+    expected_total = exact_indices.size
+    return {
+        "k": k,
+        "queries": len(queries),
+        "recall": found / expected_total if expected_total else 0.0,
+        "p50_ms": float(np.percentile(latencies, 50)) if latencies else 0.0,
+        "p99_ms": float(np.percentile(latencies, 99)) if latencies else 0.0,
+        "exact_ms_per_query": exact_ms,
+    }
+
+
+def index_collection(
+    collection,
+    index: VectorIndex,
+    batch_size: int = 10_000,
+    train_sample_size: int = 50_000,
+    include_documents: bool = False,
+) -> int:
+    """Load every vector of a ChromaDB collection into an index.
+
+    Indexes that need training (``is_trained`` is False) are first trained
+    on the leading ``train_sample_size`` vectors of the collection. They are
+    left empty and untrained while the collection holds fewer than their
+    ``min_train_size`` vectors.
+
+    Args:
+        collection: ChromaDB collection to read from
+        index: Index to fill
+        batch_size: Number of records read per page
+        train_sample_size: Number of vectors used for training
+        include_documents: Also store each document text in the metadata
+            under the ``document`` key
+
+    Returns:
+        Number of vectors indexed
+    """
+    if not getattr(index, "is_trained", True):
+        sample = collection.get(include=["embeddings"], limit=train_sample_size)
+        if len(sample["ids"]) < max(getattr(index, "min_train_size", 0), 1):
+            return 0
+        index.train(np.asarray(sample["embeddings"], dtype=np.float32))
+
+    include = ["embeddings", "metadatas"]
+    if include_documents:
+        include.append("documents")
+
+    indexed = 0
+    while True:
+        page = collection.get(include=include, limit=batch_size, offset=indexed)
+        if not page["ids"]:
+            break
+
+        metadatas = [metadata or {} for metadata in page["metadatas"]]
+        if include_documents:
+            metadatas = [
+                dict(metadata, document=document)
+                for metadata, document in zip(metadatas, page["documents"])
+            ]
+        index.add(page["ids"], page["embeddings"], metadatas)
+        indexed += len(page["ids"])
+
+    return indexed
+
+
+def index_written(
+    collection,
+    index: VectorIndex,
+    ids: Sequence[str],
+    vectors: np.ndarray,
+    metadatas: Optional[Sequence[Dict]] = None,
+    include_documents: bool = False,
+) -> None:
+    """Mirror vectors just written to a ChromaDB collection into its index.
+
+    An index that still needs training is not given the vectors: it is
+    trained on, and filled from, the whole collection (which already holds
+    them) once that is large enough; see ``index_collection``. Until then
+    it stays empty and searches must go to ChromaDB.
+
+    Args:
+        collection: ChromaDB collection the vectors were written to
+        index: Index mirroring the collection
+        ids: Document ids
+        vectors: Vectors aligned with ``ids``
+        metadatas: Optional metadata dictionaries aligned with ``ids``
+        include_documents: Whether the index stores document texts, see
+            ``index_collection``
+    """
+    if getattr(index, "is_trained", True):
+        index.add(ids, vectors, metadatas)
+    elif collection.count() >= getattr(index, "min_train_size", 0):
+        index_collection(collection, index, include_documents=include_documents)
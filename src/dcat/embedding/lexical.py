@@ -0,0 +1,194 @@
+"""
+BM25 inverted index and rank fusion for hybrid lexical/dense retrieval.
+"""
+
+import heapq
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Unicode word characters, so codes (HR041) and diacritics (Zagreb, Čakovec)
+# survive as single tokens
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of tokens
+    """
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class BM25Index:
+    """In-memory Okapi BM25 index over document texts.
+
+    A forward index (document -> term frequencies) is the persisted source of
+    truth; the inverted postings are rebuilt from it on load.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """Initialize an empty index.
+
+        Args:
+            k1: Term frequency saturation
+            b: Document length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self._documents: Dict[str, Dict[str, int]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+        # Version of the indexed documents, set by the owner and saved along
+        self.version: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._documents
+
+    def add(self, ids: Sequence[str], texts: Sequence[str]) -> None:
+        """Index documents, replacing those already in the index.
+
+        Args:
+            ids: Document ids
+            texts: Document texts aligned with ``ids``
+        """
+        with self._lock:
+            for doc_id, text in zip(ids, texts):
+                self._remove(doc_id)
+                self._insert(doc_id, dict(Counter(tokenize(text))))
+
+    def remove(self, ids: Sequence[str]) -> None:
+        """Remove documents from the index.
+
+        Args:
+            ids: Document ids; unknown ids are ignored
+        """
+        with self._lock:
+            for doc_id in ids:
+                self._remove(doc_id)
+
+    def _insert(self, doc_id: str, frequencies: Dict[str, int]) -> None:
+        self._documents[doc_id] = frequencies
+        length = sum(frequencies.values())
+        self._lengths[doc_id] = length
+        self._total_length += length
+        for term, frequency in frequencies.items():
+            self._postings.setdefault(term, {})[doc_id] = frequency
+
+    def _remove(self, doc_id: str) -> None:
+        frequencies = self._documents.pop(doc_id, None)
+        if frequencies is None:
+            return
+        self._total_length -= self._lengths.pop(doc_id)
+        for term in frequencies:
+            postings = self._postings[term]
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[str, float]]:
+        """Rank documents for a query by BM25 score.
+
+        Args:
+            query: Query text
+            k: Number of results to return
+
+        Returns:
+            List of (doc_id, score) tuples, best first
+        """
+        with self._lock:
+            n_documents = len(self._documents)
+            if not n_documents:
+                return []
+            average_length = self._total_length / n_documents
+
+            scores: Dict[str, float] = {}
+            for term in set(tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                df = len(postings)
+                idf = math.log(1 + (n_documents - df + 0.5) / (df + 0.5))
+                for doc_id, tf in postings.items():
+                    norm = self.k1 * (
+                        1 - self.b + self.b * self._lengths[doc_id] / average_length
+                    )
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (
+                        self.k1 + 1
+                    ) / (tf + norm)
+
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+    def save(self, path: str) -> None:
+        """Persist the index as JSON, replacing the file atomically.
+
+        Args:
+            path: Target file; parent directories are created
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with self._lock:
+            data = {
+                "k1": self.k1,
+                "b": self.b,
+                "version": self.version,
+                "documents": self._documents,
+            }
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        """Load an index written with ``save``.
+
+        Args:
+            path: File written by ``save``
+
+        Returns:
+            Loaded index
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        index = cls(k1=data["k1"], b=data["b"])
+        index.version = data.get("version")
+        for doc_id, frequencies in data["documents"].items():
+            index._insert(doc_id, frequencies)
+        return index
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[str]], k: int = 60
+) -> List[Tuple[str, float]]:
+    """Fuse ranked id lists with reciprocal rank fusion.
+
+    Each id scores ``sum(1 / (k + rank))`` over the lists it appears in
+    (ranks start at 1), so ids ranked well by several retrievers win.
+
+    Args:
+        rankings: Ranked lists of ids, best first
+        k: Damping constant; 60 is the value from the original RRF paper
+
+    Returns:
+        List of (id, fused score) tuples, best first
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
@@ -0,0 +1,127 @@
+"""
+Lightweight latency metrics for retrieval and encoding paths.
+"""
+
+import bisect
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, Sequence
+
+import numpy as np
+
+
+class LatencyMetrics:
+    """Per-operation latency samples over a sliding window."""
+
+    def __init__(self, window: int = 1000):
+        """Initialize the metrics.
+
+        Args:
+            window: Number of most recent samples kept per operation
+        """
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, milliseconds: float) -> None:
+        """Record one latency sample.
+
+        Args:
+            name: Operation name
+            milliseconds: Measured latency
+        """
+        with self._lock:
+            if name not in self._samples:
+                self._samples[name] = deque(maxlen=self.window)
+                self._counts[name] = 0
+            self._samples[name].append(milliseconds)
+            self._counts[name] += 1
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """Time the enclosed block and record it under ``name``.
+
+        Args:
+            name: Operation name
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Summarize the recorded latencies.
+
+        Returns:
+            Per operation: total count and mean/p50/p95/p99/max over the window
+            (milliseconds)
+        """
+        with self._lock:
+            samples = {name: list(values) for name, values in self._samples.items()}
+            counts = dict(self._counts)
+
+        summary = {}
+        for name, values in samples.items():
+            values = np.asarray(values)
+            summary[name] = {
+                "count": counts[name],
+                "mean_ms": float(values.mean()),
+                "p50_ms": float(np.percentile(values, 50)),
+                "p95_ms": float(np.percentile(values, 95)),
+                "p99_ms": float(np.percentile(values, 99)),
+                "max_ms": float(values.max()),
+            }
+        return summary
+
+
+class Histogram:
+    """Counts of observed values in cumulative ``<= bound`` buckets."""
+
+    def __init__(self, bounds: Sequence[float]):
+        """Initialize the histogram.
+
+        Args:
+            bounds: Increasing bucket upper bounds; larger values are counted
+                in an implicit ``+Inf`` bucket
+        """
+        self.bounds = list(bounds)
+        self._counts = [0] * (len(self.bounds) + 1)
+        self._total = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Count one observation.
+
+        Args:
+            value: Observed value
+        """
+        with self._lock:
+            self._counts[bisect.bisect_left(self.bounds, value)] += 1
+            self._total += value
+
+    def summary(self) -> Dict[str, object]:
+        """Summarize the observations.
+
+        Returns:
+            Dictionary with count, sum, mean and cumulative bucket counts
+            keyed ``le_<bound>`` (plus ``le_inf``)
+        """
+        with self._lock:
+            counts = list(self._counts)
+            total = self._total
+
+        buckets = {}
+        cumulative = 0
+        for bound, count in zip(self.bounds + ["inf"], counts):
+            cumulative += count
+            buckets[f"le_{bound}"] = cumulative
+        return {
+            "count": cumulative,
+            "sum": total,
+            "mean": total / cumulative if cumulative else 0.0,
+            "buckets": buckets,
+        }
@@ -0,0 +1,337 @@
+"""
+Resumable migration of a collection to a new embedding model.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .models import get_model
+from .pool import upsert_records
+
+ALIASES_FILE = "collection_aliases.json"
+
+
+def _write_json_atomic(path: str, data: Dict) -> None:
+    """Write JSON so readers see either the old or the new file, never half."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def resolve_collection(
+    persist_directory: str, name: str
+) -> Tuple[str, Optional[str]]:
+    """Resolve a logical collection name to the collection currently serving it.
+
+    Args:
+        persist_directory: ChromaDB directory
+        name: Logical collection name
+
+    Returns:
+        Tuple of (physical collection name, embedding model name or None when
+        the collection was never migrated)
+    """
+    path = os.path.join(persist_directory, ALIASES_FILE)
+    if not os.path.exists(path):
+        return name, None
+    with open(path, "r", encoding="utf-8") as f:
+        alias = json.load(f).get(name)
+    if not alias:
+        return name, None
+    return alias["collection"], alias["model_name"]
+
+
+def _set_alias(
+    persist_directory: str, name: str, collection: str, model_name: str, version: int
+) -> None:
+    """Point a logical collection name at another collection atomically."""
+    path = os.path.join(persist_directory, ALIASES_FILE)
+    aliases = {}
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            aliases = json.load(f)
+    aliases[name] = {
+        "collection": collection,
+        "model_name": model_name,
+        "version": version,
+        "swapped_at": datetime.now().isoformat(),
+    }
+    _write_json_atomic(path, aliases)
+
+
+class EmbeddingMigration:
+    """Re-embed a collection into a shadow collection, then swap to it.
+
+    The source collection keeps serving queries while documents are copied
+    into ``<name>__v<version>`` with vectors from the target model, in
+    checkpointed batches. An interrupted migration resumes from its last
+    checkpoint. Writes and deletes made to the serving collection meanwhile
+    are mirrored into the shadow until the swap. When every document is
+    copied, a catch-up pass re-copies documents whose shadow copy is missing
+    or differs (e.g. written while no migration was running), and the
+    logical name is re-pointed at the shadow collection in one atomic file
+    replace.
+
+    Writers of the serving collection hold ``write_lock`` from their write
+    until it is mirrored. Copies and the swap take it too, so a copy never
+    overwrites a newer mirrored write and no write lands between the final
+    catch-up and the swap.
+    """
+
+    def __init__(
+        self,
+        client,
+        persist_directory: str,
+        name: str,
+        target_model: str,
+        batch_size: int = 256,
+        on_swap: Optional[Callable[[str, str], None]] = None,
+    ):
+        """Initialize the migration, resuming a checkpoint if one exists.
+
+        Args:
+            client: ChromaDB client
+            persist_directory: ChromaDB directory, holding aliases and
+                checkpoints
+            name: Logical collection name
+            target_model: Name of the sentence transformer model to migrate to
+            batch_size: Number of documents embedded per checkpointed batch
+            on_swap: Called with (collection name, model name) after the swap
+        """
+        self.client = client
+        self.persist_directory = persist_directory
+        self.name = name
+        self.target_model = target_model
+        self.batch_size = batch_size
+        self.on_swap = on_swap
+
+        self.state_path = os.path.join(
+            persist_directory, "migrations", f"{name}.json"
+        )
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+
+        self.state = self._load_state()
+        self.source = client.get_collection(self.state["source"])
+        self.target = client.get_or_create_collection(self.state["target"])
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.write_lock = threading.RLock()
+        self._run_started: Optional[float] = None
+        self._run_processed = 0
+
+    def _load_state(self) -> Dict:
+        """Load the checkpoint of an unfinished migration or start a new one."""
+        if os.path.exists(self.state_path):
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            if (
+                state["status"] != "swapped"
+                and state["target_model"] == self.target_model
+            ):
+                return state
+
+        source, _ = resolve_collection(self.persist_directory, self.name)
+        version = 1
+        match = re.search(r"__v(\d+)$", source)
+        if match:
+            version = int(match.group(1)) + 1
+
+        return {
+            "name": self.name,
+            "source": source,
+            "target": f"{self.name}__v{version}",
+            "version": version,
+            "target_model": self.target_model,
+            "status": "pending",
+            "offset": 0,
+            "processed": 0,
+            "total": None,
+            "started_at": datetime.now().isoformat(),
+            "updated_at": None,
+            "error": None,
+        }
+
+    def _checkpoint(self, **changes) -> None:
+        with self._lock:
+            self.state.update(changes, updated_at=datetime.now().isoformat())
+            _write_json_atomic(self.state_path, self.state)
+
+    def start(self) -> threading.Thread:
+        """Run the migration in a background thread.
+
+        Returns:
+            The migration thread
+        """
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self.run, name=f"migration-{self.name}", daemon=True
+            )
+            self._thread.start()
+        return self._thread
+
+    def stop(self) -> None:
+        """Stop after the current batch; the checkpoint allows resuming later."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def run(self) -> None:
+        """Copy and re-embed all documents, then swap collections."""
+        try:
+            self._run_started = time.perf_counter()
+            self._run_processed = 0
+            self._checkpoint(status="running", error=None)
+
+            ids = sorted(self.source.get(include=[])["ids"])
+            self._checkpoint(total=len(ids))
+
+            offset = self.state["offset"]
+            while offset < len(ids):
+                if self._stop.is_set():
+                    self._checkpoint(status="paused")
+                    return
+                batch = ids[offset : offset + self.batch_size]
+                self._copy(batch)
+                offset += len(batch)
+                self._run_processed += len(batch)
+                self._checkpoint(
+                    offset=offset, processed=self.state["processed"] + len(batch)
+                )
+
+            self._catch_up()
+            self._swap()
+        except Exception as e:
+            self._checkpoint(status="failed", error=str(e))
+            raise
+
+    def _copy(self, ids: List[str]) -> None:
+        """Re-embed source documents with the target model into the shadow."""
+        with self.write_lock:
+            records = self.source.get(ids=ids, include=["documents", "metadatas"])
+            if not records["ids"]:
+                return
+            documents = [document or "" for document in records["documents"]]
+            embeddings = get_model(self.target_model).encode(
+                documents, batch_size=len(documents), show_progress_bar=False
+            )
+            upsert_records(
+                self.target,
+                records["ids"],
+                documents,
+                embeddings,
+                records["metadatas"],
+            )
+
+    def mirror(self, ids: List[str], documents: List[str], metadatas: List[Dict]):
+        """Apply a write made to the serving collection to the shadow as well.
+
+        Call while holding ``write_lock`` since before the write to the
+        serving collection.
+
+        Args:
+            ids: Written document ids
+            documents: Document texts
+            metadatas: Metadata dictionaries
+        """
+        with self.write_lock:
+            if self.state["status"] == "swapped":
+                return
+            embeddings = get_model(self.target_model).encode(
+                documents, show_progress_bar=False
+            )
+            self.target.upsert(
+                ids=ids,
+                documents=documents,
+                embeddings=[embedding.tolist() for embedding in embeddings],
+                metadatas=metadatas,
+            )
+
+    def mirror_delete(self, ids: List[str]) -> None:
+        """Apply a delete made to the serving collection to the shadow as well.
+
+        Args:
+            ids: Deleted document ids
+        """
+        with self.write_lock:
+            if self.state["status"] == "swapped":
+                return
+            self.target.delete(ids=ids)
+
+    def _catch_up(self) -> None:
+        """Re-copy documents whose shadow copy is missing or out of date."""
+        self._checkpoint(status="catching_up")
+        ids = sorted(self.source.get(include=[])["ids"])
+        for offset in range(0, len(ids), self.batch_size):
+            changed = self._changed(ids[offset : offset + self.batch_size])
+            if changed:
+                self._copy(changed)
+
+    def _changed(self, ids: List[str]) -> List[str]:
+        """Ids whose document or metadata differs between source and shadow."""
+        include = ["documents", "metadatas"]
+        source = self.source.get(ids=ids, include=include)
+        target = self.target.get(ids=ids, include=include)
+        copies = {
+            doc_id: (document, metadata)
+            for doc_id, document, metadata in zip(
+                target["ids"], target["documents"], target["metadatas"]
+            )
+        }
+        return [
+            doc_id
+            for doc_id, document, metadata in zip(
+                source["ids"], source["documents"], source["metadatas"]
+            )
+            if copies.get(doc_id) != (document or "", metadata)
+        ]
+
+    def _swap(self) -> None:
+        """Drop deleted documents and point the logical name at the shadow."""
+        with self.write_lock:
+            source_ids = set(self.source.get(include=[])["ids"])
+            target_ids = set(self.target.get(include=[])["ids"])
+            deleted = list(target_ids - source_ids)
+            if deleted:
+                self.target.delete(ids=deleted)
+
+            _set_alias(
+                self.persist_directory,
+                self.name,
+                self.state["target"],
+                self.target_model,
+                self.state["version"],
+            )
+            self._checkpoint(status="swapped")
+            if self.on_swap is not None:
+                self.on_swap(self.state["target"], self.target_model)
+
+    def progress(self) -> Dict:
+        """Report migration progress and throughput.
+
+        Returns:
+            Checkpoint state plus percent done, records per second of the
+            current run and the estimated seconds remaining
+        """
+        with self._lock:
+            progress = dict(self.state)
+
+        total = progress["total"] or 0
+        progress["percent"] = 100.0 * progress["offset"] / total if total else 0.0
+
+        elapsed = time.perf_counter() - self._run_started if self._run_started else 0.0
+        rate = self._run_processed / elapsed if elapsed else 0.0
+        progress["records_per_second"] = rate
+        progress["eta_seconds"] = (
+            (total - progress["offset"]) / rate if rate and total else None
+        )
+        progress["running"] = self._thread is not None and self._thread.is_alive()
+        return progress
@@ -0,0 +1,168 @@
+"""
+Process-wide registry of lazily loaded sentence transformer models.
+"""
+
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from sentence_transformers import SentenceTransformer
+
+logger = logging.getLogger(__name__)
+
+
+class SharedModel:
+    """Handle to a registry model that loads the weights on first use.
+
+    Components hold a ``SharedModel`` in place of a ``SentenceTransformer``;
+    ``encode`` and ``get_sentence_embedding_dimension`` load the model the
+    first time either is called and reuse the same instance afterwards.
+    """
+
+    def __init__(self, registry: "ModelRegistry", model_name: str):
+        """Initialize the handle.
+
+        Args:
+            registry: Registry owning the model instance
+            model_name: Name of the sentence transformer model
+        """
+        self.registry = registry
+        self.model_name = model_name
+
+    @property
+    def model(self) -> SentenceTransformer:
+        """The loaded model, loading it if needed."""
+        return self.registry.load(self.model_name)
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the model weights are already in memory."""
+        return self.registry.is_loaded(self.model_name)
+
+    def encode(self, *args, **kwargs):
+        """Encode texts, as ``SentenceTransformer.encode``."""
+        return self.model.encode(*args, **kwargs)
+
+    def get_sentence_embedding_dimension(self) -> Optional[int]:
+        """Dimensionality of the model's embeddings."""
+        return self.model.get_sentence_embedding_dimension()
+
+
+class ModelRegistry:
+    """Loads each model once per process and shares it between components."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._models: Dict[str, SentenceTransformer] = {}
+        self._handles: Dict[str, SharedModel] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model_name: str) -> SharedModel:
+        """Get the shared handle of a model without loading it.
+
+        Args:
+            model_name: Name of the sentence transformer model
+
+        Returns:
+            Shared handle, the same object for every caller
+        """
+        with self._lock:
+            if model_name not in self._handles:
+                self._handles[model_name] = SharedModel(self, model_name)
+                self._locks[model_name] = threading.Lock()
+            return self._handles[model_name]
+
+    def is_loaded(self, model_name: str) -> bool:
+        """Check whether a model has been loaded.
+
+        Args:
+            model_name: Name of the sentence transformer model
+
+        Returns:
+            True if the model weights are in memory
+        """
+        return model_name in self._models
+
+    def load(self, model_name: str) -> SentenceTransformer:
+        """Load a model, or return the instance loaded earlier.
+
+        Concurrent callers of the same model wait for a single load.
+
+        Args:
+            model_name: Name of the sentence transformer model
+
+        Returns:
+            Loaded model
+        """
+        model = self._models.get(model_name)
+        if model is not None:
+            return model
+
+        self.get(model_name)
+        with self._locks[model_name]:
+            if model_name not in self._models:
+                logger.info(f"Loading embedding model {model_name}")
+                self._models[model_name] = SentenceTransformer(model_name)
+        return self._models[model_name]
+
+    def warmup(
+        self, model_names: Iterable[str], background: bool = True
+    ) -> Optional[threading.Thread]:
+        """Load models ahead of the first encode.
+
+        Args:
+            model_names: Names of the models to load
+            background: Load in a daemon thread instead of blocking
+
+        Returns:
+            The warm-up thread when ``background`` is True, otherwise None
+        """
+        model_names: List[str] = list(model_names)
+
+        def _load_all():
+            for model_name in model_names:
+                try:
+                    self.load(model_name)
+                except Exception as e:
+                    logger.error(f"Failed to warm up model {model_name}: {e}")
+
+        if not background:
+            _load_all()
+            return None
+
+        thread = threading.Thread(
+            target=_load_all, name="embedding-model-warmup", daemon=True
+        )
+        thread.start()
+        return thread
+
+
+_registry = ModelRegistry()
+
+
+def get_model(model_name: str) -> SharedModel:
+    """Get the process-wide shared handle of a model.
+
+    Args:
+        model_name: Name of the sentence transformer model
+
+    Returns:
+        Shared handle; the weights load on first use
+    """
+    return _registry.get(model_name)
+
+
+def warmup_models(
+    model_names: Iterable[str], background: bool = True
+) -> Optional[threading.Thread]:
+    """Load models into the process-wide registry ahead of use.
+
+    Args:
+        model_names: Names of the models to load
+        background: Load in a daemon thread instead of blocking
+
+    Returns:
+        The warm-up thread when ``background`` is True, otherwise None
+    """
+    return _registry.warmup(model_names, background)
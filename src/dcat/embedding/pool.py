@@ -0,0 +1,327 @@
+"""
+Multi-process embedding pool for catalog-scale re-indexing.
+"""
+
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .models import get_model
+
+# (id, text, metadata) of one record to embed
+Record = Tuple[str, str, Dict]
+
+# Receives ids, texts, embeddings and metadatas of one encoded batch
+BatchWriter = Callable[[List[str], List[str], np.ndarray, List[Dict]], None]
+
+
+class EmbeddingPoolError(Exception):
+    """Raised when the embedding pool cannot complete."""
+
+    pass
+
+
+def _encode_worker(
+    model_name: str,
+    threads_per_worker: int,
+    tasks: multiprocessing.Queue,
+    results: multiprocessing.Queue,
+) -> None:
+    """Encode batches from ``tasks`` until a ``None`` sentinel arrives."""
+    try:
+        import torch
+
+        # One intra-op thread per process keeps workers from oversubscribing cores
+        torch.set_num_threads(threads_per_worker)
+    except ImportError:
+        pass
+
+    model = get_model(model_name)
+    while True:
+        batch = tasks.get()
+        if batch is None:
+            results.put(("done", None))
+            return
+
+        ids, texts, metadatas = batch
+        try:
+            embeddings = model.encode(
+                texts,
+                batch_size=len(texts),
+                convert_to_numpy=True,
+                show_progress_bar=False,
+            )
+            results.put(
+                (
+                    "batch",
+                    (ids, texts, np.asarray(embeddings, dtype=np.float32), metadatas),
+                )
+            )
+        except Exception as e:
+            results.put(("error", (len(ids), f"{type(e).__name__}: {e}")))
+
+
+def _batches(records: Iterable[Record], batch_size: int) -> Iterator[Tuple]:
+    """Group records into (ids, texts, metadatas) batches."""
+    ids, texts, metadatas = [], [], []
+    for doc_id, text, metadata in records:
+        ids.append(doc_id)
+        texts.append(text)
+        metadatas.append(metadata)
+        if len(ids) == batch_size:
+            yield ids, texts, metadatas
+            ids, texts, metadatas = [], [], []
+    if ids:
+        yield ids, texts, metadatas
+
+
+def parallel_encode(
+    records: Iterable[Record],
+    model_name: str,
+    write: BatchWriter,
+    n_workers: Optional[int] = None,
+    batch_size: int = 256,
+    queue_size: Optional[int] = None,
+    threads_per_worker: int = 1,
+    poll_interval: float = 1.0,
+    result_timeout: Optional[float] = None,
+) -> Dict[str, float]:
+    """Encode records in worker processes and write them from this process.
+
+    A feeder thread groups ``records`` into batches and puts them on a
+    bounded task queue, so reading the source never runs far ahead of the
+    workers. Each worker process loads the model once and encodes batches;
+    encoded batches come back on a bounded result queue and are passed to
+    ``write`` in the calling process, which stays the only writer of the
+    vector store. The result queue is polled so that a worker exiting
+    abnormally (e.g. killed for running out of memory) raises instead of
+    leaving the caller waiting for its batches forever.
+
+    Args:
+        records: (id, text, metadata) records, consumed lazily
+        model_name: Name of the sentence transformer model
+        write: Called with (ids, texts, embeddings, metadatas) per batch
+        n_workers: Number of encoder processes; defaults to the CPU count
+        batch_size: Number of records per batch
+        queue_size: Capacity of the task and result queues in batches;
+            defaults to twice the number of workers
+        threads_per_worker: Torch threads per worker process
+        poll_interval: Seconds between checks that the workers are alive
+        result_timeout: Seconds to wait for any worker result before giving
+            up; no limit by default, as loading the model may take long
+
+    Returns:
+        Statistics (processed, failed, batches, workers, elapsed seconds and
+        records per second)
+
+    Raises:
+        EmbeddingPoolError: If reading records fails, a worker exits without
+            finishing or no result arrives within ``result_timeout``
+    """
+    n_workers = n_workers or os.cpu_count() or 1
+    queue_size = queue_size or 2 * n_workers
+
+    # Spawned workers do not inherit torch or ChromaDB state from the parent
+    context = multiprocessing.get_context("spawn")
+    tasks = context.Queue(maxsize=queue_size)
+    results = context.Queue(maxsize=queue_size)
+
+    workers = [
+        context.Process(
+            target=_encode_worker,
+            args=(model_name, threads_per_worker, tasks, results),
+            name=f"embedding-worker-{i}",
+            daemon=True,
+        )
+        for i in range(n_workers)
+    ]
+    for worker in workers:
+        worker.start()
+
+    feed_errors: List[Exception] = []
+    stopped = threading.Event()
+
+    def _put(item) -> bool:
+        """Put a task unless the pool stopped; False once it has."""
+        while not stopped.is_set():
+            try:
+                tasks.put(item, timeout=poll_interval)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _feed():
+        try:
+            for batch in _batches(records, batch_size):
+                if not _put(batch):
+                    return
+        except Exception as e:
+            feed_errors.append(e)
+        finally:
+            for _ in workers:
+                _put(None)
+
+    feeder = threading.Thread(target=_feed, name="embedding-feeder", daemon=True)
+
+    start = time.perf_counter()
+    stats = {"processed": 0, "failed": 0, "batches": 0, "workers": n_workers}
+    errors: List[str] = []
+    feeder.start()
+    try:
+        finished = 0
+        last_result = time.monotonic()
+        while finished < n_workers:
+            try:
+                kind, payload = results.get(timeout=poll_interval)
+            except queue.Empty:
+                _check_workers(workers, last_result, result_timeout)
+                continue
+            last_result = time.monotonic()
+            if kind == "done":
+                finished += 1
+            elif kind == "error":
+                stats["failed"] += payload[0]
+                errors.append(payload[1])
+            else:
+                ids, texts, embeddings, metadatas = payload
+                write(ids, texts, embeddings, metadatas)
+                stats["processed"] += len(ids)
+                stats["batches"] += 1
+    finally:
+        stopped.set()
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+            worker.join()
+
+    feeder.join()
+    if feed_errors:
+        raise EmbeddingPoolError(f"Reading records failed: {feed_errors[0]}")
+    if errors:
+        print(f"{stats['failed']} records failed to encode, e.g. {errors[0]}")
+
+    elapsed = time.perf_counter() - start
+    stats["elapsed_seconds"] = elapsed
+    stats["records_per_second"] = stats["processed"] / elapsed if elapsed else 0.0
+    return stats
+
+
+def _check_workers(
+    workers: List[multiprocessing.Process],
+    last_result: float,
+    result_timeout: Optional[float],
+) -> None:
+    """Raise if a worker died or no result arrived for too long.
+
+    Workers exit with code 0 only after putting their ``done`` message, so
+    a non-zero exit code means batches were lost.
+    """
+    for worker in workers:
+        if not worker.is_alive() and worker.exitcode != 0:
+            raise EmbeddingPoolError(
+                f"{worker.name} exited with code {worker.exitcode}"
+            )
+    if result_timeout is not None and time.monotonic() - last_result > result_timeout:
+        raise EmbeddingPoolError(f"No embedding results for {result_timeout:g} seconds")
+
+
+def iter_collection_records(collection, page_size: int = 10_000) -> Iterator[Record]:
+    """Stream the documents of a ChromaDB collection.
+
+    Ids are listed first and documents are then fetched by id, so
+    re-writing records while iterating does not shift the pages.
+
+    Args:
+        collection: ChromaDB collection
+        page_size: Number of records fetched per request
+
+    Yields:
+        (id, document, metadata) records
+    """
+    ids = collection.get(include=[])["ids"]
+    for offset in range(0, len(ids), page_size):
+        page = collection.get(
+            ids=ids[offset : offset + page_size], include=["documents", "metadatas"]
+        )
+        for doc_id, document, metadata in zip(
+            page["ids"], page["documents"], page["metadatas"]
+        ):
+            yield doc_id, document or "", metadata or {}
+
+
+def upsert_records(
+    collection,
+    ids: List[str],
+    documents: List[str],
+    embeddings,
+    metadatas: List[Optional[Dict]],
+) -> None:
+    """Upsert records into a ChromaDB collection, keeping their metadata.
+
+    ChromaDB rejects empty metadata dictionaries, so records without
+    metadata are upserted separately from the others instead of dropping
+    the metadata of the whole batch.
+
+    Args:
+        collection: ChromaDB collection
+        ids: Document ids
+        documents: Documents aligned with ``ids``
+        embeddings: Embeddings aligned with ``ids``
+        metadatas: Metadata dictionaries aligned with ``ids``, possibly empty
+    """
+    vectors = np.asarray(embeddings, dtype=np.float32)
+    for with_metadata in (True, False):
+        rows = [
+            row
+            for row, metadata in enumerate(metadatas)
+            if bool(metadata) == with_metadata
+        ]
+        if not rows:
+            continue
+        collection.upsert(
+            ids=[ids[row] for row in rows],
+            documents=[documents[row] for row in rows],
+            embeddings=vectors[rows].tolist(),
+            metadatas=[metadatas[row] for row in rows] if with_metadata else None,
+        )
+
+
+def reindex_collection(
+    collection,
+    model_name: str,
+    n_workers: Optional[int] = None,
+    batch_size: int = 256,
+    write: Optional[BatchWriter] = None,
+) -> Dict[str, float]:
+    """Re-embed every document of a ChromaDB collection with a worker pool.
+
+    Args:
+        collection: ChromaDB collection, written only by this process
+        model_name: Name of the sentence transformer model
+        n_workers: Number of encoder processes; defaults to the CPU count
+        batch_size: Number of records per batch
+        write: Optional extra writer called after each batch is upserted,
+            e.g. to update caches or in-process indexes
+
+    Returns:
+        Statistics, see ``parallel_encode``
+    """
+
+    def _upsert(ids, texts, embeddings, metadatas):
+        upsert_records(collection, ids, texts, embeddings, metadatas)
+        if write is not None:
+            write(ids, texts, embeddings, metadatas)
+
+    return parallel_encode(
+        iter_collection_records(collection),
+        model_name,
+        _upsert,
+        n_workers=n_workers,
+        batch_size=batch_size,
+    )
@@ -0,0 +1,307 @@
+"""
+IVF-PQ compressed vector index for very large catalogs.
+"""
+
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .index import VectorIndex, VectorIndexError
+from .similarity import exact_search
+
+# Full-precision vectors kept for re-ranking, inside the index directory
+VECTORS_FILE = "vectors.f32"
+
+
+def kmeans(data: np.ndarray, k: int, n_iter: int = 20, seed: int = 0) -> np.ndarray:
+    """Cluster rows of a matrix with Lloyd's k-means.
+
+    Args:
+        data: Array of shape (n, dim)
+        k: Number of centroids (clamped to n)
+        n_iter: Number of assignment/update iterations
+        seed: Random seed for initialization and empty-cluster reseeding
+
+    Returns:
+        Centroid array of shape (k, dim)
+    """
+    rng = np.random.default_rng(seed)
+    data = np.asarray(data, dtype=np.float32)
+    k = min(k, len(data))
+    centroids = data[rng.choice(len(data), size=k, replace=False)].copy()
+
+    for _ in range(n_iter):
+        assignments = exact_search(centroids, data, 1)[0][:, 0]
+        counts = np.bincount(assignments, minlength=k)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, data)
+
+        empty = counts == 0
+        centroids[~empty] = sums[~empty] / counts[~empty, None]
+        if empty.any():
+            centroids[empty] = data[rng.choice(len(data), size=empty.sum())]
+
+    return centroids
+
+
+class IVFPQIndex(VectorIndex):
+    """Inverted-file index with product-quantized residuals.
+
+    Vectors are assigned to one of ``n_lists`` coarse centroids and the
+    residual is compressed to ``n_subvectors`` one-byte codes, so a 384-dim
+    float32 vector (1536 bytes) is held in RAM as ``n_subvectors`` bytes plus
+    an 8-byte label/list entry. When ``vectors_path`` is set, full-precision
+    vectors are appended to that file and the best ``rerank`` approximate
+    candidates are re-scored exactly by reading only their rows.
+    """
+
+    backend = "ivfpq"
+
+    def __init__(
+        self,
+        dim: int,
+        n_lists: int = 1024,
+        n_subvectors: int = 48,
+        n_probe: int = 16,
+        rerank: int = 100,
+        vectors_path: Optional[str] = None,
+    ):
+        """Initialize the IVF-PQ index.
+
+        Args:
+            dim: Dimensionality of the stored vectors
+            n_lists: Number of coarse clusters (inverted lists)
+            n_subvectors: Number of PQ sub-quantizers; must divide ``dim``
+            n_probe: Number of inverted lists scanned per query
+            rerank: Number of approximate candidates re-scored exactly
+            vectors_path: File holding full-precision vectors for re-ranking;
+                re-ranking is disabled when None
+        """
+        if dim % n_subvectors:
+            raise VectorIndexError(
+                f"n_subvectors ({n_subvectors}) must divide dim ({dim})"
+            )
+
+        super().__init__(dim)
+        self.n_lists = n_lists
+        self.n_subvectors = n_subvectors
+        self.n_probe = n_probe
+        self.rerank = rerank
+        self.vectors_path = vectors_path
+        self.coarse_centroids: Optional[np.ndarray] = None
+        self.codebooks: Optional[np.ndarray] = None
+        self._codes = np.empty((0, n_subvectors), dtype=np.uint8)
+        self._assignments = np.empty(0, dtype=np.int32)
+        self._lists: List[np.ndarray] = []
+        self._vectors: Optional[np.memmap] = None
+
+    @property
+    def is_trained(self) -> bool:
+        """Whether coarse centroids and PQ codebooks have been trained."""
+        return self.coarse_centroids is not None
+
+    @property
+    def min_train_size(self) -> int:
+        """Number of vectors needed to train every coarse list and PQ code."""
+        return max(self.n_lists, 256)
+
+    def train(self, sample: np.ndarray, n_iter: int = 20, seed: int = 0) -> None:
+        """Train coarse centroids and PQ codebooks from a sample of vectors.
+
+        Args:
+            sample: Array of shape (n, dim); a few tens of thousands of rows
+                are usually enough
+            n_iter: Number of k-means iterations
+            seed: Random seed
+        """
+        sample = np.asarray(sample, dtype=np.float32)
+        self.coarse_centroids = kmeans(sample, self.n_lists, n_iter, seed)
+        self.n_lists = len(self.coarse_centroids)
+        self._lists = [np.empty(0, dtype=np.int32) for _ in range(self.n_lists)]
+
+        assignments = exact_search(self.coarse_centroids, sample, 1)[0][:, 0]
+        residuals = sample - self.coarse_centroids[assignments]
+        sub_dim = self.dim // self.n_subvectors
+        codebooks = []
+        for j in range(self.n_subvectors):
+            sub = residuals[:, j * sub_dim : (j + 1) * sub_dim]
+            codebook = kmeans(sub, 256, n_iter, seed)
+            # Small samples yield fewer than 256 codes; repeat them to fill
+            codebooks.append(codebook[np.arange(256) % len(codebook)])
+        self.codebooks = np.stack(codebooks)
+
+    def memory_bytes(self) -> int:
+        """Approximate RAM used by compressed codes and inverted lists."""
+        return int(
+            self._codes[: len(self._ids)].nbytes
+            + self._assignments[: len(self._ids)].nbytes
+            + sum(lst.nbytes for lst in self._lists)
+        )
+
+    def _params(self) -> Dict:
+        return {
+            "n_lists": self.n_lists,
+            "n_subvectors": self.n_subvectors,
+            "n_probe": self.n_probe,
+            "rerank": self.rerank,
+        }
+
+    @classmethod
+    def directory_params(cls, directory: str) -> Dict:
+        return {"vectors_path": str(Path(directory) / VECTORS_FILE)}
+
+    def _encode(self, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Assign vectors to lists and PQ-encode their residuals."""
+        assignments = exact_search(self.coarse_centroids, vectors, 1)[0][:, 0]
+        residuals = vectors - self.coarse_centroids[assignments]
+        sub_dim = self.dim // self.n_subvectors
+
+        codes = np.empty((len(vectors), self.n_subvectors), dtype=np.uint8)
+        for j in range(self.n_subvectors):
+            sub = residuals[:, j * sub_dim : (j + 1) * sub_dim]
+            codes[:, j] = exact_search(self.codebooks[j], sub, 1)[0][:, 0]
+        return assignments.astype(np.int32), codes
+
+    def _ensure_capacity(self, size: int) -> None:
+        """Grow the code and assignment arrays to hold ``size`` labels."""
+        if size <= len(self._assignments):
+            return
+        capacity = max(size, 2 * len(self._assignments), 1024)
+        codes = np.zeros((capacity, self.n_subvectors), dtype=np.uint8)
+        codes[: len(self._codes)] = self._codes
+        assignments = np.full(capacity, -1, dtype=np.int32)
+        assignments[: len(self._assignments)] = self._assignments
+        self._codes, self._assignments = codes, assignments
+
+    def _add_vectors(self, labels: np.ndarray, vectors: np.ndarray) -> None:
+        if not self.is_trained:
+            raise VectorIndexError("IVFPQIndex must be trained before adding")
+
+        self._ensure_capacity(int(labels.max()) + 1)
+        self._detach(labels)
+
+        assignments, codes = self._encode(vectors)
+        self._codes[labels] = codes
+        self._assignments[labels] = assignments
+        for list_id in np.unique(assignments):
+            members = labels[assignments == list_id].astype(np.int32)
+            self._lists[list_id] = np.concatenate([self._lists[list_id], members])
+
+        if self.vectors_path:
+            self._write_vectors(labels, vectors)
+
+    def _detach(self, labels: np.ndarray) -> None:
+        """Remove labels from the inverted lists they currently belong to."""
+        known = labels[labels < len(self._assignments)]
+        previous = self._assignments[known]
+        for list_id in np.unique(previous[previous >= 0]):
+            self._lists[list_id] = self._lists[list_id][
+                ~np.isin(self._lists[list_id], known)
+            ]
+        self._assignments[known] = -1
+
+    def _remove_vectors(self, labels: np.ndarray) -> None:
+        self._detach(labels)
+
+    def _write_vectors(self, labels: np.ndarray, vectors: np.ndarray) -> None:
+        """Write full-precision rows to the re-ranking file."""
+        path = Path(self.vectors_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        required = (int(labels.max()) + 1) * self.dim * 4
+        with open(path, "ab") as f:
+            if f.tell() < required:
+                f.truncate(required)
+
+        self._vectors = None
+        rows = np.memmap(path, dtype=np.float32, mode="r+").reshape(-1, self.dim)
+        rows[labels] = vectors
+        rows.flush()
+        del rows
+
+    def _exact_rows(self, labels: np.ndarray) -> np.ndarray:
+        """Lazily read full-precision rows for the given labels."""
+        if self._vectors is None:
+            self._vectors = np.memmap(
+                self.vectors_path, dtype=np.float32, mode="r"
+            ).reshape(-1, self.dim)
+        return np.asarray(self._vectors[labels])
+
+    def _search_vectors(
+        self, queries: np.ndarray, k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        labels = np.full((len(queries), k), -1, dtype=np.int64)
+        distances = np.full((len(queries), k), np.inf, dtype=np.float32)
+        probes = exact_search(self.coarse_centroids, queries, self.n_probe)[0]
+        sub_dim = self.dim // self.n_subvectors
+
+        for row, (query, probe) in enumerate(zip(queries, probes)):
+            candidate_labels = []
+            candidate_distances = []
+            for list_id in probe:
+                members = self._lists[list_id]
+                if not len(members):
+                    continue
+                # Asymmetric distance: per-subvector lookup tables on the residual
+                residual = (query - self.coarse_centroids[list_id]).reshape(
+                    self.n_subvectors, 1, sub_dim
+                )
+                tables = ((self.codebooks - residual) ** 2).sum(axis=2)
+                codes = self._codes[members]
+                candidate_labels.append(members)
+                candidate_distances.append(
+                    tables[np.arange(self.n_subvectors), codes].sum(axis=1)
+                )
+
+            if not candidate_labels:
+                continue
+            candidate_labels = np.concatenate(candidate_labels).astype(np.int64)
+            candidate_distances = np.concatenate(candidate_distances)
+
+            shortlist = min(max(self.rerank, k), len(candidate_labels))
+            top = np.argpartition(candidate_distances, shortlist - 1)[:shortlist]
+            candidate_labels = candidate_labels[top]
+            candidate_distances = candidate_distances[top]
+
+            if self.vectors_path:
+                exact = self._exact_rows(candidate_labels) - query
+                candidate_distances = np.einsum("ij,ij->i", exact, exact)
+
+            order = np.argsort(candidate_distances)[:k]
+            labels[row, : len(order)] = candidate_labels[order]
+            distances[row, : len(order)] = candidate_distances[order]
+
+        return labels, distances
+
+    def _save_vectors(self, path: Path) -> None:
+        size = len(self._ids)
+        np.savez(
+            path / "ivfpq.npz",
+            coarse_centroids=self.coarse_centroids,
+            codebooks=self.codebooks,
+            codes=self._codes[:size],
+            assignments=self._assignments[:size],
+        )
+        if self.vectors_path:
+            target = path / VECTORS_FILE
+            if Path(self.vectors_path).resolve() != target.resolve():
+                shutil.copyfile(self.vectors_path, target)
+
+    def _load_vectors(self, path: Path) -> None:
+        data = np.load(path / "ivfpq.npz")
+        self.coarse_centroids = data["coarse_centroids"]
+        self.codebooks = data["codebooks"]
+        self._codes = data["codes"]
+        self._assignments = data["assignments"]
+        valid = np.flatnonzero(self._assignments >= 0)
+        order = valid[np.argsort(self._assignments[valid], kind="stable")]
+        counts = np.bincount(
+            self._assignments[valid], minlength=len(self.coarse_centroids)
+        )
+        self._lists = [
+            members.astype(np.int32)
+            for members in np.split(order, np.cumsum(counts)[:-1])
+        ]
+        if (path / VECTORS_FILE).exists():
+            self.vectors_path = str(path / VECTORS_FILE)
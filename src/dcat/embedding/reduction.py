@@ -0,0 +1,418 @@
+"""
+Dimensionality reduction of stored embeddings for smaller in-process indexes.
+"""
+
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Type
+
+import numpy as np
+
+from .index import VectorIndex, VectorIndexError
+from .similarity import exact_search
+
+REDUCER_FILE = "reducer.npz"
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length so ``1 - distance`` stays a similarity."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class DimensionReducer:
+    """Base class for projections from model space to a smaller space.
+
+    Squared L2 distances between projected vectors approximate those between
+    the full embeddings, so ``1 - distance`` scores keep their meaning.
+    """
+
+    method = "base"
+
+    def __init__(self, input_dim: int, output_dim: int):
+        """Initialize the reducer.
+
+        Args:
+            input_dim: Dimensionality of the model embeddings
+            output_dim: Dimensionality of the projected vectors
+        """
+        if not 0 < output_dim <= input_dim:
+            raise VectorIndexError(
+                f"Cannot reduce {input_dim} dimensions to {output_dim}"
+            )
+        self.input_dim = input_dim
+        self.output_dim = output_dim
+
+    @property
+    def is_fitted(self) -> bool:
+        """Whether ``transform`` can be used."""
+        return True
+
+    def fit(self, vectors: np.ndarray) -> "DimensionReducer":
+        """Fit the projection on a sample of embeddings.
+
+        Args:
+            vectors: Array of shape (n, input_dim)
+
+        Returns:
+            The reducer itself
+        """
+        return self
+
+    def transform(self, vectors: np.ndarray) -> np.ndarray:
+        """Project embeddings (documents or queries) into the reduced space.
+
+        Args:
+            vectors: Array of shape (n, input_dim) or (input_dim,)
+
+        Returns:
+            Float32 array of shape (n, output_dim)
+        """
+        if not self.is_fitted:
+            raise VectorIndexError(f"{type(self).__name__} has not been fitted")
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        if vectors.shape[1] != self.input_dim:
+            raise VectorIndexError(
+                f"Expected vectors of dimension {self.input_dim}, "
+                f"got {vectors.shape[1]}"
+            )
+        return self._project(vectors).astype(np.float32)
+
+    def save(self, path: str) -> None:
+        """Save the reducer to an ``.npz`` file.
+
+        Args:
+            path: Target file
+        """
+        np.savez(
+            path,
+            method=self.method,
+            input_dim=self.input_dim,
+            output_dim=self.output_dim,
+            **self._arrays(),
+        )
+
+    @staticmethod
+    def load(path: str) -> "DimensionReducer":
+        """Load a reducer written with ``save``.
+
+        Args:
+            path: File written by ``save``
+
+        Returns:
+            Loaded reducer
+        """
+        with np.load(path) as data:
+            method = str(data["method"])
+            if method not in REDUCERS:
+                raise VectorIndexError(f"Unknown reduction method '{method}'")
+            reducer = REDUCERS[method](
+                int(data["input_dim"]), int(data["output_dim"])
+            )
+            reducer._set_arrays(
+                {
+                    key: data[key]
+                    for key in data.files
+                    if key not in ("method", "input_dim", "output_dim")
+                }
+            )
+        return reducer
+
+    def _project(self, vectors: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def _arrays(self) -> Dict[str, np.ndarray]:
+        """Fitted state saved alongside the configuration."""
+        return {}
+
+    def _set_arrays(self, arrays: Dict[str, np.ndarray]) -> None:
+        pass
+
+
+class TruncationReducer(DimensionReducer):
+    """Keep the leading dimensions (Matryoshka-style truncation).
+
+    Needs no fitting; truncated vectors are re-normalized to unit length. It
+    only preserves ranking well for models trained with a Matryoshka
+    objective; for other models prefer ``PCAReducer``.
+    """
+
+    method = "truncate"
+
+    def _project(self, vectors: np.ndarray) -> np.ndarray:
+        return _normalize(vectors[:, : self.output_dim])
+
+
+class PCAReducer(DimensionReducer):
+    """Project onto the principal components of the stored embeddings.
+
+    The projection is an orthogonal rotation of the centered vectors followed
+    by dropping the low-variance axes, so distances shrink only by the
+    variance discarded.
+    """
+
+    method = "pca"
+
+    def __init__(self, input_dim: int, output_dim: int):
+        super().__init__(input_dim, output_dim)
+        self.mean: Optional[np.ndarray] = None
+        self.components: Optional[np.ndarray] = None
+        self.explained_variance_ratio: Optional[np.ndarray] = None
+
+    @property
+    def is_fitted(self) -> bool:
+        return self.components is not None
+
+    def fit(self, vectors: np.ndarray) -> "PCAReducer":
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float64))
+        self.mean = vectors.mean(axis=0)
+        centered = vectors - self.mean
+        # Eigendecomposition of the (input_dim x input_dim) covariance is
+        # cheaper than an SVD of the (n x input_dim) data for large catalogs
+        eigenvalues, eigenvectors = np.linalg.eigh(centered.T @ centered)
+        order = np.argsort(eigenvalues)[::-1][: self.output_dim]
+        self.components = eigenvectors[:, order].T.astype(np.float32)
+        total = eigenvalues.sum()
+        self.explained_variance_ratio = (
+            eigenvalues[order] / total if total > 0 else np.zeros(len(order))
+        )
+        self.mean = self.mean.astype(np.float32)
+        return self
+
+    def _project(self, vectors: np.ndarray) -> np.ndarray:
+        return (vectors - self.mean) @ self.components.T
+
+    def _arrays(self) -> Dict[str, np.ndarray]:
+        if not self.is_fitted:
+            return {}
+        return {
+            "mean": self.mean,
+            "components": self.components,
+            "explained_variance_ratio": self.explained_variance_ratio,
+        }
+
+    def _set_arrays(self, arrays: Dict[str, np.ndarray]) -> None:
+        self.mean = arrays.get("mean")
+        self.components = arrays.get("components")
+        self.explained_variance_ratio = arrays.get("explained_variance_ratio")
+
+
+REDUCERS: Dict[str, Type[DimensionReducer]] = {
+    PCAReducer.method: PCAReducer,
+    TruncationReducer.method: TruncationReducer,
+}
+
+
+def create_reducer(method: str, input_dim: int, output_dim: int) -> DimensionReducer:
+    """Create an unfitted reducer by method name.
+
+    Args:
+        method: One of the keys of ``REDUCERS``
+        input_dim: Dimensionality of the model embeddings
+        output_dim: Dimensionality of the projected vectors
+
+    Returns:
+        New reducer
+    """
+    if method not in REDUCERS:
+        raise VectorIndexError(
+            f"Unknown reduction method '{method}', expected one of {sorted(REDUCERS)}"
+        )
+    return REDUCERS[method](input_dim, output_dim)
+
+
+class ReducedIndex(VectorIndex):
+    """Vector index that stores and searches projected embeddings.
+
+    Wraps another index of dimension ``reducer.output_dim``: added vectors
+    and queries are both projected with the same reducer, so callers keep
+    passing full model embeddings. An unfitted reducer makes the index
+    report ``is_trained = False``, so ``index_collection`` fits it on a
+    sample of the collection before loading vectors. An index created over
+    an empty collection is fitted on its first added batch instead; rebuild
+    it once the catalog is loaded to get a representative projection.
+    """
+
+    def __init__(self, index: VectorIndex, reducer: DimensionReducer):
+        """Initialize the index.
+
+        Args:
+            index: Index holding the projected vectors
+            reducer: Projection from model space to ``index.dim``
+        """
+        if index.dim != reducer.output_dim:
+            raise VectorIndexError(
+                f"Index dimension {index.dim} does not match the reducer "
+                f"output dimension {reducer.output_dim}"
+            )
+        self.index = index
+        self.reducer = reducer
+        self.dim = reducer.input_dim
+
+    @property
+    def backend(self) -> str:
+        return self.index.backend
+
+    @property
+    def is_trained(self) -> bool:
+        return self.reducer.is_fitted and getattr(self.index, "is_trained", True)
+
+    @property
+    def min_train_size(self) -> int:
+        return getattr(self.index, "min_train_size", 0)
+
+    def train(self, vectors: np.ndarray) -> None:
+        """Fit the reducer and train the wrapped index, if it needs training.
+
+        Args:
+            vectors: Sample of model embeddings of shape (n, input_dim)
+        """
+        if not self.reducer.is_fitted:
+            self.reducer.fit(vectors)
+        if not getattr(self.index, "is_trained", True):
+            self.index.train(self.reducer.transform(vectors))
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self.index
+
+    def add(
+        self,
+        ids: Sequence[str],
+        vectors: np.ndarray,
+        metadatas: Optional[Sequence[Dict]] = None,
+    ) -> None:
+        if not self.is_trained:
+            self.train(np.atleast_2d(np.asarray(vectors, dtype=np.float32)))
+        self.index.add(ids, self.reducer.transform(vectors), metadatas)
+
+    def remove(self, ids: Sequence[str]) -> None:
+        self.index.remove(ids)
+
+    def get_metadata(self, doc_id: str) -> Dict:
+        return self.index.get_metadata(doc_id)
+
+    def search_many(
+        self, queries: np.ndarray, k: int
+    ) -> List[List[Tuple[str, float, Dict]]]:
+        return self.index.search_many(self.reducer.transform(queries), k)
+
+    def save(self, directory: str) -> None:
+        """Persist the wrapped index and the fitted reducer.
+
+        Args:
+            directory: Target directory, created if missing
+        """
+        self.index.save(directory)
+        self.reducer.save(str(Path(directory) / REDUCER_FILE))
+
+    @classmethod
+    def load(cls, directory: str) -> "ReducedIndex":
+        """Load an index previously written with ``save``.
+
+        Args:
+            directory: Directory holding the index and reducer files
+
+        Returns:
+            Loaded index
+        """
+        from .backends import load_vector_index
+
+        index = load_vector_index(directory)
+        if not isinstance(index, cls):
+            raise VectorIndexError(f"Index in {directory} has no reducer")
+        return index
+
+
+def dimension_report(
+    vectors: np.ndarray,
+    queries: np.ndarray,
+    dims: Sequence[int] = (32, 64, 128, 192, 256),
+    k: int = 10,
+    method: str = "pca",
+) -> List[Dict[str, float]]:
+    """Measure recall and footprint of exact search at reduced dimensions.
+
+    For each target dimension a reducer is fitted on ``vectors`` and the
+    top-``k`` results of exact search in the reduced space are compared with
+    exact search over the full vectors.
+
+    Args:
+        vectors: Stored embeddings of shape (n, dim)
+        queries: Query embeddings of shape (q, dim)
+        dims: Target dimensions; the full dimension is always reported too
+        k: Number of neighbours compared per query
+        method: Reduction method, see ``REDUCERS``
+
+    Returns:
+        One row per dimension with recall@k, bytes per float32 vector,
+        megabytes for all vectors, search latency per query (ms) and, for
+        PCA, the explained variance
+    """
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+    full_dim = vectors.shape[1]
+    expected, _ = exact_search(vectors, queries, k)
+
+    report = []
+    for dim in sorted({d for d in dims if d < full_dim} | {full_dim}):
+        reducer = create_reducer(method, full_dim, dim).fit(vectors)
+        reduced_vectors = reducer.transform(vectors)
+        reduced_queries = reducer.transform(queries)
+
+        start = time.perf_counter()
+        found, _ = exact_search(reduced_vectors, reduced_queries, k)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        hits = sum(
+            len(set(row_expected) & set(row_found))
+            for row_expected, row_found in zip(expected, found)
+        )
+        row = {
+            "dim": dim,
+            "recall": hits / expected.size if expected.size else 0.0,
+            "bytes_per_vector": dim * 4,
+            "index_mb": len(vectors) * dim * 4 / 2**20,
+            "ms_per_query": elapsed_ms / max(len(queries), 1),
+        }
+        if isinstance(reducer, PCAReducer):
+            row["explained_variance"] = float(reducer.explained_variance_ratio.sum())
+        report.append(row)
+
+    return report
+
+
+def collection_dimension_report(
+    collection,
+    dims: Sequence[int] = (32, 64, 128, 192, 256),
+    k: int = 10,
+    sample_size: int = 10_000,
+    n_queries: int = 200,
+    method: str = "pca",
+) -> List[Dict[str, float]]:
+    """Run ``dimension_report`` on the vectors of a ChromaDB collection.
+
+    The leading ``n_queries`` stored vectors of the sample serve as queries
+    and are left out of the searched vectors.
+
+    Args:
+        collection: ChromaDB collection to sample
+        dims: Target dimensions
+        k: Number of neighbours compared per query
+        sample_size: Number of stored vectors read, queries included
+        n_queries: Number of stored vectors used as queries
+        method: Reduction method, see ``REDUCERS``
+
+    Returns:
+        Report rows, see ``dimension_report``
+    """
+    sample = collection.get(include=["embeddings"], limit=sample_size)
+    vectors = np.asarray(sample["embeddings"], dtype=np.float32)
+    n_queries = min(n_queries, len(vectors) // 2)
+    if n_queries == 0:
+        return []
+    return dimension_report(
+        vectors[n_queries:], vectors[:n_queries], dims=dims, k=k, method=method
+    )
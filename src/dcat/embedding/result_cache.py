@@ -0,0 +1,128 @@
+"""
+In-process cache of search results with TTL and LRU bounds.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Sequence, Tuple, Union
+
+_MISSING = object()
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query so trivially different spellings share a cache entry.
+
+    Args:
+        query: Search query
+
+    Returns:
+        Lowercased query with collapsed whitespace
+    """
+    return " ".join(query.lower().split())
+
+
+class SearchResultCache:
+    """LRU cache of search results whose entries expire after a TTL.
+
+    Keys include the version of the searched collection(s); owners bump the
+    version on every write, so entries computed before a write are never
+    served again and simply age out of the LRU.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 300.0):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached results
+            ttl_seconds: Lifetime of a cached result
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def make_key(
+        operation: str, query: Union[str, Sequence[str]], version: Any, **params
+    ) -> Tuple:
+        """Build a cache key.
+
+        Args:
+            operation: Name of the cached search operation
+            query: Search query, or list of queries of a batched search,
+                normalized with ``normalize_query``
+            version: Version of the searched collection(s)
+            **params: Other search parameters (result count, filters, ...)
+
+        Returns:
+            Hashable cache key
+        """
+        if isinstance(query, str):
+            query = normalize_query(query)
+        else:
+            # Keep query boundaries: ["a b", "c"] and ["a", "b c"] differ
+            query = json.dumps([normalize_query(q) for q in query])
+        return (
+            operation,
+            query,
+            json.dumps(version, sort_keys=True, default=str),
+            json.dumps(params, sort_keys=True, default=str),
+        )
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a cached result.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached result, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return value
+                del self._entries[key]
+            self._misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Cache a result, evicting the least recently used entries if full.
+
+        Args:
+            key: Cache key
+            value: Result to cache
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove every cached result."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Get cache statistics.
+
+        Returns:
+            Dictionary with hits, misses, hit_rate and entries
+        """
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / total if total else 0.0,
+                "entries": len(self._entries),
+            }
@@ -0,0 +1,119 @@
+"""
+Vectorized nearest-neighbour computations over embedding matrices.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+def top_k_neighbours(
+    embeddings: np.ndarray, k: int, block_size: int = 256
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Find the k nearest neighbours of every row of an embedding matrix.
+
+    Distances are squared L2 (the ChromaDB default space) and scores are
+    reported as ``1 - distance`` so they match ``EmbeddingEngine`` search
+    results. Rows are processed in blocks, so peak memory is roughly
+    ``block_size * n * 4`` bytes instead of ``n * n * 4``.
+
+    Args:
+        embeddings: Array of shape (n, dim)
+        k: Number of neighbours per row, excluding the row itself
+        block_size: Number of rows compared against the full matrix at once
+
+    Returns:
+        Tuple of (indices, scores) arrays of shape (n, k), sorted by
+        decreasing score
+    """
+    vectors = np.asarray(embeddings, dtype=np.float32)
+    n = vectors.shape[0]
+    k = min(k, n - 1)
+    if k <= 0:
+        return np.empty((n, 0), dtype=np.int64), np.empty((n, 0), dtype=np.float32)
+
+    sq_norms = np.einsum("ij,ij->i", vectors, vectors)
+    indices = np.empty((n, k), dtype=np.int64)
+    scores = np.empty((n, k), dtype=np.float32)
+
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        rows = np.arange(stop - start)
+
+        distances = sq_norms[start:stop, None] + sq_norms[None, :]
+        distances -= 2.0 * (vectors[start:stop] @ vectors.T)
+        # Exclude self-matches
+        distances[rows, rows + start] = np.inf
+
+        candidates = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        candidate_distances = np.take_along_axis(distances, candidates, axis=1)
+        order = np.argsort(candidate_distances, axis=1)
+
+        indices[start:stop] = np.take_along_axis(candidates, order, axis=1)
+        scores[start:stop] = 1.0 - np.take_along_axis(
+            candidate_distances, order, axis=1
+        )
+
+    return indices, scores
+
+
+def exact_search(
+    embeddings: np.ndarray,
+    queries: np.ndarray,
+    k: int,
+    block_size: int = 1024,
+    norms: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Find the exact k nearest rows of an embedding matrix for each query.
+
+    Rows are converted to float32 one block at a time, so ``embeddings`` may
+    be a float16 or memory-mapped array.
+
+    Args:
+        embeddings: Array of shape (n, dim) to search
+        queries: Array of shape (q, dim)
+        k: Number of results per query
+        block_size: Number of embedding rows scored per matrix-vector block
+        norms: Precomputed squared norms of the rows; a row with an infinite
+            norm gets an infinite distance
+
+    Returns:
+        Tuple of (indices, distances) arrays of shape (q, min(k, n)), sorted by
+        increasing squared L2 distance
+    """
+    vectors = np.asarray(embeddings)
+    queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+    n = vectors.shape[0]
+    k = min(k, n)
+    if k <= 0:
+        empty = np.empty((queries.shape[0], 0))
+        return empty.astype(np.int64), empty.astype(np.float32)
+
+    query_norms = np.einsum("ij,ij->i", queries, queries)[:, None]
+    best_indices = np.empty((queries.shape[0], 0), dtype=np.int64)
+    best_distances = np.empty((queries.shape[0], 0), dtype=np.float32)
+
+    for start in range(0, n, block_size):
+        block = np.asarray(vectors[start : start + block_size], dtype=np.float32)
+        if norms is None:
+            block_norms = np.einsum("ij,ij->i", block, block)[None, :]
+        else:
+            block_norms = norms[None, start : start + len(block)]
+        distances = query_norms + block_norms - 2.0 * (queries @ block.T)
+
+        # Merge this block's candidates with the running best k
+        block_indices = np.broadcast_to(
+            np.arange(start, start + len(block)), distances.shape
+        )
+        candidate_indices = np.hstack([best_indices, block_indices])
+        candidate_distances = np.hstack([best_distances, distances])
+        keep = min(k, candidate_distances.shape[1])
+        top = np.argpartition(candidate_distances, keep - 1, axis=1)[:, :keep]
+        best_indices = np.take_along_axis(candidate_indices, top, axis=1)
+        best_distances = np.take_along_axis(candidate_distances, top, axis=1)
+
+    order = np.argsort(best_distances, axis=1)
+    return (
+        np.take_along_axis(best_indices, order, axis=1),
+        np.take_along_axis(best_distances, order, axis=1),
+    )
@@ -3,11 +3,12 @@ import json
 import logging
 import os
 import uuid
-from typing import List, Dict, Any, Optional, Tuple
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple, Union
 from datetime import datetime
-import requests
-from sentence_transformers import SentenceTransformer
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import hashlib
 
 # Langchain imports
@@ -15,6 +16,37 @@ from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage
 from dotenv import load_dotenv
 
+try:
+    from .dcat.embedding.cache import EmbeddingCache
+    from .dcat.embedding.index import VectorIndex, index_collection, index_written
+    from .dcat.embedding.lexical import reciprocal_rank_fusion
+    from .dcat.embedding.backends import (
+        load_collection_version,
+        open_collection_index,
+        save_collection_index,
+        store_collection_version,
+    )
+    from .dcat.embedding.models import get_model
+    from .dcat.embedding.pool import parallel_encode, reindex_collection
+    from .dcat.embedding.reduction import collection_dimension_report
+    from .dcat.embedding.result_cache import SearchResultCache
+    from .sparql_client import get_sparql_client
+except ImportError:
+    from dcat.embedding.cache import EmbeddingCache
+    from dcat.embedding.index import VectorIndex, index_collection, index_written
+    from dcat.embedding.lexical import reciprocal_rank_fusion
+    from dcat.embedding.backends import (
+        load_collection_version,
+        open_collection_index,
+        save_collection_index,
+        store_collection_version,
+    )
+    from dcat.embedding.models import get_model
+    from dcat.embedding.pool import parallel_encode, reindex_collection
+    from dcat.embedding.reduction import collection_dimension_report
+    from dcat.embedding.result_cache import SearchResultCache
+    from sparql_client import get_sparql_client
+
 load_dotenv()
 
 
@@ -43,6 +75,17 @@ class SchemaInfo:
     void_description: Dict[str, Any]
 
 
+@dataclass
+class RetrievalContext:
+    """Everything retrieved for one user query, computed from a single embedding"""
+
+    query: str
+    query_embedding: List[float]
+    similar_examples: List[Dict[str, Any]] = field(default_factory=list)
+    schema_info: List[Dict[str, Any]] = field(default_factory=list)
+    endpoint_metadata: List[Dict[str, Any]] = field(default_factory=list)
+
+
 class RAGSystem:
     """
     Retrieval-Augmented Generation system for SPARQL query generation
@@ -54,6 +97,13 @@ class RAGSystem:
         chroma_persist_directory: str = "./vector_store",
         embedding_model: str = "all-MiniLM-L6-v2",
         llm_model: str = "gpt-4o",
+        embedding_cache: Optional[EmbeddingCache] = None,
+        query_cache_size: int = 128,
+        vector_indexes: Optional[Dict[str, VectorIndex]] = None,
+        vector_backend: Optional[str] = None,
+        result_cache: Optional[SearchResultCache] = None,
+        reduce_dim: Optional[int] = None,
+        reduction: str = "pca",
     ):
 
         self.chroma_persist_directory = chroma_persist_directory
@@ -63,8 +113,29 @@ class RAGSystem:
         # Initialize logging
         self.logger = logging.getLogger(__name__)
 
-        # Initialize embedding model
-        self.embedding_model = SentenceTransformer(embedding_model)
+        # Initialize embedding model (shared process-wide, loaded on first use)
+        self.embedding_model = get_model(embedding_model)
+
+        # Embeddings are cached by content hash, shared with EmbeddingEngine
+        self.embedding_cache = embedding_cache or EmbeddingCache(
+            os.path.join(chroma_persist_directory, "embedding_cache.sqlite3")
+        )
+
+        # Small in-process LRU of recent query vectors (agents retry questions)
+        self.query_cache_size = query_cache_size
+        self._query_vectors: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._query_vectors_lock = threading.Lock()
+        self._retrieval_executor = ThreadPoolExecutor(
+            max_workers=3, thread_name_prefix="rag-retrieval"
+        )
+
+        # Retrieval results keyed by collection versions, bumped on every write
+        # and persisted so saved in-process indexes can be checked for staleness
+        self.result_cache = result_cache or SearchResultCache()
+        self.collection_versions: Dict[str, int] = {
+            name: load_collection_version(chroma_persist_directory, name)
+            for name in ("query_examples", "schema_info", "endpoint_metadata")
+        }
 
         # Initialize LLM
         self.llm = ChatOpenAI(model=llm_model, temperature=0.1, request_timeout=60)
@@ -81,6 +152,25 @@ class RAGSystem:
             "endpoint_metadata"
         )
 
+        # Optional in-process indexes, keyed by collection name, that serve
+        # similarity queries instead of ChromaDB; with reduce_dim they hold
+        # projected vectors (ChromaDB keeps the full ones)
+        self.vector_indexes = vector_indexes or {}
+        if vector_backend and not self.vector_indexes:
+            dim = self.embedding_model.get_sentence_embedding_dimension()
+            for name, collection in self._collections().items():
+                self.vector_indexes[name] = open_collection_index(
+                    collection,
+                    os.path.join(chroma_persist_directory, f"{name}.{vector_backend}"),
+                    vector_backend,
+                    dim,
+                    version=self.collection_versions[name],
+                    include_documents=True,
+                    reduce_dim=reduce_dim,
+                    reduction=reduction,
+                )
+        self.vector_backend = vector_backend
+
         # EU Open Data Portal endpoints
         self.sparql_endpoint = "https://data.europa.eu/sparql"
         self.api_endpoint = "https://data.europa.eu/api/hub/search/search"
@@ -98,7 +188,46 @@ class RAGSystem:
 
     def _generate_embedding(self, text: str) -> List[float]:
         """Generate embedding for given text"""
-        return self.embedding_model.encode(text).tolist()
+        return self.embedding_cache.get_or_encode(
+            self.embedding_model_name, [text], self.embedding_model.encode
+        )[0].tolist()
+
+    def _embed_query(self, query: str) -> List[float]:
+        """Generate a query embedding, reusing recently seen query vectors"""
+        with self._query_vectors_lock:
+            if query in self._query_vectors:
+                self._query_vectors.move_to_end(query)
+                return self._query_vectors[query]
+
+        embedding = self._generate_embedding(query)
+
+        with self._query_vectors_lock:
+            self._query_vectors[query] = embedding
+            if len(self._query_vectors) > self.query_cache_size:
+                self._query_vectors.popitem(last=False)
+        return embedding
+
+    def _embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """Embed several queries with at most one model call"""
+        with self._query_vectors_lock:
+            embeddings = {
+                query: self._query_vectors[query]
+                for query in queries
+                if query in self._query_vectors
+            }
+
+        missing = [query for query in dict.fromkeys(queries) if query not in embeddings]
+        if missing:
+            encoded = self.embedding_cache.get_or_encode(
+                self.embedding_model_name, missing, self.embedding_model.encode
+            )
+            with self._query_vectors_lock:
+                for query, embedding in zip(missing, encoded):
+                    embeddings[query] = self._query_vectors[query] = embedding.tolist()
+                while len(self._query_vectors) > self.query_cache_size:
+                    self._query_vectors.popitem(last=False)
+
+        return [embeddings[query] for query in queries]
 
     def _create_document_id(self, content: str) -> str:
         """Create a unique document ID based on content hash"""
@@ -111,27 +240,31 @@ class RAGSystem:
         # Generate embedding for the question
         embedding = self._generate_embedding(example.question)
 
+        metadata = {
+            "sparql_query": example.sparql_query,
+            "endpoint": example.endpoint,
+            "description": example.description,
+            "tags": json.dumps(example.tags),
+            "added_at": datetime.now().isoformat(),
+        }
+
         # Store in ChromaDB
         self.query_examples_collection.add(
             documents=[example.question],
             embeddings=[embedding],
-            metadatas=[
-                {
-                    "sparql_query": example.sparql_query,
-                    "endpoint": example.endpoint,
-                    "description": example.description,
-                    "tags": json.dumps(example.tags),
-                    "added_at": datetime.now().isoformat(),
-                }
-            ],
+            metadatas=[metadata],
             ids=[doc_id],
         )
+        self._index_document(
+            "query_examples", doc_id, embedding, example.question, metadata
+        )
+        self._bump_version("query_examples")
 
         self.logger.info(f"Added query example with ID: {doc_id}")
         return doc_id
 
-    def add_schema_info(self, schema: SchemaInfo) -> str:
-        """Add schema information to the vector store"""
+    def _schema_document(self, schema: SchemaInfo) -> Tuple[str, str, Dict[str, Any]]:
+        """Build the (id, text, metadata) record stored for a schema"""
         # Create a text representation of the schema for embedding
         schema_text = f"Endpoint: {schema.endpoint}\n"
         schema_text += (
@@ -139,35 +272,369 @@ class RAGSystem:
         )
         schema_text += f"Properties: {', '.join([prop.get('name', '') for prop in schema.properties])}"
 
-        doc_id = self._create_document_id(schema_text)
+        metadata = {
+            "endpoint": schema.endpoint,
+            "classes": json.dumps(schema.classes),
+            "properties": json.dumps(schema.properties),
+            "void_description": json.dumps(schema.void_description),
+            "added_at": datetime.now().isoformat(),
+        }
+        return self._create_document_id(schema_text), schema_text, metadata
+
+    def add_schema_info(self, schema: SchemaInfo) -> str:
+        """Add schema information to the vector store"""
+        doc_id, schema_text, metadata = self._schema_document(schema)
         embedding = self._generate_embedding(schema_text)
 
         self.schema_collection.add(
             documents=[schema_text],
             embeddings=[embedding],
-            metadatas=[
-                {
-                    "endpoint": schema.endpoint,
-                    "classes": json.dumps(schema.classes),
-                    "properties": json.dumps(schema.properties),
-                    "void_description": json.dumps(schema.void_description),
-                    "added_at": datetime.now().isoformat(),
-                }
-            ],
+            metadatas=[metadata],
             ids=[doc_id],
         )
+        self._index_document("schema_info", doc_id, embedding, schema_text, metadata)
+        self._bump_version("schema_info")
 
         self.logger.info(f"Added schema info for endpoint: {schema.endpoint}")
         return doc_id
 
+    def add_schema_infos(
+        self,
+        schemas: List[SchemaInfo],
+        n_workers: Optional[int] = None,
+        batch_size: int = 256,
+    ) -> Dict[str, float]:
+        """Add many schemas, encoding them in a pool of worker processes"""
+        records = (self._schema_document(schema) for schema in schemas)
+        stats = parallel_encode(
+            records,
+            self.embedding_model_name,
+            self._pool_writer("schema_info"),
+            n_workers=n_workers,
+            batch_size=batch_size,
+        )
+        self.logger.info(f"Added {stats['processed']} schemas in parallel")
+        self.save_vector_indexes()
+        return stats
+
+    def reindex(
+        self, n_workers: Optional[int] = None, batch_size: int = 256
+    ) -> Dict[str, Dict[str, float]]:
+        """Re-embed every collection in a pool of worker processes"""
+        stats = {
+            name: reindex_collection(
+                collection,
+                self.embedding_model_name,
+                n_workers=n_workers,
+                batch_size=batch_size,
+                write=self._pool_writer(name, upsert=False),
+            )
+            for name, collection in self._collections().items()
+        }
+        self.save_vector_indexes()
+        return stats
+
+    def _pool_writer(self, name: str, upsert: bool = True):
+        """Writer that stores encoded pool batches; this process is the only writer"""
+        collection = self._collections()[name]
+
+        def _write(ids, texts, embeddings, metadatas):
+            if upsert:
+                collection.upsert(
+                    documents=texts,
+                    embeddings=embeddings.tolist(),
+                    metadatas=metadatas,
+                    ids=ids,
+                )
+            self.embedding_cache.put_many(self.embedding_model_name, texts, embeddings)
+            for doc_id, embedding, text, metadata in zip(
+                ids, embeddings, texts, metadatas
+            ):
+                self._index_document(name, doc_id, embedding, text, metadata)
+            self._bump_version(name)
+
+        return _write
+
+    def _bump_version(self, name: str) -> None:
+        """Mark a collection as changed so cached retrievals and saved indexes are not reused"""
+        self.collection_versions[name] += 1
+        store_collection_version(
+            self.chroma_persist_directory, name, self.collection_versions[name]
+        )
+
+    def _cached(
+        self,
+        operation: str,
+        query: Union[str, List[str]],
+        names: List[str],
+        compute,
+        **params,
+    ):
+        """Serve a retrieval from the result cache or compute and cache it"""
+        versions = {name: self.collection_versions[name] for name in names}
+        key = self.result_cache.make_key(operation, query, versions, **params)
+        result = self.result_cache.get(key)
+        if result is None:
+            result = compute()
+            self.result_cache.put(key, result)
+        return result
+
     def retrieve_similar_examples(
         self, query: str, n_results: int = 5
     ) -> List[Dict[str, Any]]:
         """Retrieve similar query examples using vector similarity search"""
-        query_embedding = self._generate_embedding(query)
+        return list(
+            self._cached(
+                "similar_examples",
+                query,
+                ["query_examples"],
+                lambda: self._query_similar_examples(
+                    self._embed_query(query), n_results
+                ),
+                n_results=n_results,
+            )
+        )
+
+    def retrieve_relevant_schema(
+        self, query: str, n_results: int = 3
+    ) -> List[Dict[str, Any]]:
+        """Retrieve relevant schema information"""
+        return list(
+            self._cached(
+                "relevant_schema",
+                query,
+                ["schema_info"],
+                lambda: self._query_relevant_schema(
+                    self._embed_query(query), n_results
+                ),
+                n_results=n_results,
+            )
+        )
+
+    def search_many(
+        self,
+        queries: List[str],
+        name: str = "query_examples",
+        n_results: int = 5,
+        rrf_k: int = 60,
+    ) -> Tuple[List[List[Dict[str, Any]]], List[Dict[str, Any]]]:
+        """Search one collection for several queries with one encode and one lookup
+
+        Returns per-query hits (id, document, metadata, distance) aligned with
+        ``queries`` and their reciprocal rank fusion, best first, with a
+        ``fused_score`` added to each hit.
+        """
+        if not queries:
+            return [], []
+
+        def _search():
+            results = self._query_collection_many(
+                name, self._collections()[name], self._embed_queries(queries), n_results
+            )
+            hits = {hit["id"]: hit for row in results for hit in row}
+            fused = reciprocal_rank_fusion(
+                [[hit["id"] for hit in row] for row in results], k=rrf_k
+            )
+            return results, [
+                dict(hits[doc_id], fused_score=score) for doc_id, score in fused
+            ]
+
+        results, fused = self._cached(
+            "search_many",
+            queries,
+            [name],
+            _search,
+            n_results=n_results,
+            rrf_k=rrf_k,
+        )
+        return [list(row) for row in results], list(fused)
+
+    def retrieve_context(
+        self,
+        query: str,
+        n_examples: int = 3,
+        n_schema: int = 2,
+        n_endpoints: int = 2,
+    ) -> RetrievalContext:
+        """Encode the query once and query all collections in parallel"""
+        return self._cached(
+            "context",
+            query,
+            list(self.collection_versions),
+            lambda: self._retrieve_context(query, n_examples, n_schema, n_endpoints),
+            n_examples=n_examples,
+            n_schema=n_schema,
+            n_endpoints=n_endpoints,
+        )
+
+    def _retrieve_context(
+        self, query: str, n_examples: int, n_schema: int, n_endpoints: int
+    ) -> RetrievalContext:
+        """Uncached body of retrieve_context"""
+        query_embedding = self._embed_query(query)
+
+        examples_future = self._retrieval_executor.submit(
+            self._query_similar_examples, query_embedding, n_examples
+        )
+        schema_future = self._retrieval_executor.submit(
+            self._query_relevant_schema, query_embedding, n_schema
+        )
+        endpoints_future = self._retrieval_executor.submit(
+            self._query_endpoint_metadata, query_embedding, n_endpoints
+        )
 
-        results = self.query_examples_collection.query(
-            query_embeddings=[query_embedding], n_results=n_results
+        return RetrievalContext(
+            query=query,
+            query_embedding=query_embedding,
+            similar_examples=examples_future.result(),
+            schema_info=schema_future.result(),
+            endpoint_metadata=endpoints_future.result(),
+        )
+
+    def _query_collection(
+        self, name: str, collection, query_embedding: List[float], n_results: int
+    ) -> Dict[str, Any]:
+        """Query a collection, through its in-process index when one is set"""
+        index = self._searchable_index(name)
+        if index is None:
+            return collection.query(
+                query_embeddings=[query_embedding], n_results=n_results
+            )
+
+        # Shape index hits like a ChromaDB query result
+        hits = index.search(query_embedding, n_results)
+        metadatas = [dict(metadata) for _, _, metadata in hits]
+        return {
+            "ids": [[doc_id for doc_id, _, _ in hits]],
+            "documents": [[metadata.pop("document", "") for metadata in metadatas]],
+            "metadatas": [metadatas],
+            "distances": [[distance for _, distance, _ in hits]],
+        }
+
+    def _query_collection_many(
+        self,
+        name: str,
+        collection,
+        query_embeddings: List[List[float]],
+        n_results: int,
+    ) -> List[List[Dict[str, Any]]]:
+        """Query a collection for several embeddings in one batched lookup"""
+        index = self._searchable_index(name)
+        if index is None:
+            results = collection.query(
+                query_embeddings=query_embeddings, n_results=n_results
+            )
+            return [
+                [
+                    {
+                        "id": doc_id,
+                        "document": document,
+                        "metadata": metadata or {},
+                        "distance": distance,
+                    }
+                    for doc_id, document, metadata, distance in zip(*row)
+                ]
+                for row in zip(
+                    results["ids"],
+                    results["documents"],
+                    results["metadatas"],
+                    results["distances"],
+                )
+            ]
+
+        rows = []
+        for hits in index.search_many(query_embeddings, n_results):
+            row = []
+            for doc_id, distance, metadata in hits:
+                metadata = dict(metadata)
+                document = metadata.pop("document", "")
+                row.append(
+                    {
+                        "id": doc_id,
+                        "document": document,
+                        "metadata": metadata,
+                        "distance": distance,
+                    }
+                )
+            rows.append(row)
+        return rows
+
+    def _index_document(
+        self,
+        name: str,
+        doc_id: str,
+        embedding: List[float],
+        document: str,
+        metadata: Dict[str, Any],
+    ) -> None:
+        """Mirror a stored document into the collection's in-process index
+
+        An index that needs training is trained from the collection once it
+        holds enough documents; until then searches go to ChromaDB.
+        """
+        index = self.vector_indexes.get(name)
+        if index is not None:
+            index_written(
+                self._collections()[name],
+                index,
+                [doc_id],
+                [embedding],
+                [dict(metadata, document=document)],
+                include_documents=True,
+            )
+
+    def _searchable_index(self, name: str) -> Optional[VectorIndex]:
+        """The collection's in-process index, if set and trained"""
+        index = self.vector_indexes.get(name)
+        if index is None or not getattr(index, "is_trained", True):
+            return None
+        return index
+
+    def _collections(self) -> Dict[str, Any]:
+        """ChromaDB collections by name"""
+        return {
+            "query_examples": self.query_examples_collection,
+            "schema_info": self.schema_collection,
+            "endpoint_metadata": self.endpoint_metadata_collection,
+        }
+
+    def rebuild_vector_indexes(self) -> Dict[str, int]:
+        """Load the configured in-process indexes from ChromaDB"""
+        collections = self._collections()
+        return {
+            name: index_collection(collections[name], index, include_documents=True)
+            for name, index in self.vector_indexes.items()
+        }
+
+    def save_vector_indexes(self) -> None:
+        """Persist the in-process indexes next to the ChromaDB store"""
+        for name, index in self.vector_indexes.items():
+            if not getattr(index, "is_trained", True):
+                continue
+            save_collection_index(
+                index,
+                os.path.join(self.chroma_persist_directory, f"{name}.{index.backend}"),
+                self.collection_versions[name],
+            )
+
+    def dimension_report(
+        self,
+        name: str = "schema_info",
+        dims: Tuple[int, ...] = (32, 64, 128, 192, 256),
+        k: int = 10,
+        method: str = "pca",
+    ) -> List[Dict[str, float]]:
+        """Recall versus vector size for a collection, to choose reduce_dim"""
+        return collection_dimension_report(
+            self._collections()[name], dims=dims, k=k, method=method
+        )
+
+    def _query_similar_examples(
+        self, query_embedding: List[float], n_results: int
+    ) -> List[Dict[str, Any]]:
+        """Query the examples collection with a precomputed embedding"""
+        results = self._query_collection(
+            "query_examples", self.query_examples_collection, query_embedding, n_results
         )
 
         similar_examples = []
@@ -190,14 +657,12 @@ class RAGSystem:
 
         return similar_examples
 
-    def retrieve_relevant_schema(
-        self, query: str, n_results: int = 3
+    def _query_relevant_schema(
+        self, query_embedding: List[float], n_results: int
     ) -> List[Dict[str, Any]]:
-        """Retrieve relevant schema information"""
-        query_embedding = self._generate_embedding(query)
-
-        results = self.schema_collection.query(
-            query_embeddings=[query_embedding], n_results=n_results
+        """Query the schema collection with a precomputed embedding"""
+        results = self._query_collection(
+            "schema_info", self.schema_collection, query_embedding, n_results
         )
 
         schema_info = []
@@ -223,12 +688,53 @@ class RAGSystem:
 
         return schema_info
 
-    def build_rag_prompt(self, user_query: str, context: str = "") -> str:
+    def _query_endpoint_metadata(
+        self, query_embedding: List[float], n_results: int
+    ) -> List[Dict[str, Any]]:
+        """Query the endpoint metadata collection with a precomputed embedding"""
+        if (
+            "endpoint_metadata" not in self.vector_indexes
+            and self.endpoint_metadata_collection.count() == 0
+        ):
+            return []
+
+        results = self._query_collection(
+            "endpoint_metadata",
+            self.endpoint_metadata_collection,
+            query_embedding,
+            n_results,
+        )
+
+        endpoint_metadata = []
+        if results["documents"] and results["documents"][0]:
+            for i, doc in enumerate(results["documents"][0]):
+                endpoint_metadata.append(
+                    {
+                        "description": doc,
+                        "metadata": results["metadatas"][0][i],
+                        "distance": (
+                            results["distances"][0][i]
+                            if results.get("distances")
+                            else None
+                        ),
+                    }
+                )
+
+        return endpoint_metadata
+
+    def build_rag_prompt(
+        self,
+        user_query: str,
+        context: str = "",
+        retrieval: Optional[RetrievalContext] = None,
+    ) -> str:
         """Build an enhanced prompt using RAG with similar examples and schema info"""
 
-        # Retrieve similar examples and schema
-        similar_examples = self.retrieve_similar_examples(user_query, n_results=3)
-        schema_info = self.retrieve_relevant_schema(user_query, n_results=2)
+        # Retrieve similar examples and schema unless already retrieved
+        if retrieval is None:
+            retrieval = self.retrieve_context(user_query)
+        similar_examples = retrieval.similar_examples
+        schema_info = retrieval.schema_info
 
         # Build the enhanced prompt
         prompt = f"""
@@ -260,6 +766,16 @@ class RAGSystem:
         Available Properties: {', '.join([prop.get('name', prop.get('uri', '')) for prop in schema['properties'][:15]])}
         """
 
+        if retrieval.endpoint_metadata:
+            prompt += """
+        ## Endpoint Information:
+        """
+
+            for endpoint in retrieval.endpoint_metadata:
+                prompt += f"""
+        {endpoint['description']}
+        """
+
         prompt += f"""
         
         ## Instructions:
@@ -295,12 +811,21 @@ class RAGSystem:
 
         return prompt
 
-    def generate_sparql_with_rag(self, user_query: str, context: str = "") -> str:
+    def generate_sparql_with_rag(
+        self,
+        user_query: str,
+        context: str = "",
+        retrieval: Optional[RetrievalContext] = None,
+    ) -> str:
         """Generate SPARQL query using RAG-enhanced prompting"""
 
         try:
+            # Encode the query and retrieve context once for the whole request
+            if retrieval is None:
+                retrieval = self.retrieve_context(user_query)
+
             # Build RAG-enhanced prompt
-            enhanced_prompt = self.build_rag_prompt(user_query, context)
+            enhanced_prompt = self.build_rag_prompt(user_query, context, retrieval)
 
             self.logger.info("Generating SPARQL with RAG enhancement...")
 
@@ -342,20 +867,15 @@ class RAGSystem:
                 )
 
             # Execute validation query
-            headers = {"Accept": "application/sparql-results+json"}
-            params = {"query": validation_query}
-
-            response = requests.get(
-                self.sparql_endpoint, headers=headers, params=params, timeout=10
+            get_sparql_client().query(
+                validation_query, self.sparql_endpoint, timeout=10
             )
-
-            if response.status_code == 200:
-                results = response.json()
-                return True, "Query syntax is valid"
-            else:
-                return False, f"HTTP {response.status_code}: {response.text[:200]}"
+            return True, "Query syntax is valid"
 
         except Exception as e:
+            response = getattr(e, "response", None)
+            if response is not None:
+                return False, f"HTTP {response.status_code}: {response.text[:200]}"
             return False, f"Validation error: {str(e)}"
 
     def populate_with_examples(self):
@@ -512,6 +1032,7 @@ LIMIT 15""",
         for example in examples:
             self.add_query_example(example)
 
+        self.save_vector_indexes()
         self.logger.info(f"Populated RAG system with {len(examples)} query examples")
 
 
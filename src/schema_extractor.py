@@ -1,7 +1,6 @@
-import requests
 import json
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import re
@@ -10,8 +9,10 @@ from urllib.parse import urlparse
 
 try:
     from .rag_system import RAGSystem, SchemaInfo
+    from .sparql_client import get_sparql_client
 except ImportError:
     from rag_system import RAGSystem, SchemaInfo
+    from sparql_client import get_sparql_client
 
 
 @dataclass
@@ -102,25 +103,26 @@ class SchemaExtractor:
     def execute_sparql_query(self, query: str, timeout: int = 30) -> Optional[Dict]:
         """Execute a SPARQL query and return results"""
         try:
-            headers = {"Accept": "application/sparql-results+json"}
-            params = {"query": query}
-
-            response = requests.get(
-                self.endpoint_url, headers=headers, params=params, timeout=timeout
-            )
-
-            if response.status_code == 200:
-                return response.json()
-            else:
+            return get_sparql_client().query(query, self.endpoint_url, timeout=timeout)
+        except Exception as e:
+            response = getattr(e, "response", None)
+            if response is not None:
                 self.logger.warning(
                     f"SPARQL query failed with status {response.status_code}"
                 )
                 return None
-
-        except Exception as e:
             self.logger.error(f"Error executing SPARQL query: {e}")
             return None
 
+    def stream_sparql_query(self, query: str, timeout: int = 30) -> Iterator[Dict]:
+        """Yield the bindings of a SPARQL query while the response downloads"""
+        try:
+            yield from get_sparql_client().stream_query(
+                query, self.endpoint_url, timeout=timeout
+            )
+        except Exception as e:
+            self.logger.error(f"Error streaming SPARQL query: {e}")
+
     def get_void_description(self) -> Dict[str, Any]:
         """Extract VoID (Vocabulary of Interlinked Datasets) description"""
 
@@ -356,20 +358,17 @@ class SchemaExtractor:
         LIMIT 50
         """
 
-        results = self.execute_sparql_query(patterns_query)
         patterns = []
-
-        if results and results.get("results", {}).get("bindings"):
-            for binding in results["results"]["bindings"]:
-                predicate = binding.get("predicate", {}).get("value", "")
-                count = int(binding.get("count", {}).get("value", 0))
-                patterns.append(
-                    {
-                        "predicate": predicate,
-                        "usage_count": count,
-                        "name": self._extract_name_from_uri(predicate),
-                    }
-                )
+        for binding in self.stream_sparql_query(patterns_query):
+            predicate = binding.get("predicate", {}).get("value", "")
+            count = int(binding.get("count", {}).get("value", 0))
+            patterns.append(
+                {
+                    "predicate": predicate,
+                    "usage_count": count,
+                    "name": self._extract_name_from_uri(predicate),
+                }
+            )
 
         self.logger.info(f"Extracted {len(patterns)} common patterns")
         return {"patterns": patterns}
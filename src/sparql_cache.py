@@ -0,0 +1,354 @@
+"""
+Persistent SQLite cache of SPARQL and Hub-Search results
+"""
+
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds a result stays fresh, per query class
+DEFAULT_TTLS = {
+    "aggregate": 24 * 3600,  # counts and GROUP BY statistics, e.g. schema queries
+    "ask": 24 * 3600,
+    "select": 6 * 3600,
+    "graph": 6 * 3600,  # CONSTRUCT and DESCRIBE
+    "search": 3600,  # Hub-Search API responses
+}
+
+# Number of hits whose last-use time is kept in memory before writing them
+TOUCH_BATCH_SIZE = 1000
+
+# Least recently used entries read per eviction query
+EVICT_BATCH_SIZE = 256
+
+# fmt: off
+SPARQL_KEYWORDS = {
+    "ABS", "AS", "ASC", "ASK", "AVG", "BASE", "BIND", "BNODE", "BOUND", "BY",
+    "CEIL", "COALESCE", "CONCAT", "CONSTRUCT", "CONTAINS", "COUNT", "DATATYPE",
+    "DAY", "DESC", "DESCRIBE", "DISTINCT", "ENCODE_FOR_URI", "EXISTS", "FILTER",
+    "FLOOR", "FROM", "GRAPH", "GROUP", "GROUP_CONCAT", "HAVING", "HOURS", "IF",
+    "IN", "IRI", "ISBLANK", "ISIRI", "ISLITERAL", "ISNUMERIC", "ISURI", "LANG",
+    "LANGMATCHES", "LCASE", "LIMIT", "MAX", "MD5", "MIN", "MINUS", "MINUTES",
+    "MONTH", "NAMED", "NOT", "NOW", "OFFSET", "OPTIONAL", "ORDER", "PREFIX",
+    "RAND", "REDUCED", "REGEX", "REPLACE", "ROUND", "SAMPLE", "SECONDS",
+    "SELECT", "SEPARATOR", "SERVICE", "SHA1", "SHA256", "STR", "STRAFTER",
+    "STRBEFORE", "STRDT", "STRENDS", "STRLANG", "STRLEN", "STRSTARTS", "SUBSTR",
+    "SUM", "TIMEZONE", "TZ", "UCASE", "UNDEF", "UNION", "URI", "VALUES",
+    "WHERE", "YEAR",
+}
+# fmt: on
+
+_TOKEN = re.compile(
+    r"""
+    (?P<space>\s+)
+    | (?P<comment>\#[^\n]*)
+    | (?P<literal>\"\"\"[\s\S]*?\"\"\"|'''[\s\S]*?'''
+        |"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')
+    | (?P<iri><[^<>"{}|^`\\\s]*>)
+    | (?P<var>[?$]\w+)
+    | (?P<name>[\w:-]+(?:\.[\w:-]+)*)
+    | (?P<operator>&&|\|\||!=|<=|>=|\^\^)
+    | (?P<other>.)
+    """,
+    re.VERBOSE,
+)
+
+
+def _tokens(query: str) -> List[Tuple[str, str]]:
+    """(kind, text) tokens of a query, without whitespace and comments"""
+    return [
+        (match.lastgroup, match.group())
+        for match in _TOKEN.finditer(query)
+        if match.lastgroup not in ("space", "comment")
+    ]
+
+
+def canonicalize_sparql(query: str) -> str:
+    """Canonical form of a SPARQL query, used as its cache key
+
+    Comments and formatting whitespace are dropped, keywords are upper-cased
+    and PREFIX declarations are sorted, so queries differing only in layout
+    share one cache entry. Literals, IRIs and variable names are kept as is.
+    """
+    tokens = []
+    for kind, text in _tokens(query):
+        if kind == "name" and text.upper() in SPARQL_KEYWORDS:
+            text = text.upper()
+        tokens.append(text)
+
+    # Prologue: BASE <iri> and PREFIX name: <iri> declarations
+    base, prefixes, i = [], [], 0
+    while i + 1 < len(tokens) and tokens[i] in ("BASE", "PREFIX"):
+        if tokens[i] == "BASE":
+            base.append(tokens[i : i + 2])
+            i += 2
+        else:
+            prefixes.append(tokens[i : i + 3])
+            i += 3
+    prologue = [token for declaration in base for token in declaration]
+    for declaration in sorted(prefixes):
+        prologue.extend(declaration)
+    return " ".join(prologue + tokens[i:])
+
+
+def classify_query(query: str) -> str:
+    """Query class of a SPARQL query, selecting its TTL in ``DEFAULT_TTLS``"""
+    names = {text.upper() for kind, text in _tokens(query) if kind == "name"}
+    if "ASK" in names:
+        return "ask"
+    if "CONSTRUCT" in names or "DESCRIBE" in names:
+        return "graph"
+    if "GROUP" in names or names & {"COUNT", "SUM", "AVG", "MIN", "MAX"}:
+        return "aggregate"
+    return "select"
+
+
+class SparqlResultCache:
+    """Disk-backed cache of decoded JSON results with TTLs and revalidation
+
+    Entries are fresh for the TTL of their query class. An expired entry is
+    still served for ``stale_ttl`` seconds while a background thread fetches
+    a new copy (stale-while-revalidate); after that it is fetched again
+    before answering. Bodies are stored zlib-compressed and the least
+    recently used entries are evicted once ``max_bytes`` is exceeded.
+
+    Lookups do not write: last-use times of hits are written in batches,
+    with the next ``put`` or on ``close``.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 256 * 1024 * 1024,
+        ttls: Optional[Dict[str, float]] = None,
+        stale_ttl: float = 24 * 3600,
+        stale_if_error: bool = True,
+    ):
+        """Open or create the cache in the SQLite file ``path``
+
+        ``ttls`` overrides entries of ``DEFAULT_TTLS``. With
+        ``stale_if_error`` an expired entry is served when fetching fails.
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.stale_ttl = stale_ttl
+        self.stale_if_error = stale_if_error
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.errors_served_stale = 0
+
+        self._lock = threading.Lock()
+        self._revalidating = set()
+        # Last-use times of hits not yet written, see _flush_touches
+        self._touched: Dict[str, float] = {}
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                query_class TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_results_last_used ON results (last_used)"
+        )
+        self._conn.commit()
+        self._bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM results"
+        ).fetchone()[0]
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Cache key of JSON-serializable request parts"""
+        text = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def sparql_key(cls, endpoint: str, query: str) -> str:
+        """Cache key of a SPARQL query, shared by all its layouts"""
+        return cls.make_key("sparql", endpoint, canonicalize_sparql(query))
+
+    def get(self, key: str) -> Tuple[Optional[Any], Optional[float]]:
+        """Cached value of a key and the seconds since it expired
+
+        Returns (None, None) on a miss; a negative age means still fresh.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, expires_at FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None, None
+            self._touched[key] = now
+            if len(self._touched) >= TOUCH_BATCH_SIZE:
+                self._flush_touches()
+                self._conn.commit()
+        return json.loads(zlib.decompress(row[0])), now - row[1]
+
+    def put(self, key: str, value: Any, query_class: str = "select") -> None:
+        """Store a value, evicting least recently used entries if needed"""
+        body = zlib.compress(json.dumps(value).encode("utf-8"))
+        if len(body) > self.max_bytes:
+            return
+        now = time.time()
+        expires_at = now + self.ttls.get(query_class, self.ttls["select"])
+
+        with self._lock:
+            # Eviction below must see the recent hits
+            self._flush_touches()
+            old = self._conn.execute(
+                "SELECT size FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results "
+                "(key, query_class, body, size, expires_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, query_class, body, len(body), expires_at, now),
+            )
+            self._bytes += len(body) - (old[0] if old else 0)
+            if self._bytes > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def get_or_fetch(
+        self, key: str, fetch: Callable[[], Any], query_class: str = "select"
+    ) -> Any:
+        """Serve a key from the cache, fetching and storing it when needed"""
+        value, age = self.get(key)
+        if age is not None and age < 0:
+            self.count("hits")
+            return value
+        if age is not None and age < self.stale_ttl:
+            self.count("stale_hits")
+            self._revalidate(key, fetch, query_class)
+            return value
+
+        self.count("misses")
+        try:
+            fresh = fetch()
+        except Exception:
+            if age is None or not self.stale_if_error:
+                raise
+            self.count("errors_served_stale")
+            logger.warning("Fetching failed, serving an expired cached result")
+            return value
+        self.put(key, fresh, query_class)
+        return fresh
+
+    def query(
+        self,
+        endpoint: str,
+        query: str,
+        fetch: Callable[[], Any],
+        query_class: Optional[str] = None,
+    ) -> Any:
+        """Serve a SPARQL query from the cache, classified by its form"""
+        return self.get_or_fetch(
+            self.sparql_key(endpoint, query),
+            fetch,
+            query_class or classify_query(query),
+        )
+
+    def count(self, counter: str) -> None:
+        """Increment a statistics counter, e.g. ``hits``, thread-safely"""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def stats(self) -> Dict[str, float]:
+        """Hit, stale hit, miss and revalidation counters, entries and bytes"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            stats = {
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "revalidations": self.revalidations,
+                "errors_served_stale": self.errors_served_stale,
+                "entries": entries,
+                "bytes": self._bytes,
+            }
+        lookups = stats["hits"] + stats["stale_hits"] + stats["misses"]
+        served = stats["hits"] + stats["stale_hits"]
+        stats["hit_rate"] = served / lookups if lookups else 0.0
+        return stats
+
+    def clear(self) -> None:
+        """Remove every cached result"""
+        with self._lock:
+            self._conn.execute("DELETE FROM results")
+            self._conn.commit()
+            self._touched.clear()
+            self._bytes = 0
+
+    def close(self) -> None:
+        """Write pending last-use times and close the database"""
+        with self._lock:
+            self._flush_touches()
+            self._conn.commit()
+            self._conn.close()
+
+    def _flush_touches(self) -> None:
+        """Write the recorded last-use times of hits, under the caller's lock"""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE results SET last_used = ? WHERE key = ?",
+                [(used, key) for key, used in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until below ``max_bytes``"""
+        while self._bytes > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM results ORDER BY last_used ASC LIMIT ?",
+                (EVICT_BATCH_SIZE,),
+            ).fetchall()
+            if not rows:
+                break
+            evicted = []
+            for key, size in rows:
+                if self._bytes <= self.max_bytes:
+                    break
+                evicted.append((key,))
+                self._bytes -= size
+            self._conn.executemany("DELETE FROM results WHERE key = ?", evicted)
+
+    def _revalidate(self, key: str, fetch: Callable[[], Any], query_class: str):
+        """Refresh a stale entry in the background, once at a time per key"""
+        with self._lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+
+        def refresh():
+            try:
+                self.put(key, fetch(), query_class)
+                self.count("revalidations")
+            except Exception as e:
+                logger.warning(f"Revalidating a cached result failed: {e}")
+            finally:
+                with self._lock:
+                    self._revalidating.discard(key)
+
+        threading.Thread(target=refresh, name="sparql-revalidate", daemon=True).start()
@@ -0,0 +1,302 @@
+"""
+Shared pooled HTTP client for SPARQL endpoints and the EU Open Data Portal APIs
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from .sparql_cache import SparqlResultCache, classify_query
+    from .sparql_stream import SparqlResultStream
+except ImportError:
+    from sparql_cache import SparqlResultCache, classify_query
+    from sparql_stream import SparqlResultStream
+
+DEFAULT_SPARQL_ENDPOINT = "https://data.europa.eu/sparql"
+SPARQL_RESULTS_JSON = "application/sparql-results+json"
+
+
+class SparqlClient:
+    """HTTP client keeping one pooled keep-alive session per endpoint host
+
+    Reusing connections saves a TCP and TLS handshake on every query, which
+    dominates the latency of short SPARQL queries. Responses are requested
+    gzip-compressed and per-endpoint request metrics are recorded. With a
+    ``SparqlResultCache``, ``query`` and ``get_json`` serve repeated requests
+    from disk. ``stream_query`` yields large result sets binding by binding.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        timeout: float = 30,
+        user_agent: str = "Mozilla/5.0 (compatible; SPARQL-Client/1.0)",
+        cache: Optional[SparqlResultCache] = None,
+    ):
+        """Create a client keeping up to ``pool_size`` connections alive per host"""
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.cache = cache
+
+        self._sessions: Dict[str, requests.Session] = {}
+        self._metrics: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def session(self, url: str) -> requests.Session:
+        """Pooled session for the host serving ``url``"""
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=1, pool_maxsize=self.pool_size, pool_block=False
+                )
+                session.mount(f"{parts.scheme}://", adapter)
+                session.headers.update(
+                    {"Accept-Encoding": "gzip, deflate", "User-Agent": self.user_agent}
+                )
+                self._sessions[host] = session
+            return session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request through the pooled session of the endpoint
+
+        Accepts the keyword arguments of ``requests.request``; ``timeout``
+        defaults to the client timeout. Exceptions are those of ``requests``.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        endpoint = url.split("?", 1)[0]
+        start = time.perf_counter()
+        try:
+            response = self.session(url).request(method, url, **kwargs)
+        except requests.exceptions.RequestException:
+            self._record(endpoint, (time.perf_counter() - start) * 1000, None)
+            raise
+        self._record(endpoint, (time.perf_counter() - start) * 1000, response)
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET through the pooled session, like ``requests.get``"""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """POST through the pooled session, like ``requests.post``"""
+        return self.request("POST", url, **kwargs)
+
+    def query(
+        self,
+        query: str,
+        endpoint: str = DEFAULT_SPARQL_ENDPOINT,
+        method: str = "GET",
+        timeout: Optional[float] = None,
+        use_cache: bool = True,
+        query_class: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Run a SPARQL query and return the decoded JSON results
+
+        Results come from the cache, if any, keyed by the canonical form of
+        the query; ``query_class`` overrides the class selecting the TTL.
+        Raises ``requests.HTTPError`` for error statuses.
+        """
+
+        def fetch():
+            headers = {"Accept": SPARQL_RESULTS_JSON}
+            if method.upper() == "POST":
+                response = self.post(
+                    endpoint,
+                    headers=headers,
+                    data={"query": query},
+                    timeout=timeout or self.timeout,
+                )
+            else:
+                response = self.get(
+                    endpoint,
+                    headers=headers,
+                    params={"query": query},
+                    timeout=timeout or self.timeout,
+                )
+            response.raise_for_status()
+            return response.json()
+
+        if self.cache is None or not use_cache:
+            return fetch()
+        return self.cache.query(endpoint, query, fetch, query_class)
+
+    def stream_query(
+        self,
+        query: str,
+        endpoint: str = DEFAULT_SPARQL_ENDPOINT,
+        method: str = "GET",
+        timeout: Optional[float] = None,
+        chunk_size: int = 64 * 1024,
+        cache_rows: int = 10_000,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield the bindings of a SPARQL query while the response downloads
+
+        Memory stays flat however large the result set is. A fresh cached
+        result is replayed from the cache; results of at most ``cache_rows``
+        bindings are stored in it once fully read. Raises
+        ``requests.HTTPError`` for error statuses.
+        """
+        key = None
+        if self.cache is not None and cache_rows:
+            key = self.cache.sparql_key(endpoint, query)
+            cached, age = self.cache.get(key)
+            if age is not None and age < 0:
+                self.cache.count("hits")
+                yield from cached.get("results", {}).get("bindings", [])
+                return
+            self.cache.count("misses")
+
+        headers = {"Accept": SPARQL_RESULTS_JSON}
+        if method.upper() == "POST":
+            kwargs = {"data": {"query": query}}
+        else:
+            kwargs = {"params": {"query": query}}
+        response = self.request(
+            method,
+            endpoint,
+            headers=headers,
+            timeout=timeout or self.timeout,
+            stream=True,
+            **kwargs,
+        )
+        try:
+            response.raise_for_status()
+            stream = SparqlResultStream(response.iter_content(chunk_size))
+            kept = [] if key else None
+            for binding in stream:
+                if kept is not None:
+                    kept.append(binding)
+                    if len(kept) > cache_rows:
+                        kept = None
+                yield binding
+            if kept is not None:
+                self.cache.put(
+                    key,
+                    {"head": stream.head or {}, "results": {"bindings": kept}},
+                    classify_query(query),
+                )
+        finally:
+            response.close()
+
+    def get_json(
+        self,
+        url: str,
+        method: str = "GET",
+        use_cache: bool = True,
+        query_class: str = "search",
+        **kwargs,
+    ) -> Any:
+        """Send a request and return its decoded JSON body, like the portal APIs
+
+        Responses come from the cache, if any, keyed by the method, URL,
+        parameters and body. Raises ``requests.HTTPError`` for error statuses.
+        """
+
+        def fetch():
+            response = self.request(method, url, **kwargs)
+            response.raise_for_status()
+            return response.json()
+
+        if self.cache is None or not use_cache:
+            return fetch()
+        key = self.cache.make_key(
+            "json",
+            method.upper(),
+            url,
+            kwargs.get("params"),
+            kwargs.get("data"),
+            kwargs.get("json"),
+        )
+        return self.cache.get_or_fetch(key, fetch, query_class)
+
+    def _record(
+        self, endpoint: str, elapsed_ms: float, response: Optional[requests.Response]
+    ) -> None:
+        """Update the metrics of an endpoint with one request"""
+        with self._lock:
+            metrics = self._metrics.setdefault(
+                endpoint,
+                {
+                    "requests": 0,
+                    "errors": 0,
+                    "statuses": {},
+                    "compressed": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                },
+            )
+            metrics["requests"] += 1
+            metrics["total_ms"] += elapsed_ms
+            metrics["max_ms"] = max(metrics["max_ms"], elapsed_ms)
+            if response is None or response.status_code >= 400:
+                metrics["errors"] += 1
+            if response is not None:
+                status = str(response.status_code)
+                metrics["statuses"][status] = metrics["statuses"].get(status, 0) + 1
+                if response.headers.get("Content-Encoding") in ("gzip", "deflate"):
+                    metrics["compressed"] += 1
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-endpoint request counts, errors, status codes and latency (ms)"""
+        with self._lock:
+            snapshot = {
+                endpoint: dict(values, statuses=dict(values["statuses"]))
+                for endpoint, values in self._metrics.items()
+            }
+        for values in snapshot.values():
+            values["mean_ms"] = values["total_ms"] / values["requests"]
+        return snapshot
+
+    def close(self) -> None:
+        """Close every pooled connection"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+
+# Relative cache paths are resolved against this directory
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_default_client: Optional[SparqlClient] = None
+_default_client_lock = threading.Lock()
+
+
+def get_sparql_client() -> SparqlClient:
+    """Process-wide client, sized by SPARQL_POOL_SIZE and SPARQL_TIMEOUT
+
+    Results are cached in SPARQL_CACHE_PATH (default under CACHE_DIR, an
+    empty value disables the cache), bounded by SPARQL_CACHE_MB. Relative
+    paths are resolved against the repository root, not the working directory
+    """
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            cache_path = os.getenv(
+                "SPARQL_CACHE_PATH",
+                os.path.join(os.getenv("CACHE_DIR", "cache"), "sparql_results.sqlite3"),
+            )
+            cache = None
+            if cache_path:
+                cache = SparqlResultCache(
+                    os.path.join(REPO_ROOT, cache_path),
+                    max_bytes=int(float(os.getenv("SPARQL_CACHE_MB", "256")) * 2**20),
+                )
+            _default_client = SparqlClient(
+                pool_size=int(os.getenv("SPARQL_POOL_SIZE", "10")),
+                timeout=float(os.getenv("SPARQL_TIMEOUT", "30")),
+                cache=cache,
+            )
+        return _default_client
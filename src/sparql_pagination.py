@@ -0,0 +1,289 @@
+"""
+Resumable page-by-page iteration over large SPARQL SELECT results
+"""
+
+import json
+import logging
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+try:
+    from .sparql_cache import SparqlResultCache
+    from .sparql_client import DEFAULT_SPARQL_ENDPOINT, SparqlClient, get_sparql_client
+except ImportError:
+    from sparql_cache import SparqlResultCache
+    from sparql_client import DEFAULT_SPARQL_ENDPOINT, SparqlClient, get_sparql_client
+
+logger = logging.getLogger(__name__)
+
+_SELECT = re.compile(r"\bSELECT\b\s*(?:DISTINCT\b|REDUCED\b)?", re.IGNORECASE)
+_LIMIT_OFFSET = re.compile(r"\b(?:LIMIT|OFFSET)\s+\d+", re.IGNORECASE)
+_ORDER_BY = re.compile(r"\bORDER\s+BY\b", re.IGNORECASE)
+_VARIABLE = re.compile(r"[?$](\w+)")
+_ALIAS = re.compile(r"\bAS\s+[?$](\w+)\s*$", re.IGNORECASE)
+_PROJECTION_TOKEN = re.compile(r"[?$]\w+|\(|\)|\{|\bWHERE\b|[^\s?$(){]+", re.IGNORECASE)
+
+
+class SparqlPaginationError(Exception):
+    pass
+
+
+def projected_variables(query: str) -> List[str]:
+    """Names of the variables a SELECT query projects, empty for ``SELECT *``"""
+    match = _SELECT.search(query)
+    if match is None:
+        raise SparqlPaginationError("Only SELECT queries can be paginated")
+
+    variables, depth, expression = [], 0, ""
+    for token in _PROJECTION_TOKEN.finditer(query, match.end()):
+        text = token.group()
+        if depth == 0 and (text == "{" or text.upper() == "WHERE"):
+            break
+        if text == "(":
+            depth += 1
+        elif text == ")":
+            depth -= 1
+            if depth == 0:
+                # (expression AS ?alias) projects only the alias
+                alias = _ALIAS.search(expression)
+                if alias:
+                    variables.append(alias.group(1))
+                expression = ""
+                continue
+        if depth > 0:
+            expression += " " + text
+        elif _VARIABLE.fullmatch(text):
+            variables.append(text[1:])
+    return variables
+
+
+def paginate_query(
+    query: str,
+    page_size: int,
+    offset: int = 0,
+    order_by: Optional[Sequence[str]] = None,
+    keyset: Optional[str] = None,
+    after: Optional[str] = None,
+) -> str:
+    """Rewrite a SELECT query into one stably ordered page
+
+    Any LIMIT and OFFSET of the query are replaced. With ``keyset`` the
+    page holds the rows whose ``keyset`` variable sorts after ``after``,
+    ordered by that variable; otherwise rows are ordered by ``order_by``
+    (default: every projected variable, a total order) unless the query
+    already has an ORDER BY, and the page starts at ``offset``.
+    """
+    end = query.rfind("}")
+    if end < 0:
+        raise SparqlPaginationError("Query has no WHERE clause")
+    body, tail = query[:end], _LIMIT_OFFSET.sub("", query[end + 1 :]).rstrip()
+
+    if keyset:
+        if _ORDER_BY.search(tail):
+            raise SparqlPaginationError("Keyset pagination replaces ORDER BY")
+        if after is not None:
+            body += f"  FILTER(STR(?{keyset}) > {json.dumps(after)})\n"
+        tail += f"\nORDER BY STR(?{keyset})"
+    elif not _ORDER_BY.search(tail):
+        variables = list(order_by or projected_variables(query))
+        if not variables:
+            raise SparqlPaginationError("SELECT * queries need explicit order_by")
+        tail += "\nORDER BY " + " ".join(f"?{name}" for name in variables)
+
+    page = f"{body}}}{tail}\nLIMIT {page_size}"
+    if offset and not keyset:
+        page += f"\nOFFSET {offset}"
+    return page
+
+
+class SparqlCursor:
+    """Iterate every row of a SELECT query in pages, resumably
+
+    Each page is a separate stably ordered query (see ``paginate_query``),
+    retried on its own with exponential backoff. The next page is fetched
+    in the background while the current one is processed. With a
+    ``checkpoint_path`` the position is saved after every consumed page, so
+    a new cursor over the same query resumes where an interrupted one
+    stopped; the checkpoint is removed once the results are exhausted.
+    """
+
+    def __init__(
+        self,
+        query: str,
+        endpoint: str = DEFAULT_SPARQL_ENDPOINT,
+        page_size: int = 1000,
+        order_by: Optional[Sequence[str]] = None,
+        keyset: Optional[str] = None,
+        max_rows: Optional[int] = None,
+        retries: int = 3,
+        backoff: float = 1.0,
+        prefetch: bool = True,
+        checkpoint_path: Optional[str] = None,
+        client: Optional[SparqlClient] = None,
+        timeout: Optional[float] = None,
+    ):
+        """Prepare a cursor; nothing is fetched before iteration
+
+        ``keyset`` names a variable bound in every row to page by its value
+        instead of by OFFSET, which stays fast deep into large results.
+        Rows sharing one value must fit in a page. Keep ``page_size`` below
+        the row cap of the endpoint, as a short page ends the iteration.
+        """
+        self.query = query
+        self.endpoint = endpoint
+        self.page_size = page_size
+        self.order_by = order_by
+        self.keyset = keyset
+        self.max_rows = max_rows
+        self.retries = retries
+        self.backoff = backoff
+        self.prefetch = prefetch
+        self.checkpoint_path = checkpoint_path
+        self.client = client or get_sparql_client()
+        self.timeout = timeout
+
+        self.fingerprint = SparqlResultCache.make_key(
+            SparqlResultCache.sparql_key(endpoint, query), page_size, keyset, order_by
+        )
+        self.state: Dict[str, Any] = {
+            "offset": 0,
+            "after": None,
+            "pages": 0,
+            "rows": 0,
+            "done": False,
+        }
+        # Caller data saved with every checkpoint, e.g. how much was written
+        self.extra: Dict[str, Any] = {}
+        self._load_checkpoint()
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for page in self.pages():
+            yield from page
+
+    def pages(self) -> Iterator[List[Dict[str, Any]]]:
+        """Yield the bindings page by page, checkpointing after each one"""
+        if self.state["done"]:
+            return
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sparql-page")
+        state = dict(self.state)
+        pending = executor.submit(self._fetch, state)
+        try:
+            while True:
+                rows = pending.result()
+                page, next_state, exhausted = self._advance(state, rows)
+                if not exhausted and self.prefetch:
+                    pending = executor.submit(self._fetch, next_state)
+
+                yield page
+
+                state = self.state = next_state
+                if exhausted:
+                    break
+                self._save_checkpoint()
+                if not self.prefetch:
+                    pending = executor.submit(self._fetch, next_state)
+        finally:
+            pending.cancel()
+            executor.shutdown(wait=False)
+
+        self.state["done"] = True
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
+    def _advance(self, state: Dict[str, Any], rows: List[Dict[str, Any]]):
+        """(page to yield, state after it, whether it is the last page)"""
+        exhausted = len(rows) < self.page_size
+        next_state = dict(state, pages=state["pages"] + 1)
+
+        if self.keyset and not exhausted:
+            # Rows of the last key may continue on the next page: refetch them
+            last = self._key(rows[-1])
+            page = [row for row in rows if self._key(row) != last]
+            if not page:
+                raise SparqlPaginationError(
+                    f"More than {self.page_size} rows share ?{self.keyset} = {last}"
+                )
+            next_state["after"] = self._key(page[-1])
+        else:
+            page = rows
+            next_state["offset"] = state["offset"] + len(rows)
+
+        if self.max_rows is not None and state["rows"] + len(page) >= self.max_rows:
+            page = page[: self.max_rows - state["rows"]]
+            exhausted = True
+        next_state["rows"] = state["rows"] + len(page)
+        return page, next_state, exhausted
+
+    def _key(self, row: Dict[str, Any]) -> str:
+        try:
+            return row[self.keyset]["value"]
+        except KeyError:
+            raise SparqlPaginationError(f"?{self.keyset} is unbound in a row")
+
+    def _fetch(self, state: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Fetch one page, retrying transient failures"""
+        page_query = paginate_query(
+            self.query,
+            self.page_size,
+            offset=state["offset"],
+            order_by=self.order_by,
+            keyset=self.keyset,
+            after=state["after"],
+        )
+        for attempt in range(self.retries + 1):
+            try:
+                results = self.client.query(
+                    page_query, self.endpoint, timeout=self.timeout, use_cache=False
+                )
+                return results.get("results", {}).get("bindings", [])
+            except Exception as e:
+                response = getattr(e, "response", None)
+                status = response.status_code if response is not None else None
+                # Client errors other than rate limiting will not go away
+                if status and 400 <= status < 500 and status != 429:
+                    raise
+                if attempt == self.retries:
+                    raise
+                delay = self.backoff * 2**attempt
+                logger.warning(
+                    f"Page {state['pages'] + 1} failed ({e}), retrying in {delay:g} s"
+                )
+                time.sleep(delay)
+
+    def _load_checkpoint(self) -> None:
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return
+        try:
+            with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            logger.warning(f"Ignoring unreadable checkpoint {self.checkpoint_path}")
+            return
+        if checkpoint.get("fingerprint") != self.fingerprint:
+            logger.info("Checkpoint belongs to another query, starting over")
+            return
+        self.state.update(checkpoint["state"])
+        self.extra = checkpoint.get("extra", {})
+        logger.info(
+            f"Resuming after {self.state['pages']} pages ({self.state['rows']} rows)"
+        )
+
+    def _save_checkpoint(self) -> None:
+        """Write the checkpoint atomically"""
+        if not self.checkpoint_path:
+            return
+        path = Path(self.checkpoint_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix(path.suffix + ".tmp")
+        with open(temporary, "w", encoding="utf-8") as f:
+            checkpoint = {
+                "fingerprint": self.fingerprint,
+                "state": self.state,
+                "extra": self.extra,
+            }
+            json.dump(checkpoint, f)
+        os.replace(temporary, path)
@@ -0,0 +1,160 @@
+"""
+Incremental parser yielding SPARQL JSON result bindings as the body arrives
+"""
+
+import codecs
+import json
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+# Keep at most this many consumed characters before trimming the buffer
+_TRIM_AT = 1 << 16
+# Characters read at least each time the buffer runs out
+_MIN_READ = 1 << 12
+
+
+class SparqlStreamError(Exception):
+    pass
+
+
+class SparqlResultStream:
+    """Iterate the bindings of a SPARQL JSON results body chunk by chunk
+
+    Only the current binding and the unparsed tail of the last chunk are held
+    in memory, so arbitrarily large result sets are processed in flat memory.
+    Members other than ``results.bindings`` are decoded whole; ``head`` and
+    ``vars`` are available once they have been read (usually before the
+    first binding).
+    """
+
+    def __init__(self, chunks: Iterable[Union[bytes, str]]):
+        """Parse the body delivered by ``chunks``, e.g. ``Response.iter_content``"""
+        self.head: Optional[Dict[str, Any]] = None
+        self.boolean: Optional[bool] = None
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    @property
+    def vars(self) -> List[str]:
+        """Variable names from the ``head`` of the results"""
+        return (self.head or {}).get("vars", [])
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        self._expect("{")
+        for key in self._members():
+            if key == "results":
+                self._expect("{")
+                for results_key in self._members():
+                    if results_key == "bindings":
+                        yield from self._array()
+                    else:
+                        self._value()
+            elif key == "head":
+                self.head = self._value()
+            elif key == "boolean":
+                self.boolean = self._value()
+            else:
+                self._value()
+
+    def _members(self) -> Iterator[str]:
+        """Keys of the object being read; the caller consumes each value"""
+        first = True
+        while True:
+            char = self._peek()
+            if char == "}":
+                self._pos += 1
+                return
+            if not first:
+                self._expect(",")
+            key = self._value()
+            if not isinstance(key, str):
+                raise SparqlStreamError(f"Expected an object key, got {key!r}")
+            self._expect(":")
+            first = False
+            yield key
+
+    def _array(self) -> Iterator[Any]:
+        """Elements of an array, decoded one at a time"""
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self._value()
+            char = self._peek()
+            self._pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                raise SparqlStreamError(f"Expected ',' or ']', got {char!r}")
+
+    def _value(self) -> Any:
+        """Decode the next complete JSON value"""
+        while True:
+            self._peek()
+            try:
+                value, end = _DECODER.raw_decode(self._buffer, self._pos)
+                # A number at the end of the buffer may continue in the next chunk
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError as e:
+                if self._eof:
+                    raise SparqlStreamError(f"Invalid SPARQL JSON results: {e}")
+            self._read()
+
+    def _expect(self, char: str) -> None:
+        found = self._peek()
+        if found != char:
+            raise SparqlStreamError(f"Expected {char!r}, got {found!r}")
+        self._pos += 1
+
+    def _peek(self) -> str:
+        """Next non-whitespace character, reading more input as needed"""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if self._eof:
+                raise SparqlStreamError("Unexpected end of SPARQL JSON results")
+            self._read()
+
+    def _read(self) -> None:
+        """Append more input to the buffer, dropping consumed text"""
+        if self._eof:
+            return
+        if self._pos > _TRIM_AT:
+            self._buffer = self._buffer[self._pos :]
+            self._pos = 0
+
+        # Read at least as much as is still unparsed, so that re-decoding a
+        # value split over many small chunks stays linear overall
+        wanted = max(_MIN_READ, len(self._buffer) - self._pos)
+        parts, size = [], 0
+        while size < wanted:
+            try:
+                chunk = next(self._chunks)
+            except StopIteration:
+                self._eof = True
+                parts.append(self._decoder.decode(b"", final=True))
+                break
+            if isinstance(chunk, bytes):
+                chunk = self._decoder.decode(chunk)
+            parts.append(chunk)
+            size += len(chunk)
+        self._buffer += "".join(parts)
+
+
+def iter_bindings(
+    results: Union[Dict[str, Any], Iterable[Dict[str, Any]]],
+) -> Iterator[Dict[str, Any]]:
+    """Bindings of decoded SPARQL JSON results or of a binding stream"""
+    if isinstance(results, dict):
+        return iter(results.get("results", {}).get("bindings", []))
+    return iter(results)
@@ -1,8 +1,8 @@
 import json
 import logging
 import os
-import requests
 import re
+import threading
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
@@ -16,8 +16,10 @@ from langchain_core.messages import HumanMessage, AIMessage
 # Import our RAG system
 try:
     from .rag_system import RAGSystem, QueryExample
+    from .sparql_client import get_sparql_client
 except ImportError:
     from rag_system import RAGSystem, QueryExample
+    from sparql_client import get_sparql_client
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -64,15 +66,9 @@ class UnifiedDataAssistant:
     def execute_sparql_query(self, sparql_query: str) -> Dict[str, Any]:
         """Execute SPARQL query against EU Open Data Portal"""
         try:
-            headers = {"Accept": "application/sparql-results+json"}
-            params = {"query": sparql_query}
-
-            response = requests.get(
-                self.sparql_endpoint, headers=headers, params=params, timeout=30
+            results = get_sparql_client().query(
+                sparql_query, self.sparql_endpoint, timeout=30
             )
-            response.raise_for_status()
-
-            results = response.json()
             result_count = len(results.get("results", {}).get("bindings", []))
 
             self.logger.info(
@@ -94,12 +90,13 @@ class UnifiedDataAssistant:
         try:
             headers = {"Content-Type": "application/json", "Accept": "application/json"}
 
-            response = requests.post(
-                self.api_endpoint, headers=headers, json=search_params, timeout=30
+            results = get_sparql_client().get_json(
+                self.api_endpoint,
+                method="POST",
+                headers=headers,
+                json=search_params,
+                timeout=30,
             )
-            response.raise_for_status()
-
-            results = response.json()
 
             if not results.get("success", True):
                 return {
@@ -130,10 +127,7 @@ class UnifiedDataAssistant:
             url = self.similar_datasets_api.format(dataset_id=dataset_id)
             params = {"locale": "en"}
 
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
-
-            results = response.json()
+            results = get_sparql_client().get_json(url, params=params, timeout=30)
 
             self.logger.info(f"Retrieved similar datasets for {dataset_id}")
             return {
@@ -148,6 +142,19 @@ class UnifiedDataAssistant:
             return {"success": False, "error": str(e), "source": "similar_api"}
 
 
+_assistant: Optional[UnifiedDataAssistant] = None
+_assistant_lock = threading.Lock()
+
+
+def get_unified_assistant() -> UnifiedDataAssistant:
+    """Get the process-wide assistant shared by the agent tools"""
+    global _assistant
+    with _assistant_lock:
+        if _assistant is None:
+            _assistant = UnifiedDataAssistant()
+        return _assistant
+
+
 # Langchain Tools for the Agent
 
 
@@ -157,7 +164,7 @@ def generate_rag_sparql_tool(natural_language_query: str, context: str = "") ->
     Generate SPARQL query using RAG (Retrieval-Augmented Generation).
     Uses similar examples and schema information to create better queries.
     """
-    assistant = UnifiedDataAssistant()
+    assistant = get_unified_assistant()
 
     try:
         # Use RAG system to generate enhanced SPARQL
@@ -182,7 +189,7 @@ def generate_rag_sparql_tool(natural_language_query: str, context: str = "") ->
 @tool
 def execute_sparql_tool(sparql_query: str) -> Dict[str, Any]:
     """Execute SPARQL query against EU Open Data Portal endpoint"""
-    assistant = UnifiedDataAssistant()
+    assistant = get_unified_assistant()
     return assistant.execute_sparql_query(sparql_query)
 
 
@@ -229,7 +236,7 @@ def generate_api_params_tool(natural_language_query: str, context: str = "") ->
 @tool
 def execute_api_search_tool(search_params_json: str) -> Dict[str, Any]:
     """Execute search using EU Open Data Portal API"""
-    assistant = UnifiedDataAssistant()
+    assistant = get_unified_assistant()
 
     try:
         # Parse JSON parameters
@@ -257,7 +264,7 @@ def execute_api_search_tool(search_params_json: str) -> Dict[str, Any]:
 @tool
 def find_similar_datasets_tool(dataset_uri: str) -> Dict[str, Any]:
     """Find datasets similar to a given dataset using the similar datasets API"""
-    assistant = UnifiedDataAssistant()
+    assistant = get_unified_assistant()
 
     try:
         # Extract dataset ID from URI
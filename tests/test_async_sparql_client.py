@@ -0,0 +1,116 @@
+"""Tests for the asyncio SPARQL / Hub-Search client."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from async_sparql_client import AsyncSparqlClient, DeadlineExceeded
+from sparql_client import SparqlClient
+
+RESULTS = {"head": {"vars": ["title"]}, "results": {"bindings": [{"title": {}}]}}
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    """Answers every request after a delay of ``?delay=`` seconds."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        delay = 0.2
+        if "delay=" in self.path:
+            delay = float(self.path.split("delay=", 1)[1].split("&", 1)[0])
+        time.sleep(delay)
+        body = json.dumps(RESULTS).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def endpoint():
+    """Run a local endpoint answering slowly."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/sparql"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client():
+    """Async client over its own pooled client."""
+    client = AsyncSparqlClient(SparqlClient(pool_size=8), max_concurrency=8)
+    yield client
+    client.close()
+
+
+def test_fan_out_takes_as_long_as_the_slowest_call(client, endpoint):
+    """Test concurrent queries, result order and the sync facade."""
+    start = time.perf_counter()
+    results = client.run_all(
+        [client.query(f"SELECT {i}", endpoint=endpoint) for i in range(6)]
+    )
+    elapsed = time.perf_counter() - start
+
+    assert results == [RESULTS] * 6
+    assert elapsed < 0.2 * 3
+
+
+def test_semaphore_bounds_in_flight_calls(client):
+    """Test the per-endpoint concurrency limit."""
+    client.limits["limited"] = 2
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def work():
+        with lock:
+            active.append(1)
+            peak.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.pop()
+        return True
+
+    results = client.run_all([client.call("limited", work) for _ in range(6)])
+
+    assert results == [True] * 6
+    assert max(peak) == 2
+
+
+def test_deadline_exceeded_does_not_lose_other_results(client, endpoint):
+    """Test deadlines and per-call failures in run_all."""
+    slow = client.get(f"{endpoint}?delay=2", deadline=0.3)
+    fast = client.query("SELECT ?s", endpoint=endpoint)
+
+    slow_result, fast_result = client.run_all([slow, fast])
+
+    assert isinstance(slow_result, DeadlineExceeded)
+    assert fast_result == RESULTS
+    assert client.metrics()[endpoint]["deadline_exceeded"] == 1
+    with pytest.raises(DeadlineExceeded):
+        client.run(client.get(f"{endpoint}?delay=2", deadline=0.3))
+
+
+def test_abandoned_calls_keep_their_slot(client):
+    """Test that a call past its deadline holds the semaphore until it ends."""
+    client.limits["limited"] = 1
+    release = threading.Event()
+
+    with pytest.raises(DeadlineExceeded):
+        client.run(client.call("limited", release.wait, deadline=0.1))
+    # The first worker is still running, so the only slot is taken
+    with pytest.raises(DeadlineExceeded):
+        client.run(client.call("limited", lambda: True, deadline=0.1))
+
+    release.set()
+    assert client.run(client.call("limited", lambda: True, deadline=1)) is True
@@ -0,0 +1,74 @@
+"""Tests for micro-batching of embedding requests."""
+
+import threading
+
+import numpy as np
+import pytest
+
+from dcat.embedding.batching import EncodeBatcher
+from dcat.embedding.metrics import Histogram
+
+
+class RecordingEncoder:
+    """Encoder that records the size of every batch it receives."""
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, texts):
+        self.batches.append(len(texts))
+        return np.array([[float(len(text)), 1.0] for text in texts])
+
+
+def test_concurrent_requests_share_batches():
+    """Test that concurrent callers are batched and get their own rows."""
+    encoder = RecordingEncoder()
+    batcher = EncodeBatcher(encoder, max_batch_size=8, max_wait_ms=50)
+    texts = ["a" * (i + 1) for i in range(16)]
+    results = {}
+    start = threading.Barrier(len(texts))
+
+    def search(text):
+        start.wait()
+        results[text] = batcher.encode(text)
+
+    threads = [threading.Thread(target=search, args=(text,)) for text in texts]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.close()
+
+    assert all(results[text][0] == len(text) for text in texts)
+    assert sum(encoder.batches) == 16
+    assert len(encoder.batches) < 16
+    assert max(encoder.batches) <= 8
+
+    stats = batcher.stats()
+    assert stats["batch_size_histogram"]["count"] == len(encoder.batches)
+    assert stats["queue_depth_histogram"]["count"] == 16
+    assert stats["latency"]["encode"]["count"] == len(encoder.batches)
+
+
+def test_encode_errors_reach_every_caller():
+    """Test that a failed batch fails each waiting future."""
+
+    def failing(texts):
+        raise RuntimeError("model unavailable")
+
+    batcher = EncodeBatcher(failing, max_wait_ms=1)
+    with pytest.raises(RuntimeError):
+        batcher.encode("air quality")
+    batcher.close()
+
+
+def test_histogram_buckets_are_cumulative():
+    """Test bucket counts, sum and mean."""
+    histogram = Histogram([1, 4])
+    for value in (1, 2, 3, 10):
+        histogram.observe(value)
+
+    summary = histogram.summary()
+    assert summary["buckets"] == {"le_1": 1, "le_4": 3, "le_inf": 4}
+    assert summary["count"] == 4
+    assert summary["mean"] == pytest.approx(4.0)
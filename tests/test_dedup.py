@@ -0,0 +1,46 @@
+"""Tests for MinHash-LSH near-duplicate detection."""
+
+import numpy as np
+
+from dcat.embedding.dedup import MinHasher, find_near_duplicates, shingles
+
+
+def test_shingles_short_text():
+    """Test that texts shorter than a shingle become a single shingle."""
+    assert shingles("Air quality") == ["air quality"]
+    assert shingles("air quality in Zagreb") == ["air quality in", "quality in zagreb"]
+
+
+def test_signature_estimates_jaccard():
+    """Test that identical texts share a signature and unrelated ones do not."""
+    hasher = MinHasher(num_perm=64)
+    text = "Population of Croatian municipalities by age and sex, census 2021"
+
+    same = hasher.signature(text)
+    assert np.array_equal(same, hasher.signature(text.upper()))
+
+    other = hasher.signature("Street names and squares of the City of Zagreb")
+    assert np.mean(same == other) < 0.2
+
+
+def test_find_near_duplicates_clusters_copies():
+    """Test that yearly copies cluster together and distinct texts stay apart."""
+    base = (
+        "Monthly air quality measurements from monitoring stations in Zagreb "
+        "including PM10, PM2.5, NO2 and ozone concentrations, published by "
+        "the Croatian environment agency"
+    )
+    texts = [
+        base + " for the year 2021",
+        "Street names and squares of the City of Zagreb",
+        base + " for the year 2022",
+        base + " for the year 2021",
+    ]
+
+    clusters = sorted(find_near_duplicates(texts, threshold=0.7))
+    assert clusters == [[0, 2, 3], [1]]
+
+
+def test_find_near_duplicates_empty():
+    """Test clustering no texts."""
+    assert find_near_duplicates([]) == []
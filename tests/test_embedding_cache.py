@@ -0,0 +1,77 @@
+"""Tests for the embedding cache."""
+
+import pytest
+import numpy as np
+import tempfile
+import shutil
+from pathlib import Path
+
+from dcat.embedding.cache import EmbeddingCache
+
+
+@pytest.fixture
+def temp_cache_dir():
+    """Create a temporary directory for the cache file."""
+    temp_dir = tempfile.mkdtemp()
+    yield temp_dir
+    shutil.rmtree(temp_dir)
+
+
+def fake_encode(texts):
+    """Encode texts into deterministic vectors."""
+    return np.array([[len(text), 1.0, 2.0] for text in texts], dtype=np.float32)
+
+
+def test_get_or_encode_counts_hits_and_misses(temp_cache_dir):
+    """Test that only cache misses reach the model."""
+    cache = EmbeddingCache(str(Path(temp_cache_dir) / "cache.sqlite3"))
+    calls = []
+
+    def encode(texts):
+        calls.append(list(texts))
+        return fake_encode(texts)
+
+    first = cache.get_or_encode("model", ["a", "bb"], encode)
+    second = cache.get_or_encode("model", ["a", "bb", "ccc"], encode)
+
+    assert calls == [["a", "bb"], ["ccc"]]
+    np.testing.assert_array_equal(first, second[:2])
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 3
+
+
+def test_cache_is_keyed_by_model(temp_cache_dir):
+    """Test that the same text is cached separately per model."""
+    cache = EmbeddingCache(str(Path(temp_cache_dir) / "cache.sqlite3"))
+    cache.put_many("model-a", ["text"], fake_encode(["text"]))
+
+    assert cache.get_many("model-b", ["text"]) == [None]
+    assert cache.get_many("model-a", ["text"])[0] is not None
+
+
+def test_cache_persists_and_evicts_lru(temp_cache_dir):
+    """Test persistence across instances and LRU eviction."""
+    path = str(Path(temp_cache_dir) / "cache.sqlite3")
+    cache = EmbeddingCache(path, max_entries=2)
+    cache.put_many("model", ["a", "b"], fake_encode(["a", "b"]))
+    cache.get_many("model", ["a"])
+    cache.put_many("model", ["c"], fake_encode(["c"]))
+    cache.close()
+
+    reopened = EmbeddingCache(path, max_entries=2)
+    assert reopened.stats()["entries"] == 2
+    assert reopened.get_many("model", ["b"]) == [None]
+    assert reopened.get_many("model", ["a"])[0] is not None
+
+
+def test_lookups_do_not_write(temp_cache_dir):
+    """Test that hits defer their LRU updates and puts keep the entry count."""
+    cache = EmbeddingCache(str(Path(temp_cache_dir) / "cache.sqlite3"))
+    cache.put_many("model", ["a", "b"], fake_encode(["a", "b"]))
+    changes = cache._conn.total_changes
+
+    cache.get_many("model", ["a", "b"])
+    assert cache._conn.total_changes == changes
+
+    cache.put_many("model", ["a", "c", "c"], fake_encode(["a", "c", "c"]))
+    assert cache.stats()["entries"] == 3
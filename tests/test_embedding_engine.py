@@ -1,21 +1,29 @@
 """Tests for the embedding engine."""
 
+import json
+import multiprocessing
+import os
+import signal
 import pytest
 import numpy as np
+from dataclasses import replace
 from datetime import datetime
 from pathlib import Path
 import tempfile
 import shutil
 
 from dcat.metadata.base import (
-    DCATDataset,
+    DCATAgent,
     DCATCatalog,
+    DCATDataset,
     DCATDistribution,
     DCATIdentifier,
-    DCATPublisher,
-    LangString,
+    DCATProperty,
 )
+from dcat.embedding.backends import saved_collection_version
 from dcat.embedding.engine import EmbeddingEngine
+from dcat.embedding.migration import EmbeddingMigration
+from dcat.embedding.pool import EmbeddingPoolError, parallel_encode
 
 
 @pytest.fixture
@@ -32,22 +40,22 @@ def sample_dataset():
     return DCATDataset(
         identifier=DCATIdentifier(id="test-dataset-1", source_id="test-source"),
         title={
-            "en": LangString("Test Dataset 1"),
-            "hr": LangString("Testni Skup Podataka 1"),
+            "en": DCATProperty("Test Dataset 1"),
+            "hr": DCATProperty("Testni Skup Podataka 1"),
         },
         description={
-            "en": LangString("A dataset about air quality measurements."),
-            "hr": LangString("Skup podataka o mjerenjima kvalitete zraka."),
+            "en": DCATProperty("A dataset about air quality measurements."),
+            "hr": DCATProperty("Skup podataka o mjerenjima kvalitete zraka."),
         },
         keywords=[
-            LangString("air quality"),
-            LangString("environment"),
-            LangString("measurements"),
+            DCATProperty("air quality"),
+            DCATProperty("environment"),
+            DCATProperty("measurements"),
         ],
-        themes=[LangString("environment"), LangString("science")],
-        publisher=DCATPublisher(name={"en": LangString("Test Organization")}),
+        themes=[DCATProperty("environment"), DCATProperty("science")],
+        publisher=DCATAgent(name={"en": DCATProperty("Test Organization")}),
         distributions=[
-            DCATDistribution(format="CSV", url="http://example.com/data.csv")
+            DCATDistribution(format="CSV", access_url="http://example.com/data.csv")
         ],
         issued=datetime.now(),
         modified=datetime.now(),
@@ -59,8 +67,8 @@ def sample_catalog(sample_dataset):
     """Create a sample catalog for testing."""
     return DCATCatalog(
         identifier=DCATIdentifier(id="test-catalog", source_id="test-source"),
-        title={"en": LangString("Test Catalog")},
-        description={"en": LangString("A test catalog")},
+        title={"en": DCATProperty("Test Catalog")},
+        description={"en": DCATProperty("A test catalog")},
         datasets=[sample_dataset],
     )
 
@@ -101,13 +109,13 @@ def test_add_and_find_similar_datasets(temp_vector_store, sample_dataset):
     # Create a similar dataset
     similar_dataset = DCATDataset(
         identifier=DCATIdentifier(id="test-dataset-2", source_id="test-source"),
-        title={"en": LangString("Test Dataset 2")},
+        title={"en": DCATProperty("Test Dataset 2")},
         description={
-            "en": LangString(
+            "en": DCATProperty(
                 "Another dataset about environmental measurements and air quality."
             )
         },
-        keywords=[LangString("air quality"), LangString("environment")],
+        keywords=[DCATProperty("air quality"), DCATProperty("environment")],
     )
 
     # Add both datasets
@@ -154,7 +162,7 @@ def test_update_dataset(temp_vector_store, sample_dataset):
 
     # Update dataset with new description
     updated_dataset = sample_dataset
-    updated_dataset.description["en"] = LangString(
+    updated_dataset.description["en"] = DCATProperty(
         "Updated description about air quality."
     )
     engine.update_dataset(updated_dataset)
@@ -163,3 +171,335 @@ def test_update_dataset(temp_vector_store, sample_dataset):
     results = engine.semantic_search("Updated description", n_results=1)
     assert len(results) == 1
     assert results[0][0] == "test-dataset-1"
+
+
+def test_saved_vector_index_reused_until_written(temp_vector_store, sample_catalog):
+    """Test that process_catalog saves the index and later writes make it stale."""
+    engine = EmbeddingEngine(
+        persist_directory=temp_vector_store, vector_backend="numpy"
+    )
+    engine.process_catalog(sample_catalog)
+    assert saved_collection_version(engine.vector_index_directory) == (
+        engine.collection_version
+    )
+
+    reopened = EmbeddingEngine(
+        persist_directory=temp_vector_store, vector_backend="numpy"
+    )
+    # Loaded from disk rather than rebuilt
+    assert isinstance(reopened.vector_index._vectors, np.memmap)
+
+    dataset = sample_catalog.datasets[0]
+    dataset.description["en"] = DCATProperty("Noise levels near airports.")
+    reopened.update_dataset(dataset)
+
+    restarted = EmbeddingEngine(
+        persist_directory=temp_vector_store, vector_backend="numpy"
+    )
+    np.testing.assert_allclose(
+        restarted.vector_index.reconstruct("test-dataset-1"),
+        reopened.embed_dataset(dataset),
+        atol=1e-6,
+    )
+
+
+def test_untrained_index_defers_to_collection(temp_vector_store, sample_dataset):
+    """Test that writes before IVF-PQ training succeed and search falls back."""
+    engine = EmbeddingEngine(
+        persist_directory=temp_vector_store, vector_backend="ivfpq"
+    )
+    engine.add_dataset(sample_dataset)
+
+    assert not engine.vector_index.is_trained
+    assert engine.collection.count() == 1
+    nearest = engine._query_nearest(engine.embed_dataset(sample_dataset), 1)
+    assert nearest[0][0] == "test-dataset-1"
+
+
+def test_ingest_datasets_batched(temp_vector_store, sample_dataset):
+    """Test batched ingestion adds new datasets and updates existing ones."""
+    engine = EmbeddingEngine(persist_directory=temp_vector_store)
+    other_dataset = DCATDataset(
+        identifier=DCATIdentifier(id="test-dataset-2", source_id="test-source"),
+        title={"en": DCATProperty("Test Dataset 2")},
+        description={"en": DCATProperty("Water quality measurements in rivers.")},
+    )
+
+    engine.add_dataset(sample_dataset)
+    stats = engine.ingest_datasets(
+        [sample_dataset, other_dataset], batch_size=1, upsert_batch_size=1
+    )
+
+    assert stats["processed"] == 2
+    assert stats["added"] == 1
+    assert stats["updated"] == 1
+    assert stats["failed"] == 0
+    assert stats["datasets_per_second"] > 0
+    assert engine.collection.count() == 2
+
+
+def test_reindex_with_worker_pool(temp_vector_store, sample_dataset):
+    """Test re-embedding the collection in worker processes."""
+    engine = EmbeddingEngine(persist_directory=temp_vector_store)
+    engine.add_dataset(sample_dataset)
+    stored = engine.collection.get(ids=["test-dataset-1"], include=["embeddings"])
+
+    stats = engine.reindex(n_workers=2, batch_size=1)
+
+    assert stats["processed"] == 1
+    assert stats["failed"] == 0
+    reindexed = engine.collection.get(ids=["test-dataset-1"], include=["embeddings"])
+    np.testing.assert_allclose(
+        reindexed["embeddings"][0], stored["embeddings"][0], atol=1e-5
+    )
+
+
+def test_worker_pool_raises_when_a_worker_dies():
+    """Test that killed encoder processes fail the run instead of hanging it."""
+    records = [(f"d{i}", f"text {i}", {}) for i in range(50)]
+
+    def kill_workers(ids, texts, embeddings, metadatas):
+        for worker in multiprocessing.active_children():
+            if worker.name.startswith("embedding-worker"):
+                os.kill(worker.pid, signal.SIGKILL)
+
+    with pytest.raises(EmbeddingPoolError, match="exited with code"):
+        parallel_encode(
+            records,
+            "all-MiniLM-L6-v2",
+            kill_workers,
+            n_workers=2,
+            batch_size=1,
+            poll_interval=0.1,
+        )
+
+
+def test_hybrid_search_matches_exact_codes(temp_vector_store, sample_dataset):
+    """Test that BM25 fusion surfaces datasets matching exact codes."""
+    engine = EmbeddingEngine(persist_directory=temp_vector_store)
+    streets = DCATDataset(
+        identifier=DCATIdentifier(id="streets", source_id="test-source"),
+        title={"en": DCATProperty("Ulice Grada Zagreba")},
+        description={"en": DCATProperty("Street register for NUTS region HR041.")},
+    )
+    engine.add_dataset(sample_dataset)
+    engine.add_dataset(streets)
+
+    results = engine.hybrid_search("HR041", n_results=2)
+
+    assert results[0][0] == "streets"
+    assert Path(engine.lexical_index_path).exists()
+    metrics = engine.retrieval_metrics.summary()
+    assert {"dense", "lexical", "hybrid"} <= set(metrics)
+
+
+def test_saved_lexical_index_stale_after_writes(temp_vector_store, sample_dataset):
+    """Test that a BM25 file saved before later writes is rebuilt on load."""
+    engine = EmbeddingEngine(persist_directory=temp_vector_store)
+    engine.add_dataset(sample_dataset)
+    engine.save_lexical_index()
+
+    # Same document count as the saved copy, different text
+    sample_dataset.description["en"] = DCATProperty("Street register HR041.")
+    engine.update_dataset(sample_dataset)
+
+    reopened = EmbeddingEngine(persist_directory=temp_vector_store)
+    assert reopened.lexical_index.search("HR041", k=1)[0][0] == "test-dataset-1"
+
+
+def test_process_catalog_defers_lexical_index(temp_vector_store, sample_catalog):
+    """Test that ingestion leaves the BM25 index to the next hybrid search."""
+    engine = EmbeddingEngine(persist_directory=temp_vector_store)
+    engine.process_catalog(sample_catalog)
+    assert not os.path.exists(engine.lexical_index_path)
+
+    dataset_id = str(sample_catalog.datasets[0].identifier.id)
+    assert engine.lexical_index.search("air quality", k=1)[0][0] == dataset_id
+    assert os.path.exists(engine.lexical_index_path)
+
+
+def test_semantic_search_with_filters(temp_vector_store, sample_dataset):
+    """Test that filters restrict which datasets are scored."""
+    engine = EmbeddingEngine(persist_directory=temp_vector_store)
+    other_dataset = DCATDataset(
+        identifier=DCATIdentifier(id="test-dataset-2", source_id="test-source"),
+        title={"en": DCATProperty("Air Quality Readings")},
+        description={"en": DCATProperty("Air quality measurements in cities.")},
+        themes=[DCATProperty("health")],
+    )
+    engine.add_dataset(sample_dataset)
+    engine.add_dataset(other_dataset)
+
+    results = engine.semantic_search(
+        "air quality", n_results=5, min_similarity=-1.0, filters={"theme": "health"}
+    )
+
+    assert [doc_id for doc_id, _, _ in results] == ["test-dataset-2"]
+
+
+def test_semantic_search_cache_invalidated_by_writes(temp_vector_store, sample_dataset):
+    """Test that cached results are reused until the collection changes."""
+    engine = EmbeddingEngine(persist_directory=temp_vector_store)
+    engine.add_dataset(sample_dataset)
+
+    first = engine.semantic_search("air quality", min_similarity=-1.0)
+    second = engine.semantic_search("Air  Quality", min_similarity=-1.0)
+    assert first == second
+    assert engine.result_cache.stats()["hits"] == 1
+
+    other_dataset = DCATDataset(
+        identifier=DCATIdentifier(id="test-dataset-2", source_id="test-source"),
+        title={"en": DCATProperty("Air Quality Readings")},
+        description={"en": DCATProperty("Air quality measurements in cities.")},
+    )
+    engine.add_dataset(other_dataset)
+
+    third = engine.semantic_search("air quality", min_similarity=-1.0)
+    assert len(third) == 2
+
+
+def test_migration_resumes_and_swaps(temp_vector_store, sample_dataset):
+    """Test a paused migration resuming from its checkpoint and swapping."""
+    engine = EmbeddingEngine(persist_directory=temp_vector_store)
+    engine.add_dataset(sample_dataset)
+    serving = engine._serving
+
+    migration = engine.start_migration("all-MiniLM-L6-v2", batch_size=1)
+    migration.stop()
+    if migration.progress()["status"] != "swapped":
+        migration = engine.start_migration("all-MiniLM-L6-v2", batch_size=1)
+        migration.start().join()
+
+    progress = migration.progress()
+    assert progress["status"] == "swapped"
+    assert progress["processed"] == 1
+    assert engine.collection.name == "dcat_embeddings__v1"
+    # The swap replaces the serving state instead of mutating it
+    assert serving.collection.name == "dcat_embeddings"
+    assert engine.semantic_search("air quality", min_similarity=-1.0)
+
+    reopened = EmbeddingEngine(persist_directory=temp_vector_store)
+    assert reopened.collection.name == "dcat_embeddings__v1"
+
+
+def test_migration_mirrors_writes_until_swap(temp_vector_store, sample_dataset):
+    """Test that updates and deletes during catch-up reach the new collection."""
+    engine = EmbeddingEngine(persist_directory=temp_vector_store)
+    other_dataset = replace(
+        sample_dataset,
+        identifier=DCATIdentifier(id="test-dataset-2", source_id="test-source"),
+    )
+    engine.ingest_datasets([sample_dataset, other_dataset])
+
+    migration = engine.migration = EmbeddingMigration(
+        engine.chroma_client,
+        temp_vector_store,
+        engine.collection_name,
+        "all-MiniLM-L6-v2",
+        on_swap=engine._switch_collection,
+    )
+    migration._copy(["test-dataset-1", "test-dataset-2"])
+    migration._checkpoint(status="catching_up", offset=2)
+
+    sample_dataset.description["en"] = DCATProperty("Noise levels near airports.")
+    engine.update_dataset(sample_dataset)
+    engine.delete_datasets(["test-dataset-2"])
+    assert migration.target.get(include=[])["ids"] == ["test-dataset-1"]
+
+    # A write no migration saw is found by comparing the copies
+    engine.collection.update(
+        ids=["test-dataset-1"],
+        documents=["Changed offline"],
+        embeddings=[engine.embed_dataset(sample_dataset).tolist()],
+    )
+    migration.run()
+
+    assert engine.collection.name == migration.state["target"]
+    assert engine.collection.get(ids=["test-dataset-1"])["documents"] == [
+        "Changed offline"
+    ]
+
+
+def test_migration_copy_keeps_metadata_next_to_records_without(
+    temp_vector_store, sample_dataset
+):
+    """Test that a record without metadata does not drop its batch's metadata."""
+    engine = EmbeddingEngine(persist_directory=temp_vector_store)
+    engine.add_dataset(sample_dataset)
+    engine.collection.add(
+        ids=["bare"],
+        documents=["No metadata"],
+        embeddings=[engine.embed_dataset(sample_dataset).tolist()],
+    )
+
+    migration = EmbeddingMigration(
+        engine.chroma_client,
+        temp_vector_store,
+        engine.collection_name,
+        "all-MiniLM-L6-v2",
+    )
+    migration._copy(["test-dataset-1", "bare"])
+
+    copied = migration.target.get(ids=["test-dataset-1", "bare"])
+    metadatas = dict(zip(copied["ids"], copied["metadatas"]))
+    source = engine.collection.get(ids=["test-dataset-1"])["metadatas"][0]
+    assert metadatas["test-dataset-1"] == source
+    assert not metadatas["bare"]
+
+
+def test_process_catalog_collapses_near_duplicates(temp_vector_store, sample_catalog):
+    """Test that near-identical datasets are stored once with member ids."""
+    sample_dataset = sample_catalog.datasets[0]
+    older_copy = replace(
+        sample_dataset,
+        identifier=DCATIdentifier(id="test-dataset-1-2019", source_id="test-source"),
+        modified=datetime(2019, 1, 1),
+    )
+    other_dataset = replace(
+        sample_dataset,
+        identifier=DCATIdentifier(id="test-dataset-2", source_id="test-source"),
+        title={"en": DCATProperty("Street Names")},
+        description={"en": DCATProperty("Names of streets and squares in Zagreb.")},
+        keywords=[DCATProperty("streets")],
+    )
+    sample_catalog.datasets = [older_copy, sample_dataset, other_dataset]
+
+    engine = EmbeddingEngine(persist_directory=temp_vector_store)
+    engine.add_dataset(older_copy)
+    stats = engine.process_catalog(sample_catalog, deduplicate=True)
+
+    assert stats["duplicates"] == 1
+    assert engine.collection.count() == 2
+    stored = engine.collection.get(ids=["test-dataset-1"], include=["metadatas"])
+    metadata = stored["metadatas"][0]
+    assert json.loads(metadata["duplicate_ids"]) == ["test-dataset-1-2019"]
+    assert metadata["duplicate_count"] == 1
+    # Only the stored representatives are compared with each other
+    assert not older_copy.similarity_scores
+    assert "test-dataset-1-2019" not in sample_dataset.similarity_scores
+
+
+def test_semantic_search_many(temp_vector_store, sample_dataset):
+    """Test batched searches match single searches and are fused."""
+    engine = EmbeddingEngine(persist_directory=temp_vector_store)
+    engine.add_dataset(sample_dataset)
+    engine.add_dataset(
+        DCATDataset(
+            identifier=DCATIdentifier(id="test-dataset-2", source_id="test-source"),
+            title={"en": DCATProperty("Street Names")},
+            description={"en": DCATProperty("Names of streets in Zagreb.")},
+        )
+    )
+    queries = ["air quality", "street names"]
+
+    per_query, fused = engine.semantic_search_many(
+        queries, n_results=2, min_similarity=-1.0
+    )
+
+    assert len(per_query) == 2
+    assert per_query[0][0][0] == "test-dataset-1"
+    assert per_query[1][0][0] == "test-dataset-2"
+    single = engine.semantic_search("street names", n_results=2, min_similarity=-1.0)
+    assert [doc_id for doc_id, _, _ in single] == [r[0] for r in per_query[1]]
+    assert {doc_id for doc_id, _, _ in fused} == {"test-dataset-1", "test-dataset-2"}
+    assert engine.semantic_search_many([]) == ([], [])
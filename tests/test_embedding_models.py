@@ -0,0 +1,57 @@
+"""Tests for the shared embedding model registry."""
+
+import threading
+
+import numpy as np
+
+from dcat.embedding import models
+from dcat.embedding.models import ModelRegistry
+
+
+class FakeTransformer:
+    """Stand-in for SentenceTransformer that counts loads."""
+
+    loads = 0
+
+    def __init__(self, model_name):
+        FakeTransformer.loads += 1
+        self.model_name = model_name
+
+    def encode(self, texts, **kwargs):
+        return np.ones((len(texts), 3), dtype=np.float32)
+
+    def get_sentence_embedding_dimension(self):
+        return 3
+
+
+def test_models_load_once_on_first_use(monkeypatch):
+    """Test that handles are shared and the weights load lazily, once."""
+    monkeypatch.setattr(models, "SentenceTransformer", FakeTransformer)
+    FakeTransformer.loads = 0
+    registry = ModelRegistry()
+
+    first = registry.get("model")
+    second = registry.get("model")
+    assert first is second
+    assert not first.is_loaded
+
+    threads = [threading.Thread(target=first.encode, args=(["a"],)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert FakeTransformer.loads == 1
+    assert second.get_sentence_embedding_dimension() == 3
+
+
+def test_warmup_in_background(monkeypatch):
+    """Test that warm-up loads models in a background thread."""
+    monkeypatch.setattr(models, "SentenceTransformer", FakeTransformer)
+    registry = ModelRegistry()
+
+    thread = registry.warmup(["model-a", "model-b"])
+    thread.join()
+
+    assert registry.is_loaded("model-a")
+    assert registry.is_loaded("model-b")
@@ -0,0 +1,42 @@
+"""Tests for search filter pushdown."""
+
+from datetime import datetime
+
+import pytest
+
+from dcat.embedding.filters import build_where, facet_key
+
+
+def test_build_where_translates_filters():
+    """Test translating facet, publisher and date filters."""
+    where = build_where(
+        {
+            "themes": ["Environment", "Health"],
+            "format": "CSV",
+            "publisher": "Eurostat",
+            "modified_after": "2023-01-01",
+        }
+    )
+
+    assert where == {
+        "$and": [
+            {"$or": [{"theme:environment": True}, {"theme:health": True}]},
+            {"format:csv": True},
+            {"publisher": "Eurostat"},
+            {"modified_ts": {"$gte": datetime(2023, 1, 1).timestamp()}},
+        ]
+    }
+
+
+def test_build_where_single_and_empty_filters():
+    """Test that single conditions are not wrapped and empty filters vanish."""
+    assert build_where({"source_id": ["a", "b"]}) == {"source_id": {"$in": ["a", "b"]}}
+    assert build_where({"theme": [], "publisher": None}) is None
+    assert build_where(None) is None
+    assert facet_key("format", " JSON ") == "format:json"
+
+
+def test_build_where_rejects_unknown_filters():
+    """Test that unknown keys raise instead of matching nothing."""
+    with pytest.raises(ValueError, match="colour"):
+        build_where({"colour": "red"})
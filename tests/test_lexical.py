@@ -0,0 +1,73 @@
+"""Tests for the BM25 index and rank fusion."""
+
+import tempfile
+import shutil
+from pathlib import Path
+
+import pytest
+
+from dcat.embedding.lexical import BM25Index, reciprocal_rank_fusion, tokenize
+
+
+@pytest.fixture
+def temp_index_dir():
+    """Create a temporary directory for the index file."""
+    temp_dir = tempfile.mkdtemp()
+    yield temp_dir
+    shutil.rmtree(temp_dir)
+
+
+@pytest.fixture
+def index():
+    """Create an index over a few dataset descriptions."""
+    index = BM25Index()
+    index.add(
+        ["streets", "air", "water"],
+        [
+            "Ulice Grada Zagreba, street names in Zagreb (NUTS HR041)",
+            "Air quality measurements in European cities",
+            "Water quality measurements in Croatian rivers",
+        ],
+    )
+    return index
+
+
+def test_tokenize_keeps_codes_and_diacritics():
+    """Test that codes and non-ASCII words stay single tokens."""
+    assert tokenize("NUTS HR041, Čakovec") == ["nuts", "hr041", "čakovec"]
+
+
+def test_search_ranks_rare_terms(index):
+    """Test that exact codes and shared terms are ranked by BM25."""
+    assert index.search("HR041", k=1)[0][0] == "streets"
+
+    results = [doc_id for doc_id, _ in index.search("air quality", k=3)]
+    assert results[0] == "air"
+    assert "water" in results
+    assert "streets" not in results
+
+
+def test_replace_remove_and_persist(index, temp_index_dir):
+    """Test updating, removing and reloading documents."""
+    index.add(["air"], ["Noise levels near airports"])
+    assert index.search("air quality", k=1)[0][0] == "water"
+
+    index.remove(["water"])
+    assert index.search("water", k=3) == []
+
+    path = str(Path(temp_index_dir) / "bm25.json")
+    index.version = 3
+    index.save(path)
+    loaded = BM25Index.load(path)
+    assert len(loaded) == 2
+    assert loaded.version == 3
+    assert loaded.search("noise", k=1) == index.search("noise", k=1)
+
+
+def test_reciprocal_rank_fusion():
+    """Test that ids ranked by both retrievers come first."""
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["c", "b", "d"]])
+    scores = dict(fused)
+    assert {doc_id for doc_id, _ in fused[:2]} == {"b", "c"}
+    assert scores["b"] == pytest.approx(1 / 62 + 1 / 62)
+    assert scores["a"] == pytest.approx(1 / 61)
@@ -8,10 +8,7 @@ from dcat.metadata.base import (
     DCATDataset,
     DCATCatalog,
     DCATIdentifier,
-    DCATPublisher,
-    LangString,
-    TemporalCoverage,
-    SpatialCoverage,
+    DCATProperty,
 )
 from dcat.semantic.analyzer import SemanticAnalyzer, SemanticRelation
 from dcat.assistant.llm_assistant import (
@@ -26,6 +23,8 @@ from dcat.assistant.llm_assistant import (
 def mock_semantic_analyzer():
     """Create a mock semantic analyzer."""
     analyzer = Mock(spec=SemanticAnalyzer)
+    # Set in __init__, so not part of the spec
+    analyzer.embedding_engine = Mock()
 
     # Mock semantic search results
     analyzer.embedding_engine.semantic_search.return_value = [
@@ -60,13 +59,14 @@ def test_dataset():
     """Create a test dataset."""
     return DCATDataset(
         identifier=DCATIdentifier(id="test-dataset", source_id="test-source"),
-        title={"en": LangString("Test Dataset")},
-        description={"en": LangString("A dataset for testing")},
-        keywords=[LangString("test"), LangString("data")],
-        themes=[LangString("testing")],
-        temporal_coverage=TemporalCoverage(
-            start_date=datetime(2023, 1, 1), end_date=datetime(2023, 12, 31)
-        ),
+        title={"en": DCATProperty("Test Dataset")},
+        description={"en": DCATProperty("A dataset for testing")},
+        keywords=[DCATProperty("test"), DCATProperty("data")],
+        themes=[DCATProperty("testing")],
+        temporal_coverage={
+            "start_date": datetime(2023, 1, 1),
+            "end_date": datetime(2023, 12, 31),
+        },
     )
 
 
@@ -137,6 +137,11 @@ def test_suggest_datasets(assistant, mock_semantic_analyzer):
         assert suggestion.relevance_score > 0
         assert suggestion.explanation != ""
 
+    # Filters are pushed down into the vector query
+    mock_semantic_analyzer.embedding_engine.semantic_search.assert_called_once_with(
+        "Find test data", n_results=5, filters={"theme": ["testing"]}
+    )
+
 
 def test_analyze_metadata(assistant, test_dataset, mock_semantic_analyzer):
     """Test metadata analysis."""
@@ -171,7 +176,7 @@ def test_metadata_quality_analysis(assistant, test_dataset):
     incomplete_dataset = DCATDataset(
         identifier=DCATIdentifier(id="incomplete", source_id="test"),
         title={},  # Missing title
-        description={"en": LangString("Test")},
+        description={"en": DCATProperty("Test")},
     )
 
     quality_insight = assistant._analyze_metadata_quality(incomplete_dataset)
@@ -211,8 +216,8 @@ def test_coverage_analysis(assistant, test_dataset):
     # Test with missing coverage
     incomplete_dataset = DCATDataset(
         identifier=DCATIdentifier(id="incomplete", source_id="test"),
-        title={"en": LangString("Test")},
-        description={"en": LangString("Test")},
+        title={"en": DCATProperty("Test")},
+        description={"en": DCATProperty("Test")},
         temporal_coverage=None,  # Missing temporal coverage
     )
 
@@ -220,29 +225,3 @@ def test_coverage_analysis(assistant, test_dataset):
     assert coverage_insight is not None
     assert coverage_insight.insight_type == "coverage"
     assert "temporal coverage" in coverage_insight.description.lower()
-
-
-def test_filter_application(assistant):
-    """Test filter application to candidates."""
-    candidates = [
-        ("dataset-1", 0.9, {"theme": "testing", "format": "CSV"}),
-        ("dataset-2", 0.8, {"theme": "analysis", "format": "JSON"}),
-        ("dataset-3", 0.7, {"theme": "testing", "format": "XML"}),
-    ]
-
-    # Test theme filter
-    filtered = assistant._apply_filters(candidates, filters={"theme": "testing"})
-    assert len(filtered) == 2
-    assert all(c[2]["theme"] == "testing" for c in filtered)
-
-    # Test format filter
-    filtered = assistant._apply_filters(candidates, filters={"format": "CSV"})
-    assert len(filtered) == 1
-    assert filtered[0][0] == "dataset-1"
-
-    # Test multiple filters
-    filtered = assistant._apply_filters(
-        candidates, filters={"theme": "testing", "format": "CSV"}
-    )
-    assert len(filtered) == 1
-    assert filtered[0][0] == "dataset-1"
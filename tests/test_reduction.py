@@ -0,0 +1,84 @@
+"""Tests for dimensionality reduction of stored embeddings."""
+
+import pytest
+import numpy as np
+import tempfile
+import shutil
+
+from dcat.embedding.backends import load_vector_index
+from dcat.embedding.exact import NumpyIndex
+from dcat.embedding.index import VectorIndexError
+from dcat.embedding.reduction import (
+    PCAReducer,
+    ReducedIndex,
+    TruncationReducer,
+    dimension_report,
+)
+
+
+@pytest.fixture
+def temp_index_dir():
+    """Create a temporary directory for index files."""
+    temp_dir = tempfile.mkdtemp()
+    yield temp_dir
+    shutil.rmtree(temp_dir)
+
+
+@pytest.fixture
+def vectors():
+    """Create normalized vectors whose variance lies in a few directions."""
+    rng = np.random.default_rng(7)
+    latent = rng.normal(size=(400, 8))
+    mixing = rng.normal(size=(8, 32))
+    data = latent @ mixing + 0.01 * rng.normal(size=(400, 32))
+    data = data.astype(np.float32)
+    return data / np.linalg.norm(data, axis=1, keepdims=True)
+
+
+def test_pca_keeps_neighbours(vectors):
+    """Test that PCA to the latent dimension preserves distances."""
+    reducer = PCAReducer(32, 8).fit(vectors)
+    reduced = reducer.transform(vectors)
+
+    assert reduced.shape == (400, 8)
+    assert reducer.explained_variance_ratio.sum() > 0.99
+    full = np.sum((vectors[0] - vectors[1:]) ** 2, axis=1)
+    projected = np.sum((reduced[0] - reduced[1:]) ** 2, axis=1)
+    np.testing.assert_allclose(projected, full, atol=1e-2)
+
+
+def test_truncation_normalizes():
+    """Test that truncated vectors are unit length."""
+    reducer = TruncationReducer(4, 2)
+    reduced = reducer.transform(np.array([3.0, 4.0, 1.0, 1.0]))
+    np.testing.assert_allclose(reduced, [[0.6, 0.8]], rtol=1e-6)
+
+    with pytest.raises(VectorIndexError):
+        TruncationReducer(4, 8)
+
+
+def test_reduced_index_search_save_load(vectors, temp_index_dir):
+    """Test that queries are projected and the reducer is persisted."""
+    ids = [f"dataset-{i}" for i in range(len(vectors))]
+    index = ReducedIndex(NumpyIndex(dim=8), PCAReducer(32, 8))
+    assert not index.is_trained
+
+    index.train(vectors)
+    index.add(ids, vectors)
+    assert index.search(vectors[5], k=1)[0][0] == "dataset-5"
+
+    index.save(temp_index_dir)
+    loaded = load_vector_index(temp_index_dir)
+    assert isinstance(loaded, ReducedIndex)
+    assert loaded.dim == 32
+    assert loaded.search(vectors[5], k=1)[0][0] == "dataset-5"
+
+
+def test_dimension_report(vectors):
+    """Test that the report covers every dimension up to the full one."""
+    report = dimension_report(vectors[50:], vectors[:50], dims=(2, 8), k=5)
+
+    assert [row["dim"] for row in report] == [2, 8, 32]
+    assert report[-1]["recall"] == pytest.approx(1.0)
+    assert report[1]["recall"] > report[0]["recall"]
+    assert report[0]["bytes_per_vector"] == 8
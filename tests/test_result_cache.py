@@ -0,0 +1,47 @@
+"""Tests for the search result cache."""
+
+import time
+
+from dcat.embedding.result_cache import SearchResultCache
+
+
+def test_keys_normalize_query_and_include_version():
+    """Test that spelling variants share a key and versions do not."""
+    make_key = SearchResultCache.make_key
+    key = make_key("search", "Air  Quality Germany", 1, n_results=5)
+
+    assert key == make_key("search", "air quality germany ", 1, n_results=5)
+    assert key != make_key("search", "air quality germany", 2, n_results=5)
+    assert key != make_key("search", "air quality germany", 1, n_results=10)
+    assert make_key("search", "q", 1, filters={"a": 1, "b": 2}) == make_key(
+        "search", "q", 1, filters={"b": 2, "a": 1}
+    )
+
+
+def test_lru_and_ttl_bounds():
+    """Test eviction of least recently used and expired entries."""
+    cache = SearchResultCache(max_entries=2, ttl_seconds=0.05)
+    cache.put("a", [1])
+    cache.put("b", [2])
+    assert cache.get("a") == [1]
+
+    cache.put("c", [3])
+    assert cache.get("b") is None
+    assert cache.get("a") == [1]
+
+    time.sleep(0.06)
+    assert cache.get("a") is None
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 2
+
+
+def test_query_list_keys_keep_query_boundaries():
+    """Test that batched keys differ when only the query split differs."""
+    make_key = SearchResultCache.make_key
+
+    assert make_key("search_many", ["Air Quality", "germany"], 1) == make_key(
+        "search_many", ["air  quality", "Germany"], 1
+    )
+    assert make_key("search_many", ["air quality", "germany"], 1) != make_key(
+        "search_many", ["air", "quality germany"], 1
+    )
@@ -1,6 +1,8 @@
 """Tests for the semantic analyzer."""
 
 import pytest
+import shutil
+import tempfile
 from datetime import datetime
 import networkx as nx
 
@@ -8,13 +10,20 @@ from dcat.metadata.base import (
     DCATDataset,
     DCATCatalog,
     DCATIdentifier,
-    DCATPublisher,
-    LangString,
+    DCATProperty,
 )
 from dcat.embedding.engine import EmbeddingEngine
 from dcat.semantic.analyzer import SemanticAnalyzer, SemanticRelation
 
 
+@pytest.fixture
+def temp_vector_store():
+    """Create a temporary directory for vector store."""
+    temp_dir = tempfile.mkdtemp()
+    yield temp_dir
+    shutil.rmtree(temp_dir)
+
+
 @pytest.fixture
 def embedding_engine(temp_vector_store):
     """Create an embedding engine for testing."""
@@ -39,12 +48,12 @@ def related_datasets():
                 identifier=DCATIdentifier(
                     id=f"env-dataset-{i}", source_id="test-source"
                 ),
-                title={"en": LangString(f"Environmental Dataset {i}")},
+                title={"en": DCATProperty(f"Environmental Dataset {i}")},
                 description={
-                    "en": LangString(f"Dataset about environmental measurements {i}")
+                    "en": DCATProperty(f"Dataset about environmental measurements {i}")
                 },
-                keywords=[LangString("environment"), LangString("measurements")],
-                themes=[LangString("environment")],
+                keywords=[DCATProperty("environment"), DCATProperty("measurements")],
+                themes=[DCATProperty("environment")],
             )
         )
 
@@ -55,10 +64,12 @@ def related_datasets():
                 identifier=DCATIdentifier(
                     id=f"health-dataset-{i}", source_id="test-source"
                 ),
-                title={"en": LangString(f"Health Dataset {i}")},
-                description={"en": LangString(f"Dataset about health statistics {i}")},
-                keywords=[LangString("health"), LangString("statistics")],
-                themes=[LangString("health")],
+                title={"en": DCATProperty(f"Health Dataset {i}")},
+                description={
+                    "en": DCATProperty(f"Dataset about health statistics {i}")
+                },
+                keywords=[DCATProperty("health"), DCATProperty("statistics")],
+                themes=[DCATProperty("health")],
             )
         )
 
@@ -70,8 +81,8 @@ def test_catalog(related_datasets):
     """Create a test catalog with related datasets."""
     return DCATCatalog(
         identifier=DCATIdentifier(id="test-catalog", source_id="test-source"),
-        title={"en": LangString("Test Catalog")},
-        description={"en": LangString("A catalog for testing")},
+        title={"en": DCATProperty("Test Catalog")},
+        description={"en": DCATProperty("A catalog for testing")},
         datasets=related_datasets,
     )
 
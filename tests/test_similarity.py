@@ -0,0 +1,33 @@
+"""Tests for vectorized nearest-neighbour search."""
+
+import numpy as np
+
+from dcat.embedding.similarity import top_k_neighbours
+
+
+def test_top_k_neighbours_matches_brute_force():
+    """Test blocked top-k against a full distance matrix."""
+    rng = np.random.default_rng(0)
+    embeddings = rng.normal(size=(50, 8)).astype(np.float32)
+
+    indices, scores = top_k_neighbours(embeddings, k=5, block_size=7)
+
+    distances = ((embeddings[:, None, :] - embeddings[None, :, :]) ** 2).sum(-1)
+    np.fill_diagonal(distances, np.inf)
+    expected = np.argsort(distances, axis=1)[:, :5]
+
+    np.testing.assert_array_equal(indices, expected)
+    np.testing.assert_allclose(
+        scores, 1 - np.take_along_axis(distances, expected, axis=1), rtol=1e-4
+    )
+
+
+def test_top_k_neighbours_excludes_self_and_clamps_k():
+    """Test that k is limited to the number of other rows."""
+    embeddings = np.eye(3, dtype=np.float32)
+
+    indices, scores = top_k_neighbours(embeddings, k=10)
+
+    assert indices.shape == (3, 2)
+    for row, neighbours in enumerate(indices):
+        assert row not in neighbours
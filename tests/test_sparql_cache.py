@@ -0,0 +1,162 @@
+"""Tests for the persistent SPARQL result cache."""
+
+import random
+import time
+
+import pytest
+
+import sparql_cache
+from sparql_cache import SparqlResultCache, canonicalize_sparql, classify_query
+
+QUERY = """PREFIX dct: <http://purl.org/dc/terms/>
+PREFIX dcat: <http://www.w3.org/ns/dcat#>
+SELECT DISTINCT ?dataset ?title
+WHERE {
+  ?dataset a dcat:Dataset .
+  ?dataset dct:title ?title .
+  FILTER(LANG(?title) = "en")
+}
+LIMIT 10"""
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Cache with short TTLs in a temporary directory."""
+    return SparqlResultCache(
+        str(tmp_path / "sparql.sqlite3"), ttls={"select": 0.2}, stale_ttl=0.5
+    )
+
+
+def test_layout_variants_share_a_key():
+    """Test whitespace, comment, keyword case and PREFIX order normalization."""
+    variant = """prefix dcat: <http://www.w3.org/ns/dcat#>  # catalogue
+    prefix dct: <http://purl.org/dc/terms/>
+    select distinct ?dataset ?title where { ?dataset a dcat:Dataset.
+    ?dataset dct:title ?title. filter (lang(?title)="en") } limit 10"""
+
+    assert canonicalize_sparql(variant) == canonicalize_sparql(QUERY)
+    # Literals and variable names are significant
+    assert canonicalize_sparql(QUERY.replace('"en"', '"EN"')) != canonicalize_sparql(
+        QUERY
+    )
+    assert canonicalize_sparql(QUERY.replace("?title", "?name")) != (
+        canonicalize_sparql(QUERY)
+    )
+    assert SparqlResultCache.sparql_key("e", variant) == SparqlResultCache.sparql_key(
+        "e", QUERY
+    )
+
+
+def test_classify_query():
+    """Test the query classes selecting TTLs."""
+    assert classify_query(QUERY) == "select"
+    assert classify_query("ask { ?s ?p ?o }") == "ask"
+    assert classify_query("DESCRIBE <http://example.org/x>") == "graph"
+    assert (
+        classify_query("SELECT ?p (COUNT(?p) AS ?n) WHERE { ?s ?p ?o } GROUP BY ?p")
+        == "aggregate"
+    )
+
+
+def test_fresh_stale_and_expired_entries(cache):
+    """Test TTLs, stale-while-revalidate and refetching after the stale window."""
+    calls = []
+
+    def fetch():
+        calls.append(time.time())
+        return {"version": len(calls)}
+
+    assert cache.query("e", QUERY, fetch) == {"version": 1}
+    assert cache.query("e", QUERY, fetch) == {"version": 1}
+    assert len(calls) == 1
+
+    # Expired but within the stale window: old value, refreshed in background
+    time.sleep(0.25)
+    assert cache.query("e", QUERY, fetch) == {"version": 1}
+    for _ in range(50):
+        if cache.stats()["revalidations"]:
+            break
+        time.sleep(0.01)
+    assert cache.query("e", QUERY, fetch) == {"version": 2}
+
+    # Past the stale window: fetched before answering
+    time.sleep(0.8)
+    assert cache.query("e", QUERY, fetch) == {"version": 3}
+
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["stale_hits"] == 1
+    assert stats["misses"] == 2
+
+
+def test_expired_entry_served_when_fetching_fails(cache):
+    """Test stale-if-error."""
+    cache.query("e", QUERY, lambda: {"ok": True})
+    time.sleep(0.8)
+
+    def fail():
+        raise ConnectionError("endpoint down")
+
+    assert cache.query("e", QUERY, fail) == {"ok": True}
+    assert cache.stats()["errors_served_stale"] == 1
+    with pytest.raises(ConnectionError):
+        cache.query("e", "ASK { ?s ?p ?o }", fail)
+
+
+def test_size_bounded_eviction_and_persistence(tmp_path):
+    """Test least recently used eviction and reopening the cache file."""
+    # Incompressible values of the same size
+    values = [{"data": random.Random(i).randbytes(600).hex()} for i in range(4)]
+    probe = SparqlResultCache(str(tmp_path / "probe.sqlite3"))
+    probe.put("key", values[0])
+    entry_bytes = probe.stats()["bytes"]
+
+    path = str(tmp_path / "sparql.sqlite3")
+    max_bytes = 3 * entry_bytes + entry_bytes // 2
+    cache = SparqlResultCache(path, max_bytes=max_bytes)
+    for i in range(3):
+        cache.put(f"key{i}", values[i])
+        time.sleep(0.01)
+    cache.get("key0")
+    cache.put("key3", values[3])
+
+    stats = cache.stats()
+    assert stats["entries"] == 3
+    assert stats["bytes"] <= max_bytes
+    assert cache.get("key0")[0] == values[0]
+    assert cache.get("key1") == (None, None)
+
+    reopened = SparqlResultCache(path, max_bytes=max_bytes)
+    assert reopened.get("key3")[0] == values[3]
+    assert reopened.stats()["bytes"] == stats["bytes"]
+
+
+def test_eviction_reads_bounded_batches(tmp_path, monkeypatch):
+    """Test that eviction beyond one batch keeps going until under the bound."""
+    monkeypatch.setattr(sparql_cache, "EVICT_BATCH_SIZE", 2)
+    cache = SparqlResultCache(str(tmp_path / "sparql.sqlite3"))
+    for i in range(6):
+        cache.put(f"key{i}", {"data": random.Random(i).randbytes(600).hex()})
+        time.sleep(0.01)
+
+    cache.max_bytes = cache.stats()["bytes"] // 4
+    cache.put("newest", {"ok": True})
+
+    assert cache.stats()["bytes"] <= cache.max_bytes
+    # Five of the six entries were evicted, over three batches
+    assert cache.stats()["entries"] == 2
+    assert cache.get("key4") == (None, None)
+    assert cache.get("key5")[0] is not None
+
+
+def test_lookups_do_not_write(cache):
+    """Test that hits only record their last use until the next put."""
+    cache.put("key", {"ok": True})
+    changes = cache._conn.total_changes
+
+    for _ in range(10):
+        assert cache.get("key")[0] == {"ok": True}
+    assert cache._conn.total_changes == changes
+
+    cache.put("other", {"ok": False})
+    assert cache._conn.total_changes == changes + 2
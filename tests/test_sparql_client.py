@@ -0,0 +1,130 @@
+"""Tests for the shared pooled SPARQL client."""
+
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import sparql_client
+from sparql_cache import SparqlResultCache
+from sparql_client import SparqlClient
+
+RESULTS = {"head": {"vars": ["title"]}, "results": {"bindings": [{"title": {}}]}}
+
+
+class SparqlHandler(BaseHTTPRequestHandler):
+    """Serves gzip-compressed SPARQL results over keep-alive connections."""
+
+    protocol_version = "HTTP/1.1"
+    connections = set()
+
+    def do_GET(self):
+        SparqlHandler.connections.add(self.client_address)
+        if "fail" in self.path:
+            self.send_response(500)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = json.dumps(RESULTS).encode("utf-8")
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_response(200)
+            self.send_header("Content-Encoding", "gzip")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Type", "application/sparql-results+json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def endpoint():
+    """Run a local SPARQL endpoint."""
+    SparqlHandler.connections = set()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SparqlHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/sparql"
+    server.shutdown()
+    server.server_close()
+
+
+def test_queries_reuse_one_connection(endpoint):
+    """Test keep-alive reuse, gzip decoding and per-endpoint metrics."""
+    client = SparqlClient(pool_size=2)
+    for _ in range(5):
+        assert client.query("SELECT * WHERE { ?s ?p ?o }", endpoint) == RESULTS
+
+    assert len(SparqlHandler.connections) == 1
+    metrics = client.metrics()[endpoint]
+    assert metrics["requests"] == 5
+    assert metrics["compressed"] == 5
+    assert metrics["errors"] == 0
+    assert metrics["statuses"] == {"200": 5}
+    client.close()
+
+
+def test_error_statuses_are_counted(endpoint):
+    """Test that failing requests raise and are recorded as errors."""
+    client = SparqlClient()
+    failing = endpoint.replace("sparql", "fail")
+    with pytest.raises(Exception):
+        client.query("SELECT * WHERE { ?s ?p ?o }", failing)
+
+    assert client.metrics()[failing]["errors"] == 1
+    client.close()
+
+
+def test_cached_queries_skip_the_endpoint(endpoint, tmp_path):
+    """Test that layout variants of a query are answered from the cache."""
+    cache = SparqlResultCache(str(tmp_path / "sparql.sqlite3"))
+    client = SparqlClient(cache=cache)
+
+    assert client.query("SELECT * WHERE { ?s ?p ?o }", endpoint) == RESULTS
+    assert client.query("select *\nwhere {\n  ?s ?p ?o\n}", endpoint) == RESULTS
+    assert client.get_json(endpoint, params={"q": "x"}) == RESULTS
+    assert client.get_json(endpoint, params={"q": "x"}) == RESULTS
+
+    assert client.metrics()[endpoint]["requests"] == 2
+    assert cache.stats()["hits"] == 2
+    client.close()
+
+
+def test_stream_query_yields_bindings_and_caches_small_results(endpoint, tmp_path):
+    """Test streamed bindings from a gzip body and their replay from the cache."""
+    cache = SparqlResultCache(str(tmp_path / "sparql.sqlite3"))
+    client = SparqlClient(cache=cache)
+    query = "SELECT ?title WHERE { ?s ?p ?title }"
+
+    assert list(client.stream_query(query, endpoint)) == RESULTS["results"]["bindings"]
+    assert list(client.stream_query(query, endpoint)) == RESULTS["results"]["bindings"]
+    assert client.query(query, endpoint) == RESULTS
+
+    assert client.metrics()[endpoint]["requests"] == 1
+    assert list(client.stream_query(query, endpoint, cache_rows=0)) == (
+        RESULTS["results"]["bindings"]
+    )
+    assert client.metrics()[endpoint]["requests"] == 2
+    client.close()
+
+
+def test_default_cache_path_ignores_working_directory(tmp_path, monkeypatch):
+    """Test that a relative cache directory is resolved against the repo root."""
+    monkeypatch.setattr(sparql_client, "REPO_ROOT", str(tmp_path / "repo"))
+    monkeypatch.setattr(sparql_client, "_default_client", None)
+    monkeypatch.delenv("SPARQL_CACHE_PATH", raising=False)
+    monkeypatch.setenv("CACHE_DIR", "cache")
+    monkeypatch.chdir(tmp_path)
+
+    client = sparql_client.get_sparql_client()
+
+    assert (tmp_path / "repo" / "cache" / "sparql_results.sqlite3").exists()
+    assert not (tmp_path / "cache").exists()
+    client.close()
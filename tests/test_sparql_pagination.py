@@ -0,0 +1,132 @@
+"""Tests for resumable SPARQL pagination."""
+
+import json
+import re
+
+import pytest
+
+from sparql_pagination import (
+    SparqlCursor,
+    SparqlPaginationError,
+    paginate_query,
+    projected_variables,
+)
+
+QUERY = """PREFIX dcat: <http://www.w3.org/ns/dcat#>
+PREFIX dct: <http://purl.org/dc/terms/>
+SELECT ?dataset ?title
+WHERE {
+  ?dataset a dcat:Dataset ;
+           dct:title ?title .
+}
+LIMIT 100"""
+
+
+def row(dataset: int, title: int):
+    return {
+        "dataset": {"type": "uri", "value": f"http://example.org/d{dataset:04d}"},
+        "title": {"type": "literal", "value": f"title {title}"},
+    }
+
+
+# Datasets with one or two titles, sorted like the endpoint would sort them
+ROWS = [row(i, j) for i in range(95) for j in range(1 + i % 2)]
+
+
+class PagedEndpoint:
+    """In-memory endpoint answering LIMIT/OFFSET and keyset page queries."""
+
+    def __init__(self, rows, failures=0):
+        self.rows = rows
+        self.failures = failures
+        self.queries = []
+
+    def query(self, query, endpoint, timeout=None, use_cache=True):
+        self.queries.append(query)
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("connection reset")
+
+        rows = self.rows
+        after = re.search(r'FILTER\(STR\(\?dataset\) > ("[^"]*")\)', query)
+        if after:
+            rows = [r for r in rows if r["dataset"]["value"] > json.loads(after[1])]
+        offset = re.search(r"OFFSET (\d+)", query)
+        start = int(offset[1]) if offset else 0
+        limit = int(re.search(r"LIMIT (\d+)", query)[1])
+        return {"results": {"bindings": rows[start : start + limit]}}
+
+
+def test_paginate_query_rewrites_solution_modifiers():
+    """Test stable ordering and replaced LIMIT/OFFSET."""
+    page = paginate_query(QUERY, 50, offset=150)
+
+    assert "LIMIT 100" not in page
+    assert page.endswith("ORDER BY ?dataset ?title\nLIMIT 50\nOFFSET 150")
+
+    keyset = paginate_query(QUERY, 50, keyset="dataset", after="http://x/\"1\"")
+    assert 'FILTER(STR(?dataset) > "http://x/\\"1\\"")\n}' in keyset
+    assert keyset.endswith("ORDER BY STR(?dataset)\nLIMIT 50")
+
+    with pytest.raises(SparqlPaginationError):
+        paginate_query("SELECT * WHERE { ?s ?p ?o }", 10)
+
+
+def test_projected_variables():
+    """Test plain variables, aliases and SELECT *."""
+    query = "SELECT DISTINCT ?p (COUNT(DISTINCT ?s) AS ?n) WHERE { ?s ?p ?o }"
+
+    assert projected_variables(query) == ["p", "n"]
+    assert projected_variables(QUERY) == ["dataset", "title"]
+    assert projected_variables("SELECT * { ?s ?p ?o }") == []
+
+
+@pytest.mark.parametrize("keyset", [None, "dataset"])
+def test_cursor_returns_every_row_once(keyset):
+    """Test offset and keyset paging, including keys split across pages."""
+    endpoint = PagedEndpoint(ROWS)
+    cursor = SparqlCursor(QUERY, page_size=20, keyset=keyset, client=endpoint)
+
+    assert list(cursor) == ROWS
+    assert cursor.state["done"]
+
+
+def test_failed_pages_are_retried():
+    """Test per-page retries with backoff."""
+    endpoint = PagedEndpoint(ROWS, failures=2)
+    cursor = SparqlCursor(QUERY, page_size=50, backoff=0.01, client=endpoint)
+
+    assert list(cursor) == ROWS
+    assert len(endpoint.queries) == 2 + 3
+
+
+def test_interrupted_harvest_resumes_from_checkpoint(tmp_path):
+    """Test checkpointing after each consumed page and resuming."""
+    checkpoint = str(tmp_path / "harvest.json")
+    endpoint = PagedEndpoint(ROWS)
+    cursor = SparqlCursor(
+        QUERY, page_size=40, client=endpoint, checkpoint_path=checkpoint
+    )
+
+    pages = cursor.pages()
+    first = next(pages)
+    cursor.extra["written"] = len(first)
+    second = next(pages)
+    pages.close()
+
+    resumed = SparqlCursor(
+        QUERY, page_size=40, client=endpoint, checkpoint_path=checkpoint
+    )
+    assert resumed.extra == {"written": 40}
+    assert resumed.state["rows"] == 40
+    # The unfinished second page is harvested again
+    assert first + list(resumed) == ROWS
+    assert second == ROWS[40:80]
+    assert not (tmp_path / "harvest.json").exists()
+
+
+def test_max_rows_stops_early():
+    """Test that the cursor stops after max_rows rows."""
+    cursor = SparqlCursor(QUERY, page_size=30, max_rows=45, client=PagedEndpoint(ROWS))
+
+    assert list(cursor) == ROWS[:45]
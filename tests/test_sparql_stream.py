@@ -0,0 +1,89 @@
+"""Tests for the streaming SPARQL JSON results parser."""
+
+import json
+
+import pytest
+
+from sparql_stream import SparqlResultStream, SparqlStreamError, iter_bindings
+
+RESULTS = {
+    "head": {"vars": ["dataset", "title"]},
+    "results": {
+        "distinct": False,
+        "ordered": True,
+        "bindings": [
+            {
+                "dataset": {"type": "uri", "value": f"http://example.org/d/{i}"},
+                "title": {
+                    "type": "literal",
+                    "xml:lang": "en",
+                    "value": f"Datensätze \"{i}\" {{[,]}}",
+                },
+            }
+            for i in range(500)
+        ],
+    },
+}
+
+
+def chunked(data: bytes, size: int):
+    """Split a body into chunks of ``size`` bytes."""
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 3, 64, 4096, 1 << 20])
+def test_bindings_match_a_full_parse(size):
+    """Test that any chunking, including split UTF-8 sequences, parses alike."""
+    body = json.dumps(RESULTS, ensure_ascii=False, indent=2).encode("utf-8")
+    stream = SparqlResultStream(chunked(body, size))
+
+    assert list(stream) == RESULTS["results"]["bindings"]
+    assert stream.vars == ["dataset", "title"]
+
+
+def test_bindings_are_yielded_before_the_body_ends():
+    """Test that the first binding is available after the first chunks."""
+    body = json.dumps(RESULTS).encode("utf-8")
+    chunks = chunked(body, 256)
+    consumed = []
+
+    def source():
+        for chunk in chunks:
+            consumed.append(chunk)
+            yield chunk
+
+    first = next(iter(SparqlResultStream(source())))
+
+    assert first == RESULTS["results"]["bindings"][0]
+    assert len(consumed) < len(chunks) // 10
+
+
+def test_members_in_any_order_and_ask_results():
+    """Test head after results, unknown members and boolean results."""
+    body = '{"results": {"bindings": [{"n": {"type": "literal", "value": "1"}}]},'
+    body += ' "extra": 12345, "head": {"vars": ["n"]}}'
+    stream = SparqlResultStream(chunked(body.encode("utf-8"), 5))
+
+    assert list(stream) == [{"n": {"type": "literal", "value": "1"}}]
+    assert stream.vars == ["n"]
+
+    ask = SparqlResultStream([b'{"head": {}, "boolean": true}'])
+    assert list(ask) == []
+    assert ask.boolean is True
+
+
+def test_truncated_body_raises():
+    """Test that a body cut off mid-binding is reported."""
+    body = json.dumps(RESULTS).encode("utf-8")[:-200]
+    stream = iter(SparqlResultStream(chunked(body, 1000)))
+
+    with pytest.raises(SparqlStreamError):
+        list(stream)
+
+
+def test_iter_bindings_accepts_decoded_results():
+    """Test that decoded results and binding streams are handled alike."""
+    bindings = RESULTS["results"]["bindings"]
+
+    assert list(iter_bindings(RESULTS)) == bindings
+    assert list(iter_bindings(iter(bindings))) == bindings
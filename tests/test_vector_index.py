@@ -0,0 +1,187 @@
+"""Tests for the in-process vector index backends."""
+
+import pytest
+import numpy as np
+import os
+import tempfile
+import shutil
+
+from dcat.embedding.index import recall_report
+
+
+@pytest.fixture
+def temp_index_dir():
+    """Create a temporary directory for index files."""
+    temp_dir = tempfile.mkdtemp()
+    yield temp_dir
+    shutil.rmtree(temp_dir)
+
+
+@pytest.fixture
+def vectors():
+    """Create random normalized vectors."""
+    rng = np.random.default_rng(42)
+    data = rng.normal(size=(500, 16)).astype(np.float32)
+    return data / np.linalg.norm(data, axis=1, keepdims=True)
+
+
+@pytest.fixture
+def ids(vectors):
+    """Create document ids for the vectors."""
+    return [f"dataset-{i}" for i in range(len(vectors))]
+
+
+def test_hnsw_index_search_and_recall(vectors, ids):
+    """Test HNSW search quality against exact search."""
+    hnsw = pytest.importorskip("dcat.embedding.hnsw")
+    index = hnsw.HNSWIndex(dim=16, max_elements=10)
+    index.add(ids, vectors, [{"title": doc_id} for doc_id in ids])
+
+    results = index.search(vectors[3], k=5)
+    assert results[0][0] == "dataset-3"
+    assert results[0][2] == {"title": "dataset-3"}
+
+    report = recall_report(index, ids, vectors, vectors[:50], k=10)
+    assert report["recall"] > 0.9
+    assert report["p99_ms"] >= report["p50_ms"]
+
+
+def test_hnsw_index_save_load_and_remove(vectors, ids, temp_index_dir):
+    """Test persistence, incremental inserts and removal."""
+    hnsw = pytest.importorskip("dcat.embedding.hnsw")
+    index = hnsw.HNSWIndex(dim=16, M=8, ef=32)
+    index.add(ids[:250], vectors[:250])
+    index.save(temp_index_dir)
+
+    loaded = hnsw.HNSWIndex.load(temp_index_dir)
+    assert loaded.M == 8
+    assert len(loaded) == 250
+
+    loaded.add(ids[250:], vectors[250:])
+    loaded.remove(["dataset-300"])
+    assert "dataset-300" not in loaded
+    assert all(
+        doc_id != "dataset-300" for doc_id, _, _ in loaded.search(vectors[300], k=5)
+    )
+
+
+def test_hnsw_index_concurrent_searches_above_ef(vectors, ids):
+    """Test that concurrent searches with k above ef all get k results."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    hnsw = pytest.importorskip("dcat.embedding.hnsw")
+    index = hnsw.HNSWIndex(dim=16, ef=8)
+    index.add(ids, vectors)
+
+    ks = [5, 50, 8, 100, 20, 200] * 20
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        counts = list(pool.map(lambda k: len(index.search(vectors[k % 50], k=k)), ks))
+
+    assert counts == ks
+    assert index.ef == 8
+
+
+def test_ivfpq_index_compresses_and_reranks(vectors, ids, temp_index_dir):
+    """Test IVF-PQ training, compression, exact re-ranking and persistence."""
+    from dcat.embedding.pq import IVFPQIndex
+
+    index = IVFPQIndex(
+        dim=16,
+        n_lists=8,
+        n_subvectors=4,
+        n_probe=4,
+        rerank=50,
+        vectors_path=f"{temp_index_dir}/work/vectors.f32",
+    )
+    index.train(vectors)
+    index.add(ids, vectors)
+
+    assert index.memory_bytes() < vectors.nbytes / 2
+    assert index.search(vectors[7], k=1)[0][0] == "dataset-7"
+    assert recall_report(index, ids, vectors, vectors[:50], k=5)["recall"] > 0.8
+
+    index.save(f"{temp_index_dir}/saved")
+    loaded = IVFPQIndex.load(f"{temp_index_dir}/saved")
+    assert loaded.search(vectors[7], k=1)[0][0] == "dataset-7"
+
+
+def test_ivfpq_index_requires_training(vectors, ids):
+    """Test that adding to an untrained IVF-PQ index fails."""
+    from dcat.embedding.index import VectorIndexError
+    from dcat.embedding.pq import IVFPQIndex
+
+    index = IVFPQIndex(dim=16, n_subvectors=4)
+    with pytest.raises(VectorIndexError):
+        index.add(ids[:1], vectors[:1])
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float16"])
+def test_numpy_index_exact_search(vectors, ids, temp_index_dir, dtype):
+    """Test exact search, removal and memory-mapped persistence."""
+    from dcat.embedding.exact import NumpyIndex
+
+    index = NumpyIndex(dim=16, dtype=dtype, block_size=64)
+    index.add(ids, vectors)
+    assert recall_report(index, ids, vectors, vectors[:20], k=10)["recall"] > 0.95
+
+    index.remove(["dataset-1"])
+    assert "dataset-1" not in [doc_id for doc_id, _, _ in index.search(vectors[1], 5)]
+
+    index.save(temp_index_dir)
+    loaded = NumpyIndex.load(temp_index_dir)
+    assert isinstance(loaded._vectors, np.memmap)
+    assert loaded.search(vectors[2], k=1)[0][0] == "dataset-2"
+
+    loaded.add(["new-dataset"], vectors[:1] * -1)
+    assert loaded.search(vectors[0] * -1, k=1)[0][0] == "new-dataset"
+
+
+def test_binary_index_prefilter_and_rerank(vectors, ids, temp_index_dir):
+    """Test Hamming shortlisting with exact re-ranking and persistence."""
+    from dcat.embedding.binary import BinaryIndex, hamming_distances
+
+    codes = np.array([[0b10110000], [0b00000000]], dtype=np.uint8)
+    assert list(hamming_distances(codes, np.uint8(0b10000000))) == [2, 1]
+
+    # 16 sign bits separate 500 vectors poorly, so shortlist generously
+    index = BinaryIndex(dim=16, rerank=200)
+    index.add(ids, vectors)
+    assert index.memory_bytes() == len(ids) * 2
+    assert recall_report(index, ids, vectors, vectors[:20], k=10)["recall"] > 0.9
+
+    results = index.search(vectors[4], k=3)
+    assert results[0][0] == "dataset-4"
+    assert results[0][1] == pytest.approx(0.0, abs=1e-5)
+
+    index.remove(["dataset-4"])
+    assert "dataset-4" not in [doc_id for doc_id, _, _ in index.search(vectors[4], 5)]
+
+    index.save(temp_index_dir)
+    loaded = BinaryIndex.load(temp_index_dir)
+    assert loaded.rerank == 200
+    assert loaded.search(vectors[7], k=1)[0][0] == "dataset-7"
+
+
+def test_create_vector_index_by_name(temp_index_dir):
+    """Test selecting backends by name and loading them back."""
+    from dcat.embedding.backends import create_vector_index, load_vector_index
+    from dcat.embedding.index import VectorIndexError
+
+    index = create_vector_index("numpy", dim=4)
+    index.add(["a"], np.ones((1, 4), dtype=np.float32))
+    index.save(temp_index_dir)
+
+    assert load_vector_index(temp_index_dir).backend == "numpy"
+    with pytest.raises(VectorIndexError):
+        create_vector_index("unknown", dim=4)
+
+
+def test_ivfpq_rerank_vectors_default_into_index_directory(temp_index_dir):
+    """Test that an index built for a directory keeps exact vectors there."""
+    from dcat.embedding.backends import create_vector_index
+
+    index = create_vector_index(
+        "ivfpq", dim=16, directory=temp_index_dir, n_subvectors=4
+    )
+    assert os.path.dirname(index.vectors_path) == temp_index_dir
+    assert create_vector_index("ivfpq", dim=16, n_subvectors=4).vectors_path is None